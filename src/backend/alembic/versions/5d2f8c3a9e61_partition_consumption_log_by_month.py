@@ -0,0 +1,107 @@
+"""partition consumption_log by month on consumed_at
+
+Revision ID: 5d2f8c3a9e61
+Revises: c41e9a7d2b10
+Create Date: 2025-08-23 18:40:02.114327
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "5d2f8c3a9e61"
+down_revision: Union[str, None] = "c41e9a7d2b10"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+COLUMNS = """
+    id UUID NOT NULL,
+    user_id UUID NOT NULL REFERENCES users (id),
+    inventory_item_id UUID REFERENCES inventory (id),
+    item_name VARCHAR NOT NULL,
+    quantity_consumed FLOAT NOT NULL,
+    calories_consumed FLOAT NOT NULL,
+    protein_consumed_g FLOAT NOT NULL,
+    carbs_consumed_g FLOAT NOT NULL,
+    fats_consumed_g FLOAT NOT NULL,
+    consumed_at TIMESTAMP WITHOUT TIME ZONE NOT NULL
+"""
+COLUMN_NAMES = (
+    "id, user_id, inventory_item_id, item_name, quantity_consumed, "
+    "calories_consumed, protein_consumed_g, carbs_consumed_g, fats_consumed_g, "
+    "consumed_at"
+)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute("ALTER TABLE consumption_log RENAME TO consumption_log_old")
+    op.execute(
+        "ALTER TABLE consumption_log_old "
+        "RENAME CONSTRAINT consumption_log_pkey TO consumption_log_old_pkey"
+    )
+    op.execute(f"""
+        CREATE TABLE consumption_log (
+            {COLUMNS},
+            CONSTRAINT consumption_log_pkey PRIMARY KEY (id, consumed_at)
+        ) PARTITION BY RANGE (consumed_at)
+        """)
+    op.create_index(
+        "ix_consumption_log_user_id_consumed_at",
+        "consumption_log",
+        ["user_id", "consumed_at"],
+        unique=False,
+    )
+    op.execute(
+        "CREATE TABLE consumption_log_default PARTITION OF consumption_log DEFAULT"
+    )
+    # One partition per month from the oldest existing row through three
+    # months ahead; app.jobs.consumption_log_partitions keeps extending this.
+    op.execute("""
+        DO $$
+        DECLARE
+            month DATE := date_trunc(
+                'month', COALESCE((SELECT min(consumed_at) FROM consumption_log_old), now())
+            )::date;
+            last_month DATE := (date_trunc('month', now()) + interval '3 months')::date;
+        BEGIN
+            WHILE month <= last_month LOOP
+                EXECUTE format(
+                    'CREATE TABLE %I PARTITION OF consumption_log FOR VALUES FROM (%L) TO (%L)',
+                    'consumption_log_p' || to_char(month, 'YYYY_MM'),
+                    month,
+                    (month + interval '1 month')::date
+                );
+                month := (month + interval '1 month')::date;
+            END LOOP;
+        END $$;
+        """)
+    op.execute(
+        f"INSERT INTO consumption_log ({COLUMN_NAMES}) "
+        f"SELECT {COLUMN_NAMES} FROM consumption_log_old"
+    )
+    op.execute("DROP TABLE consumption_log_old")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute("ALTER TABLE consumption_log RENAME TO consumption_log_partitioned")
+    op.execute(
+        "ALTER TABLE consumption_log_partitioned "
+        "RENAME CONSTRAINT consumption_log_pkey TO consumption_log_partitioned_pkey"
+    )
+    op.execute(f"""
+        CREATE TABLE consumption_log (
+            {COLUMNS},
+            CONSTRAINT consumption_log_pkey PRIMARY KEY (id)
+        )
+        """)
+    op.execute(
+        f"INSERT INTO consumption_log ({COLUMN_NAMES}) "
+        f"SELECT {COLUMN_NAMES} FROM consumption_log_partitioned"
+    )
+    # Dropping the parent drops every attached partition with it.
+    op.execute("DROP TABLE consumption_log_partitioned")
@@ -0,0 +1,47 @@
+"""add created_at to generated_recipes
+
+Revision ID: b8d3f5a6c217
+Revises: e2b7d4a91c58
+Create Date: 2025-09-06 14:22:51.630417
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "b8d3f5a6c217"
+down_revision: Union[str, None] = "e2b7d4a91c58"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Existing rows get the migration time; the application sets it after.
+    op.add_column(
+        "generated_recipes",
+        sa.Column(
+            "created_at",
+            sa.DateTime(),
+            server_default=sa.text("timezone('utc', now())"),
+            nullable=False,
+        ),
+    )
+    op.alter_column("generated_recipes", "created_at", server_default=None)
+    op.create_index(
+        "ix_generated_recipes_user_id_created_at",
+        "generated_recipes",
+        ["user_id", "created_at"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(
+        "ix_generated_recipes_user_id_created_at", table_name="generated_recipes"
+    )
+    op.drop_column("generated_recipes", "created_at")
@@ -0,0 +1,75 @@
+"""add alerts table, user timezone and inventory expiry index
+
+Revision ID: c41e9a7d2b10
+Revises: 7088dbfb0bce
+Create Date: 2025-08-16 10:12:44.518203
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "c41e9a7d2b10"
+down_revision: Union[str, None] = "7088dbfb0bce"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column(
+        "users",
+        sa.Column("timezone", sa.String(), server_default="UTC", nullable=False),
+    )
+    op.add_column("users", sa.Column("alerts_evaluated_on", sa.Date(), nullable=True))
+    op.create_index(
+        op.f("ix_inventory_expiry_date"), "inventory", ["expiry_date"], unique=False
+    )
+    op.create_table(
+        "alerts",
+        sa.Column("id", sa.UUID(), nullable=False),
+        sa.Column("user_id", sa.UUID(), nullable=False),
+        sa.Column("inventory_item_id", sa.UUID(), nullable=True),
+        sa.Column(
+            "alert_type",
+            sa.Enum("expiry", "calorie_intake", name="alert_type_enum"),
+            nullable=False,
+        ),
+        sa.Column("message", sa.String(), nullable=False),
+        sa.Column("alert_date", sa.Date(), nullable=False),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+        sa.ForeignKeyConstraint(
+            ["inventory_item_id"], ["inventory.id"], ondelete="CASCADE"
+        ),
+        sa.ForeignKeyConstraint(
+            ["user_id"],
+            ["users.id"],
+        ),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint(
+            "user_id",
+            "alert_type",
+            "inventory_item_id",
+            "alert_date",
+            name="uq_alerts_user_type_item_date",
+        ),
+    )
+    op.create_index(
+        "ix_alerts_user_id_alert_date",
+        "alerts",
+        ["user_id", "alert_date"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_alerts_user_id_alert_date", table_name="alerts")
+    op.drop_table("alerts")
+    sa.Enum(name="alert_type_enum").drop(op.get_bind(), checkfirst=True)
+    op.drop_index(op.f("ix_inventory_expiry_date"), table_name="inventory")
+    op.drop_column("users", "alerts_evaluated_on")
+    op.drop_column("users", "timezone")
@@ -0,0 +1,55 @@
+"""add recipe suggestion columns to generated_recipes
+
+Revision ID: e2b7d4a91c58
+Revises: 9a3e6c1f4b27
+Create Date: 2025-09-02 09:41:18.225104
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "e2b7d4a91c58"
+down_revision: Union[str, None] = "9a3e6c1f4b27"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column(
+        "generated_recipes", sa.Column("calories", sa.Integer(), nullable=True)
+    )
+    op.add_column("generated_recipes", sa.Column("protein", sa.Float(), nullable=True))
+    op.add_column("generated_recipes", sa.Column("carbs", sa.Float(), nullable=True))
+    op.add_column("generated_recipes", sa.Column("fats", sa.Float(), nullable=True))
+    op.add_column(
+        "generated_recipes",
+        sa.Column("inventory_fingerprint", sa.String(length=64), nullable=True),
+    )
+    op.add_column(
+        "generated_recipes",
+        sa.Column("suggested", sa.Boolean(), server_default=sa.false(), nullable=False),
+    )
+    op.create_index(
+        "ix_generated_recipes_user_id_fingerprint",
+        "generated_recipes",
+        ["user_id", "inventory_fingerprint"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(
+        "ix_generated_recipes_user_id_fingerprint", table_name="generated_recipes"
+    )
+    op.drop_column("generated_recipes", "suggested")
+    op.drop_column("generated_recipes", "inventory_fingerprint")
+    op.drop_column("generated_recipes", "fats")
+    op.drop_column("generated_recipes", "carbs")
+    op.drop_column("generated_recipes", "protein")
+    op.drop_column("generated_recipes", "calories")
@@ -1,17 +1,18 @@
-from typing import Generator, Optional
+import uuid
+from typing import AsyncGenerator, Generator, Optional, Union
 
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
 from app.auth.auth_service import JWTService
-from app.core.config import Settings
+from app.core.config import settings
 from app.db import SessionLocal
-from app.models.user import User
+from app.db.async_session import AsyncSessionLocal
 from app.schemas.token import TokenPayload
-from app.services.user_service import get_user_by_email
-
-settings = Settings()
+from app.schemas.user import User as UserSchema
+from app.services.user_service import get_user_snapshot, get_user_snapshot_by_email
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl=f"{settings.API_V1_STR}/auth/login")
 
@@ -27,34 +28,96 @@ def get_db() -> Generator:
         db.close()
 
 
+async def get_async_db() -> AsyncGenerator[AsyncSession, None]:
+    """
+    Async database dependency for endpoints that should not block a threadpool
+    worker while waiting on Postgres.
+    """
+    async with AsyncSessionLocal() as db:
+        yield db
+
+
+_credentials_exception = HTTPException(
+    status_code=status.HTTP_401_UNAUTHORIZED,
+    detail="Invalid authentication credentials",
+    headers={"WWW-Authenticate": "Bearer"},
+)
+
+
+def _token_subject(token: str) -> Union[uuid.UUID, str]:
+    """
+    Return the token subject as a user id, or as an email for legacy tokens
+    while AUTH_ACCEPT_EMAIL_SUBJECT is enabled.
+    """
+    token_payload: Optional[TokenPayload] = JWTService.verify_access_token_cached(token)
+    if not token_payload or not token_payload.sub:
+        raise _credentials_exception
+    try:
+        return uuid.UUID(token_payload.sub)
+    except ValueError:
+        if settings.AUTH_ACCEPT_EMAIL_SUBJECT:
+            return token_payload.sub
+        raise _credentials_exception
+
+
+def _user_not_found() -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_404_NOT_FOUND,
+        detail="User not found",
+    )
+
+
 def get_current_user(
     db: Session = Depends(get_db), token: str = Depends(oauth2_scheme)
-) -> User:
+) -> UserSchema:
     """
     Dependency to get the current user from a JWT token.
 
+    The user is loaded by primary key; decoded tokens and user snapshots are
+    cached briefly, so a warm request does not query the database (the
+    session is never checked out).
+
+    Because of that cache, a user deleted or disabled directly in the
+    database (or through another process) keeps authenticating for up to
+    AUTH_CACHE_TTL_SECONDS. Code that removes or locks out a user must call
+    user_service.invalidate_user_cache; set AUTH_CACHE_TTL_SECONDS=0 where
+    immediate revocation matters more than the saved lookup.
+
     Args:
         db: The database session.
         token: The JWT token from the Authorization header.
 
     Returns:
-        The authenticated user.
+        A detached snapshot of the authenticated user.
 
     Raises:
         HTTPException: If the token is invalid or the user is not found.
     """
-    token_payload: Optional[TokenPayload] = JWTService.verify_access_token(token)
-    if not token_payload or not token_payload.sub:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Invalid authentication credentials",
-            headers={"WWW-Authenticate": "Bearer"},
-        )
-
-    user = get_user_by_email(db, email=token_payload.sub)
+    subject = _token_subject(token)
+    if isinstance(subject, uuid.UUID):
+        user = get_user_snapshot(db, subject)
+    else:
+        user = get_user_snapshot_by_email(db, email=subject)
     if not user:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="User not found",
-        )
+        raise _user_not_found()
     return user
+
+
+def get_current_user_id(
+    db: Session = Depends(get_db), token: str = Depends(oauth2_scheme)
+) -> uuid.UUID:
+    """
+    Dependency for endpoints that only need the caller's id.
+
+    For id-subject tokens this is just signature verification, with no user
+    lookup at all; a valid token for a since-deleted user is only rejected by
+    the endpoint's own queries. Legacy email-subject tokens fall back to a
+    (cached) lookup.
+    """
+    subject = _token_subject(token)
+    if isinstance(subject, uuid.UUID):
+        return subject
+    user = get_user_snapshot_by_email(db, email=subject)
+    if not user:
+        raise _user_not_found()
+    return user.id
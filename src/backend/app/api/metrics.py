@@ -0,0 +1,40 @@
+import secrets
+from typing import Optional
+
+from fastapi import APIRouter, Depends, Header, HTTPException, status
+from fastapi.responses import PlainTextResponse
+
+from app.core.config import Settings, get_settings
+from app.utils.metrics import metrics
+
+router = APIRouter()
+
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+def _check_metrics_token(settings: Settings, authorization: Optional[str]) -> None:
+    if not settings.METRICS_TOKEN:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND)
+    scheme, _, token = (authorization or "").partition(" ")
+    if scheme.lower() != "bearer" or not secrets.compare_digest(
+        token.encode(), settings.METRICS_TOKEN.encode()
+    ):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid metrics token",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+
+
+@router.get("/metrics", response_class=PlainTextResponse, include_in_schema=False)
+def read_metrics(
+    authorization: Optional[str] = Header(None),
+    settings: Settings = Depends(get_settings),
+):
+    """
+    Expose process metrics (DB pool saturation etc.) in the Prometheus text
+    format for scraping. Served outside the versioned API and only to callers
+    presenting METRICS_TOKEN as a bearer token.
+    """
+    _check_metrics_token(settings, authorization)
+    return PlainTextResponse(metrics.render(), media_type=PROMETHEUS_CONTENT_TYPE)
@@ -0,0 +1,25 @@
+import uuid
+from typing import List
+
+from fastapi import APIRouter, Depends
+from sqlalchemy.orm import Session
+
+from app.api import deps
+from app.schemas.alert import AlertRead
+from app.services import alert_service
+
+router = APIRouter()
+
+
+@router.get("/", response_model=List[AlertRead])
+def read_alerts(
+    db: Session = Depends(deps.get_db),
+    user_id: uuid.UUID = Depends(deps.get_current_user_id),
+):
+    """
+    Get active expiry and calorie alerts for the current user.
+
+    Alerts are precomputed once per user-local day by the alert evaluator job
+    (`python -m app.jobs.evaluate_alerts`); this endpoint only reads them.
+    """
+    return alert_service.get_active_alerts(db, user_id)
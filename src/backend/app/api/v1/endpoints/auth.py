@@ -1,14 +1,19 @@
+import uuid
 from datetime import timedelta
-from fastapi import APIRouter, Depends, HTTPException, status
+from typing import Optional
+
+from fastapi import APIRouter, Body, Depends, HTTPException, Response, status
 from fastapi.responses import JSONResponse
 from fastapi.openapi.models import Response as OpenAPIResponse
 from fastapi.security import OAuth2PasswordRequestForm
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.api import deps
 from app.core.config import settings
-from app.schemas.token import Token
-from app.services.user_service import authenticate_user
+from app.schemas.token import RefreshTokenRequest, Token
+from app.services import refresh_token_service
+from app.services.refresh_token_service import InvalidRefreshTokenError
+from app.services.user_service import async_authenticate_user
 from app.auth.auth_service import JWTService
 
 router = APIRouter()
@@ -26,6 +31,14 @@ router = APIRouter()
                 }
             },
         },
+        503: {
+            "description": "Password hashing is saturated; retry shortly",
+            "content": {
+                "application/json": {
+                    "example": {"detail": "Server busy, please retry shortly"}
+                }
+            },
+        },
         422: {
             "description": "Validation Error",
             "content": {
@@ -44,18 +57,88 @@ router = APIRouter()
         },
     },
 )
-def login_for_access_token(
-    db: Session = Depends(deps.get_db), form_data: OAuth2PasswordRequestForm = Depends()
+async def login_for_access_token(
+    db: AsyncSession = Depends(deps.get_async_db),
+    form_data: OAuth2PasswordRequestForm = Depends(),
 ):
-    user = authenticate_user(db, email=form_data.username, password=form_data.password)
+    user = await async_authenticate_user(
+        db, email=form_data.username, password=form_data.password
+    )
     if not user:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect username or password",
             headers={"WWW-Authenticate": "Bearer"},
         )
+    refresh_token = await refresh_token_service.async_issue_refresh_token(db, user.id)
+    return _token_response(user.id, refresh_token)
+
+
+def _token_response(user_id: uuid.UUID, refresh_token: str) -> dict:
     access_token_expires = timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
     access_token = JWTService.create_access_token(
-        data={"sub": user.email}, expires_delta=access_token_expires
+        data={"sub": str(user_id)}, expires_delta=access_token_expires
     )
-    return {"access_token": access_token, "token_type": "bearer"}
+    return {
+        "access_token": access_token,
+        "token_type": "bearer",
+        "refresh_token": refresh_token,
+    }
+
+
+_invalid_refresh_token = HTTPException(
+    status_code=status.HTTP_401_UNAUTHORIZED,
+    detail="Invalid refresh token",
+    headers={"WWW-Authenticate": "Bearer"},
+)
+
+
+@router.post(
+    "/refresh",
+    response_model=Token,
+    responses={
+        401: {
+            "description": "Unknown, expired, revoked or reused refresh token",
+            "content": {
+                "application/json": {"example": {"detail": "Invalid refresh token"}}
+            },
+        },
+    },
+)
+async def refresh_access_token(
+    body: RefreshTokenRequest, db: AsyncSession = Depends(deps.get_async_db)
+):
+    """
+    Exchange a refresh token for a new access token and a new refresh token.
+    The presented refresh token is single-use; no password check is involved.
+    """
+    try:
+        user_id, refresh_token = await refresh_token_service.async_rotate_refresh_token(
+            db, body.refresh_token
+        )
+    except InvalidRefreshTokenError:
+        raise _invalid_refresh_token
+    return _token_response(user_id, refresh_token)
+
+
+@router.post("/logout", status_code=status.HTTP_204_NO_CONTENT)
+async def logout(
+    body: Optional[RefreshTokenRequest] = Body(None),
+    token: str = Depends(deps.oauth2_scheme),
+    db: AsyncSession = Depends(deps.get_async_db),
+):
+    """
+    Revoke the presented access token and, if given, the refresh token's
+    family (every token rotated from the same login).
+    """
+    payload = JWTService.verify_access_token(token)
+    if payload is None:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid authentication credentials",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+    JWTService.revoke_access_token(payload)
+    if body is not None:
+        await refresh_token_service.async_revoke_refresh_token(db, body.refresh_token)
+    return Response(status_code=status.HTTP_204_NO_CONTENT)
@@ -0,0 +1,54 @@
+import uuid
+
+from fastapi import APIRouter, Depends, Query
+from fastapi.responses import StreamingResponse
+
+from app.api import deps
+from app.db import SessionLocal
+from app.enums import ExportDatasetEnum, ExportFormatEnum
+from app.services import export_service
+
+router = APIRouter()
+
+
+@router.get(
+    "/{dataset}",
+    response_class=StreamingResponse,
+    responses={
+        200: {
+            "description": "Columnar export of the current user's data",
+            "content": {
+                "application/vnd.apache.parquet": {},
+                "application/vnd.apache.arrow.stream": {},
+            },
+        },
+        401: {"description": "Unauthorized"},
+    },
+)
+def export_dataset(
+    dataset: ExportDatasetEnum,
+    format: ExportFormatEnum = Query(
+        ExportFormatEnum.parquet, description="Output format: parquet or arrow"
+    ),
+    user_id: uuid.UUID = Depends(deps.get_current_user_id),
+):
+    """
+    Stream the current user's inventory or consumption history as Parquet or
+    an Arrow IPC stream. Rows are read with a server-side cursor and sent in
+    chunks, so large histories never sit in memory.
+    """
+
+    def _body():
+        # The session must outlive the request handler, so it is owned here.
+        db = SessionLocal()
+        try:
+            yield from export_service.stream_export(db, dataset, format, user_id)
+        finally:
+            db.close()
+
+    filename = f"{dataset.value}.{export_service.FILE_EXTENSIONS[format]}"
+    return StreamingResponse(
+        _body(),
+        media_type=export_service.MEDIA_TYPES[format],
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
@@ -9,6 +9,7 @@ from fastapi import (
     File,
     Path,
 )
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session, selectinload
 from app.api import deps
 from app.models import Inventory, ConsumptionLog
@@ -21,7 +22,7 @@ from app.schemas.inventory import (
 )
 from app.schemas.consumption_log import ConsumptionLogSummary
 from app.api.deps import get_current_user
-from app.models.user import User
+from app.schemas.user import User as UserSchema
 from sqlalchemy.exc import SQLAlchemyError
 import uuid
 from app.services import inventory_service
@@ -41,9 +42,9 @@ router = APIRouter()
 
 
 @router.get("/inventory", response_model=InventoryPaginatedResponse)
-def list_inventory(
+async def list_inventory(
     *,
-    db: Session = Depends(deps.get_db),
+    db: AsyncSession = Depends(deps.get_async_db),
     page: int = Query(1, ge=1, description="Page number"),
     per_page: int = Query(10, ge=1, le=100, description="Items per page"),
 ):
@@ -55,7 +56,7 @@ def list_inventory(
 
     Returns a paginated response with inventory summaries and pagination metadata.
     """
-    total, items = inventory_service.list_inventory(db, page, per_page)
+    total, items = await inventory_service.async_list_inventory(db, page, per_page)
     summaries = [InventorySummary.model_validate(item) for item in items]
     return InventoryPaginatedResponse(
         total=total, page=page, size=per_page, items=summaries
@@ -63,9 +64,9 @@ def list_inventory(
 
 
 @router.get("/inventory/{item_id}", response_model=InventoryDetail)
-def get_inventory_detail(
+async def get_inventory_detail(
     *,
-    db: Session = Depends(deps.get_db),
+    db: AsyncSession = Depends(deps.get_async_db),
     item_id: uuid.UUID,
     include: str = Query(
         None,
@@ -81,7 +82,7 @@ def get_inventory_detail(
     If 'consumption_logs' is included, the response will nest related consumption logs.
     Returns an InventoryDetail object.
     """
-    item = inventory_service.get_inventory_detail(db, item_id, include)
+    item = await inventory_service.async_get_inventory_detail(db, item_id, include)
     if not item:
         raise HTTPException(status_code=404, detail="Inventory item not found")
     detail = InventoryDetail.model_validate(item)
@@ -133,7 +134,7 @@ def add_inventory_item(
     *,
     db: Session = Depends(deps.get_db),
     item_in: InventoryCreate = Body(...),
-    current_user: User = Depends(get_current_user),
+    current_user: UserSchema = Depends(get_current_user),
 ):
     """
     Add a new inventory item.
@@ -187,7 +188,7 @@ def update_inventory_item(
     db: Session = Depends(deps.get_db),
     item_id: uuid.UUID,
     item_in: InventoryUpdate,
-    current_user: User = Depends(deps.get_current_user),
+    current_user: UserSchema = Depends(deps.get_current_user),
 ):
     """
     Partially update an inventory item. Only the owner can update their items.
@@ -227,7 +228,7 @@ def update_inventory_item(
 def delete_inventory_item(
     *,
     db: Session = Depends(deps.get_db),
-    user: User = Depends(deps.get_current_user),
+    user: UserSchema = Depends(deps.get_current_user),
     item_id: uuid.UUID,
 ):
     """
@@ -287,8 +288,8 @@ def delete_inventory_item(
 async def upload_inventory_image(
     background_tasks: BackgroundTasks,
     file: UploadFile = File(...),
-    db: Session = Depends(deps.get_db),
-    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(deps.get_async_db),
+    current_user: UserSchema = Depends(get_current_user),
 ):
     logger = get_logger("UploadImage")
     # Validate file size (max 10MB)
@@ -330,10 +331,10 @@ async def upload_inventory_image(
             error_message=None,
         )
         db.add(image_upload)
-        db.commit()
-        db.refresh(image_upload)
+        await db.commit()
+        await db.refresh(image_upload)
     except Exception as e:
-        db.rollback()
+        await db.rollback()
         logger.error(f"Failed to create ImageUpload DB record: {e}")
         raise HTTPException(
             status_code=500, detail="Failed to create image upload record: " + str(e)
@@ -403,7 +404,7 @@ async def upload_inventory_image(
 def get_image_upload_status(
     image_id: uuid.UUID = Path(..., description="Image upload record ID"),
     db: Session = Depends(deps.get_db),
-    current_user: User = Depends(get_current_user),
+    current_user: UserSchema = Depends(get_current_user),
 ):
     logger = get_logger("ImageStatus")
     image_upload = db.query(ImageUpload).filter(ImageUpload.id == image_id).first()
@@ -477,7 +478,7 @@ def review_detections(
     image_id: uuid.UUID = Path(..., description="Image upload record ID"),
     review: ImageUploadReview = Body(...),
     db: Session = Depends(deps.get_db),
-    current_user: User = Depends(get_current_user),
+    current_user: UserSchema = Depends(get_current_user),
 ):
     logger = get_logger("ReviewDetections")
     image_upload = db.query(ImageUpload).filter(ImageUpload.id == image_id).first()
@@ -564,7 +565,7 @@ def create_inventory_from_detections(
     image_id: uuid.UUID = Path(..., description="Image upload record ID"),
     payload: InventoryFromDetectionPayload = Body(...),
     db: Session = Depends(deps.get_db),
-    current_user: User = Depends(get_current_user),
+    current_user: UserSchema = Depends(get_current_user),
 ):
     logger = get_logger("CreateFromDetections")
     image_upload = db.query(ImageUpload).filter(ImageUpload.id == image_id).first()
@@ -1,35 +1,107 @@
-from fastapi import APIRouter, Depends, HTTPException
+import time
+import uuid
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from app.services.recipe_service import RecipeService
-from typing import List
+from typing import Optional
 from app.api import deps
-from app.models.user import User
-from app.schemas.generated_recipe import GeneratedRecipeRead
+from app.schemas.generated_recipe import GeneratedRecipePage, GeneratedRecipeRead
+from app.utils.disconnect import cancel_on_disconnect
+from app.utils.metrics import metrics
+from app.utils.sse import SSE_HEADERS, sse_stream
 
 router = APIRouter()
 
+stream_ttfb_seconds = metrics.histogram(
+    "recipe_stream_ttfb_seconds",
+    "Time from a streaming recipe request to its first event",
+    buckets=(0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0),
+)
+
 
 @router.post("/generate-from-inventory", status_code=200)
-def generate_recipes_from_inventory(
-    db: Session = Depends(deps.get_db),
-    current_user: User = Depends(deps.get_current_user),
+async def generate_recipes_from_inventory(
+    request: Request,
+    count: Optional[int] = Query(
+        None,
+        ge=1,
+        description="Return a list of this many distinct recipes "
+        "(at most RECIPE_BATCH_MAX_COUNT), generated in one LLM call",
+    ),
+    db: AsyncSession = Depends(deps.get_async_db),
+    user_id: uuid.UUID = Depends(deps.get_current_user_id),
 ):
     """
     Generate recipes from the user's inventory.
+
+    Without ``count`` the response is a single recipe; with it, a list.
+    Runs on the event loop while Gemini responds; the LLM call is abandoned
+    if the client disconnects, and answers 504 if it exceeds
+    RECIPE_LLM_TIMEOUT_SECONDS.
     """
     recipe_service = RecipeService()
-    recipe = recipe_service.generate_recipe_from_inventory(db, current_user.id)
-    return recipe
+    if count is None:
+        generating = recipe_service.async_generate_recipe_from_inventory(db, user_id)
+    else:
+        generating = recipe_service.async_generate_recipes_from_inventory(
+            db, user_id, count
+        )
+    return await cancel_on_disconnect(request, generating)
+
+
+@router.post("/generate-from-inventory/stream")
+async def stream_recipes_from_inventory(
+    db: AsyncSession = Depends(deps.get_async_db),
+    user_id: uuid.UUID = Depends(deps.get_current_user_id),
+):
+    """
+    Generate a recipe from the user's inventory as server-sent events:
+    ``partial`` events carry the fields parsed so far, then one ``recipe``
+    event carries the validated recipe (or one ``error`` event with
+    ``detail`` and ``status_code``). An empty inventory is still a plain 400.
+    """
+    started = time.perf_counter()
+    recipe_service = RecipeService()
+    pantry = await recipe_service.async_load_pantry(db, user_id)
+    events = recipe_service.async_stream_recipe(db, user_id, pantry)
+    return StreamingResponse(
+        sse_stream(events, started, stream_ttfb_seconds),
+        media_type="text/event-stream",
+        headers=SSE_HEADERS,
+    )
 
 
-@router.get("/user-recipes", response_model=List[GeneratedRecipeRead])
+@router.get("/user-recipes", response_model=GeneratedRecipePage)
 def get_user_recipes(
+    limit: int = Query(20, ge=1, le=100, description="Recipes per page"),
+    cursor: Optional[str] = Query(None, description="next_cursor of the previous page"),
     db: Session = Depends(deps.get_db),
-    current_user: User = Depends(deps.get_current_user),
+    user_id: uuid.UUID = Depends(deps.get_current_user_id),
 ):
     """
-    Get all recipes generated for the current user.
+    List recipes generated for the current user, newest first, as summaries
+    without ingredients or directions (see GET /user-recipes/{recipe_id}).
+
+    - **limit**: Recipes per page (default 20, max 100)
+    - **cursor**: Continue after the previous page; 400 if malformed
     """
-    recipe_service = RecipeService()
-    recipes = recipe_service.get_generated_recipes(db, current_user.id)
-    return recipes
+    items, next_cursor = RecipeService.get_generated_recipes(db, user_id, limit, cursor)
+    return GeneratedRecipePage(items=items, next_cursor=next_cursor)
+
+
+@router.get("/user-recipes/{recipe_id}", response_model=GeneratedRecipeRead)
+def get_user_recipe(
+    recipe_id: uuid.UUID,
+    db: Session = Depends(deps.get_db),
+    user_id: uuid.UUID = Depends(deps.get_current_user_id),
+):
+    """
+    Get one of the current user's recipes in full; 404 if it is not theirs.
+    """
+    recipe = RecipeService.get_generated_recipe(db, user_id, recipe_id)
+    if recipe is None:
+        raise HTTPException(status_code=404, detail="Recipe not found")
+    return recipe
@@ -1,11 +1,13 @@
 from fastapi import APIRouter, Depends, HTTPException
 from fastapi.responses import JSONResponse
 from fastapi.openapi.models import Response as OpenAPIResponse
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 import app.api.deps as deps
+import app.schemas.nutrition as nutrition_schema
 import app.schemas.user as user_schema
+import app.services.nutrition_service as nutrition_service
 import app.services.user_service as user_service
-import app.models.user as user_model
 
 router = APIRouter()
 
@@ -24,6 +26,14 @@ router = APIRouter()
                 }
             },
         },
+        503: {
+            "description": "Password hashing is saturated; retry shortly",
+            "content": {
+                "application/json": {
+                    "example": {"detail": "Server busy, please retry shortly"}
+                }
+            },
+        },
         422: {
             "description": "Validation Error",
             "content": {
@@ -42,23 +52,35 @@ router = APIRouter()
         },
     },
 )
-def create_user(
+async def create_user(
     *,
-    db: Session = Depends(deps.get_db),
+    db: AsyncSession = Depends(deps.get_async_db),
     user_in: user_schema.UserCreate,
 ):
-    user = user_service.get_user_by_email(db, email=user_in.email)
+    user = await user_service.async_get_user_by_email(db, email=user_in.email)
     if user:
         raise HTTPException(
             status_code=400,
             detail="The user with this username already exists in the system.",
         )
-    user = user_service.create_user(db, user_in=user_in)
+    user = await user_service.async_create_user(db, user_in=user_in)
     return user
 
 
 @router.get("/me", response_model=user_schema.User)
 def read_users_me(
-    current_user: user_model.User = Depends(deps.get_current_user),
+    current_user: user_schema.User = Depends(deps.get_current_user),
 ):
     return current_user
+
+
+@router.get("/me/daily-summary", response_model=nutrition_schema.DailySummaryRead)
+def read_daily_summary(
+    db: Session = Depends(deps.get_db),
+    current_user: user_schema.User = Depends(deps.get_current_user),
+):
+    """
+    Daily tracker: calories and macros consumed so far today (in the user's
+    timezone) alongside their cached daily targets.
+    """
+    return nutrition_service.get_daily_summary(db, current_user)
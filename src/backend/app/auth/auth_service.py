@@ -1,13 +1,75 @@
+import heapq
+import threading
+import time
+import uuid
 from datetime import datetime, timedelta, timezone
-from typing import Optional
+from typing import Dict, List, Optional, Tuple
 
 from jose import jwt, JWTError
 from pydantic import ValidationError
 
-from app.core.config import Settings
+from app.core.config import settings
 from app.schemas.token import TokenPayload
+from app.utils.cache import LRUCache
 
-settings = Settings()
+# token -> decoded TokenPayload, so repeat requests skip signature checks.
+_token_cache = LRUCache(
+    maxsize=settings.AUTH_CACHE_MAX_SIZE, ttl=settings.AUTH_CACHE_TTL_SECONDS
+)
+
+
+class TokenDenylist:
+    """
+    Revoked access-token ids (``jti``), kept only until the token would have
+    expired anyway. Ids are stored as 16 raw bytes, so even a large logout
+    wave stays small. Per process: a token revoked on one worker is still
+    accepted by others until it expires (ACCESS_TOKEN_EXPIRE_MINUTES).
+    """
+
+    def __init__(self):
+        self._expiry: Dict[bytes, int] = {}
+        self._heap: List[Tuple[int, bytes]] = []
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _key(jti: str) -> bytes:
+        return uuid.UUID(hex=jti).bytes
+
+    def _prune(self, now: float) -> None:
+        while self._heap and self._heap[0][0] <= now:
+            _, key = heapq.heappop(self._heap)
+            self._expiry.pop(key, None)
+
+    def add(self, jti: str, exp: int) -> None:
+        key = self._key(jti)
+        with self._lock:
+            self._prune(time.time())
+            self._expiry[key] = exp
+            heapq.heappush(self._heap, (exp, key))
+
+    def __contains__(self, jti: Optional[str]) -> bool:
+        if not jti:
+            return False
+        try:
+            key = self._key(jti)
+        except ValueError:
+            return False
+        with self._lock:
+            exp = self._expiry.get(key)
+        return exp is not None and exp > time.time()
+
+    def __len__(self) -> int:
+        with self._lock:
+            self._prune(time.time())
+            return len(self._expiry)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._expiry.clear()
+            self._heap.clear()
+
+
+_denylist = TokenDenylist()
 
 
 class JWTService:
@@ -26,6 +88,8 @@ class JWTService:
             The encoded JWT access token.
         """
         to_encode = data.copy()
+        # Token id, so a single token can be revoked (see revoke_access_token).
+        to_encode.setdefault("jti", uuid.uuid4().hex)
         now = datetime.now(timezone.utc)
         if expires_delta:
             expire = now + expires_delta
@@ -58,6 +122,37 @@ class JWTService:
             payload = jwt.decode(
                 token, settings.JWT_SECRET_KEY, algorithms=[settings.JWT_ALGORITHM]
             )
-            return TokenPayload(**payload)
+            token_payload = TokenPayload(**payload)
         except (JWTError, ValidationError):
             return None
+        if token_payload.jti in _denylist:
+            return None
+        return token_payload
+
+    @staticmethod
+    def verify_access_token_cached(token: str) -> Optional[TokenPayload]:
+        """
+        verify_access_token with a short-lived per-process cache of valid
+        tokens. An entry never outlives the token's own ``exp``.
+        """
+        payload = _token_cache.get(token)
+        if payload is not None:
+            return None if payload.jti in _denylist else payload
+        payload = JWTService.verify_access_token(token)
+        if payload is not None:
+            ttl = settings.AUTH_CACHE_TTL_SECONDS
+            if payload.exp is not None:
+                ttl = min(ttl, payload.exp - time.time())
+            if ttl > 0:
+                _token_cache.set(token, payload, ttl=ttl)
+        return payload
+
+    @staticmethod
+    def revoke_access_token(payload: TokenPayload) -> None:
+        """
+        Reject the token from now on (until its ``exp``). Tokens without a
+        ``jti`` (issued before token ids were added) cannot be revoked and
+        simply expire.
+        """
+        if payload.jti and payload.exp:
+            _denylist.add(payload.jti, payload.exp)
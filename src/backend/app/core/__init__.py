@@ -1,7 +1,5 @@
 """Core configuration and security modules."""
 
-from .config import Settings
+from .config import get_settings, settings
 
-settings = Settings()
-
-__all__ = ["settings"]
+__all__ = ["get_settings", "settings"]
@@ -1,5 +1,5 @@
-from typing import List, Union
-from dotenv import load_dotenv
+from functools import lru_cache
+from typing import Dict, List, Optional, Union
 from pydantic_settings import BaseSettings, SettingsConfigDict
 from pydantic import (
     PostgresDsn,
@@ -10,7 +10,7 @@ from pydantic import (
     AnyHttpUrl,
 )
 
-load_dotenv()
+from app.utils.env import ENV_FILES
 
 
 class Settings(BaseSettings):
@@ -26,16 +26,33 @@ class Settings(BaseSettings):
     DATABASE_URL: PostgresDsn
     DATABASE_URL_TEST: PostgresDsn = None
 
+    # Connection pool settings live in app.db.settings.DatabaseSettings.
+
     # Security
     JWT_SECRET_KEY: str
     JWT_ALGORITHM: str = Field(
         "HS256", pattern="^(HS256|HS384|HS512|RS256|RS384|RS512)$"
     )
     ACCESS_TOKEN_EXPIRE_MINUTES: int = Field(30, gt=0)
+    REFRESH_TOKEN_EXPIRE_DAYS: int = Field(30, gt=0)
+    # Decoded tokens and user snapshots resolved by get_current_user are cached
+    # per process for this long (0 disables the cache).
+    AUTH_CACHE_TTL_SECONDS: float = Field(60.0, ge=0)
+    AUTH_CACHE_MAX_SIZE: int = Field(10000, ge=1)
+    # Tokens carry the user id as subject. Tokens issued before that used the
+    # email; keep accepting them until every such token has expired (i.e.
+    # ACCESS_TOKEN_EXPIRE_MINUTES after the upgrade), then turn this off.
+    AUTH_ACCEPT_EMAIL_SUBJECT: bool = True
 
     # Password Settings
     PASSWORD_MIN_LENGTH: int = Field(6, gt=0)
     PASSWORD_MAX_LENGTH: int = Field(18, gt=0)
+    # bcrypt cost factor; existing hashes are upgraded on the next login.
+    PASSWORD_HASH_ROUNDS: int = Field(12, ge=4, le=31)
+    # Dedicated hashing threads, and how many more requests may wait for one
+    # before login/registration answer 503.
+    PASSWORD_HASH_WORKERS: int = Field(4, ge=1)
+    PASSWORD_HASH_MAX_QUEUE: int = Field(32, ge=0)
 
     @model_validator(mode="after")
     def validate_password_lengths(self) -> "Settings":
@@ -46,7 +63,23 @@ class Settings(BaseSettings):
         return self
 
     # Rate Limiting
+    RATE_LIMIT_ENABLED: bool = True
+    # Login attempts per minute, per client IP and per account.
     RATE_LIMIT_PER_MINUTE: int = Field(5, gt=0)
+    # Extra per-IP limits: path prefix -> requests per minute, e.g.
+    # RATE_LIMIT_RULES='{"/api/v1/recipe": 30}'
+    RATE_LIMIT_RULES: Dict[str, int] = Field(default_factory=dict)
+    # "memory" is per process; "redis" shares the window across workers.
+    RATE_LIMIT_BACKEND: str = Field("memory", pattern="^(memory|redis)$")
+    RATE_LIMIT_REDIS_URL: Optional[str] = None
+    # Use the first X-Forwarded-For hop as client IP (only behind a proxy).
+    RATE_LIMIT_TRUST_FORWARDED: bool = False
+
+    @model_validator(mode="after")
+    def validate_rate_limit_backend(self) -> "Settings":
+        if self.RATE_LIMIT_BACKEND == "redis" and not self.RATE_LIMIT_REDIS_URL:
+            raise ValueError("RATE_LIMIT_REDIS_URL is required for the redis backend")
+        return self
 
     @field_validator("RATE_LIMIT_PER_MINUTE")
     @classmethod
@@ -65,6 +98,60 @@ class Settings(BaseSettings):
 
     # GEMINI API
     GEMINI_API_KEY: str
+    # Outstanding async recipe LLM calls per process; further requests wait
+    # for a slot. The timeout covers that wait plus the call itself.
+    RECIPE_LLM_MAX_CONCURRENCY: int = Field(8, ge=1)
+    RECIPE_LLM_TIMEOUT_SECONDS: float = Field(30.0, gt=0)
+    # Each Gemini attempt has its own timeout and failed attempts are retried
+    # with jittered backoff, all within RECIPE_LLM_TIMEOUT_SECONDS. After
+    # RECIPE_LLM_BREAKER_FAILURES consecutive failed calls (each counted once,
+    # however many attempts it made) calls fail fast for
+    # RECIPE_LLM_BREAKER_RESET_SECONDS. With hedging, an async attempt still
+    # running after the given latency quantile gets a second request.
+    RECIPE_LLM_CALL_TIMEOUT_SECONDS: float = Field(12.0, gt=0)
+    RECIPE_LLM_RETRIES: int = Field(2, ge=0)
+    RECIPE_LLM_RETRY_BASE_DELAY_SECONDS: float = Field(0.25, ge=0)
+    RECIPE_LLM_HEDGE_ENABLED: bool = False
+    RECIPE_LLM_HEDGE_QUANTILE: float = Field(0.95, gt=0, lt=1)
+    RECIPE_LLM_BREAKER_FAILURES: int = Field(5, ge=1)
+    RECIPE_LLM_BREAKER_RESET_SECONDS: float = Field(30.0, gt=0)
+    # Answer from the bundled offline recipe corpus when Gemini fails, or
+    # has not answered within the deadline (the LLM call is then dropped).
+    RECIPE_LOCAL_FALLBACK_ENABLED: bool = True
+    RECIPE_LOCAL_FALLBACK_DEADLINE_SECONDS: float = Field(8.0, gt=0)
+    # Estimated tokens the pantry section of a recipe prompt may use; the
+    # lowest ranked inventory items are left out beyond it.
+    RECIPE_PROMPT_TOKEN_BUDGET: int = Field(400, ge=50)
+    # Most recipes one request (and one LLM call) may ask for.
+    RECIPE_BATCH_MAX_COUNT: int = Field(5, ge=1, le=10)
+    # Generated recipes are reused for pantries with the same canonical
+    # ingredients, goal and macro profile, or (below 1.0) for the most
+    # similar cached ingredient set with at least this Jaccard similarity.
+    RECIPE_CACHE_ENABLED: bool = True
+    RECIPE_CACHE_TTL_SECONDS: float = Field(3600.0, gt=0)
+    RECIPE_CACHE_MAX_SIZE: int = Field(1024, ge=1)
+    RECIPE_CACHE_SIMILARITY_THRESHOLD: float = Field(0.8, gt=0, le=1)
+    # Every LLM call (and recipe cache hit) is written to llm_usage in
+    # multi-row inserts, every LLM_USAGE_FLUSH_SECONDS or once a batch is
+    # full. LLM_USER_DAILY_TOKEN_QUOTA caps each user's tokens per UTC day
+    # (0: unlimited).
+    LLM_USAGE_RECORDING_ENABLED: bool = True
+    LLM_USAGE_FLUSH_SECONDS: float = Field(5.0, gt=0)
+    LLM_USAGE_BATCH_SIZE: int = Field(500, ge=1)
+    LLM_USAGE_MAX_BUFFERED: int = Field(10000, ge=1)
+    LLM_USER_DAILY_TOKEN_QUOTA: int = Field(0, ge=0)
+    # Background pre-generation of recipes after inventory changes: a user is
+    # refreshed once their inventory has been quiet for the debounce period,
+    # by a few workers sharing a per-minute LLM call budget.
+    RECIPE_SUGGESTIONS_ENABLED: bool = True
+    RECIPE_SUGGESTION_COUNT: int = Field(3, ge=1)
+    RECIPE_SUGGESTION_DEBOUNCE_SECONDS: float = Field(30.0, ge=0)
+    RECIPE_SUGGESTION_WORKERS: int = Field(2, ge=1)
+    RECIPE_SUGGESTION_LLM_CALLS_PER_MINUTE: int = Field(20, ge=1)
+
+    # Bearer token required to scrape /metrics; the endpoint is disabled
+    # (404) while unset.
+    METRICS_TOKEN: Optional[str] = None
 
     @field_validator("BACKEND_CORS_ORIGINS", mode="before")
     @classmethod
@@ -75,7 +162,22 @@ class Settings(BaseSettings):
             return v
         raise ValueError(v)
 
-    model_config = SettingsConfigDict(case_sensitive=True, env_file=".env")
+    # The shared .env also carries DatabaseSettings keys (DB_POOL_* etc.).
+    model_config = SettingsConfigDict(
+        case_sensitive=True, env_file=ENV_FILES, extra="ignore"
+    )
+
+
+@lru_cache
+def get_settings() -> Settings:
+    """
+    The process-wide Settings, parsed from the environment once.
+
+    Use ``Depends(get_settings)`` in endpoints so tests can swap it through
+    ``app.dependency_overrides``; call ``get_settings.cache_clear()`` to
+    re-read the environment.
+    """
+    return Settings()
 
 
-settings = Settings()
+settings = get_settings()
@@ -1,6 +1,17 @@
+from typing import Optional, Tuple
+
 from passlib.context import CryptContext
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+from app.core.config import settings
+from app.utils.executor import BoundedExecutor
+
+# Hashes made with a different cost factor are flagged by needs_update and
+# re-hashed on the next successful login (see verify_and_update).
+pwd_context = CryptContext(
+    schemes=["bcrypt"], deprecated="auto", bcrypt__rounds=settings.PASSWORD_HASH_ROUNDS
+)
+
+_hash_executor: Optional[BoundedExecutor] = None
 
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
@@ -22,3 +33,52 @@ def get_password_hash(password: str) -> str:
     :return: The hashed password.
     """
     return pwd_context.hash(password)
+
+
+def verify_and_update(
+    plain_password: str, hashed_password: str
+) -> Tuple[bool, Optional[str]]:
+    """
+    Verifies a password and, if the stored hash uses outdated settings
+    (e.g. a different PASSWORD_HASH_ROUNDS), returns a replacement hash.
+
+    :return: (matches, new_hash or None)
+    """
+    return pwd_context.verify_and_update(plain_password, hashed_password)
+
+
+def get_hash_executor() -> BoundedExecutor:
+    """
+    Dedicated pool for bcrypt work. bcrypt releases the GIL while hashing, so
+    threads give real parallelism without competing with the request
+    threadpool; the queue cap turns a login burst into fast 503s.
+    """
+    global _hash_executor
+    if _hash_executor is None:
+        _hash_executor = BoundedExecutor(
+            "bcrypt",
+            max_workers=settings.PASSWORD_HASH_WORKERS,
+            max_queue=settings.PASSWORD_HASH_MAX_QUEUE,
+        )
+    return _hash_executor
+
+
+async def async_verify_password(plain_password: str, hashed_password: str) -> bool:
+    """verify_password on the hash executor; raises ExecutorBusyError when full."""
+    return await get_hash_executor().run(
+        verify_password, plain_password, hashed_password
+    )
+
+
+async def async_get_password_hash(password: str) -> str:
+    """get_password_hash on the hash executor; raises ExecutorBusyError when full."""
+    return await get_hash_executor().run(get_password_hash, password)
+
+
+async def async_verify_and_update(
+    plain_password: str, hashed_password: str
+) -> Tuple[bool, Optional[str]]:
+    """verify_and_update on the hash executor; raises ExecutorBusyError when full."""
+    return await get_hash_executor().run(
+        verify_and_update, plain_password, hashed_password
+    )
@@ -1,19 +1,19 @@
 from sqlalchemy import create_engine
 from sqlalchemy.orm import declarative_base
 from sqlalchemy.orm import sessionmaker
-import os
-from dotenv import load_dotenv
 
-# Load environment variables
-load_dotenv()
+from app.db.pool import apply_session_settings, engine_kwargs, instrument_engine
+from app.db.settings import get_database_settings
 
-# Get database URL from environment variable
-DATABASE_URL = os.getenv("DATABASE_URL")
+# Database URL from the environment (or .env)
+DATABASE_URL = get_database_settings().DATABASE_URL
 if not DATABASE_URL:
     raise ValueError("DATABASE_URL environment variable is not set")
 
-# Create engine
-engine = create_engine(DATABASE_URL, connect_args={"options": "-c timezone=utc"})
+# Create engine; pool sizing comes from DatabaseSettings (see app/db/settings.py)
+engine = create_engine(DATABASE_URL, **engine_kwargs("sync"))
+instrument_engine(engine, "sync")
+apply_session_settings(engine)
 
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
@@ -0,0 +1,56 @@
+from typing import Optional
+
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
+    AsyncSession,
+    async_sessionmaker,
+    create_async_engine,
+)
+
+from app.db import DATABASE_URL
+from app.db.pool import apply_session_settings, engine_kwargs, instrument_engine
+
+_async_engine: Optional[AsyncEngine] = None
+_async_session_factory: Optional[async_sessionmaker] = None
+
+
+def to_async_url(url: str) -> str:
+    """Rewrite a sync Postgres URL (psycopg2 or bare) to use the asyncpg driver."""
+    return (
+        make_url(url)
+        .set(drivername="postgresql+asyncpg")
+        .render_as_string(hide_password=False)
+    )
+
+
+def create_async_db_engine(url: str = DATABASE_URL, **overrides) -> AsyncEngine:
+    async_engine = create_async_engine(
+        to_async_url(url), **engine_kwargs("async", is_async=True, **overrides)
+    )
+    instrument_engine(async_engine.sync_engine, "async")
+    apply_session_settings(async_engine.sync_engine, is_async=True)
+    return async_engine
+
+
+def get_async_engine() -> AsyncEngine:
+    """
+    Return the process-wide async engine, creating it on first use so that
+    processes which never touch the async path (jobs, workers) do not need
+    asyncpg installed.
+    """
+    global _async_engine
+    if _async_engine is None:
+        _async_engine = create_async_db_engine()
+    return _async_engine
+
+
+def AsyncSessionLocal() -> AsyncSession:
+    global _async_session_factory
+    if _async_session_factory is None:
+        # Objects stay usable after commit; there is no implicit lazy refresh
+        # in async code.
+        _async_session_factory = async_sessionmaker(
+            bind=get_async_engine(), autoflush=False, expire_on_commit=False
+        )
+    return _async_session_factory()
@@ -0,0 +1,175 @@
+"""
+Maintenance helpers for the monthly range partitions of ``consumption_log``.
+
+Partitions are named ``consumption_log_pYYYY_MM`` and cover
+``[first day of month, first day of next month)``.
+"""
+
+import gzip
+import re
+from datetime import date, datetime
+from pathlib import Path
+from typing import List, Optional
+
+from sqlalchemy import text
+from sqlalchemy.engine import Connection, Engine
+
+PARENT_TABLE = "consumption_log"
+DEFAULT_PARTITION = "consumption_log_default"
+_PARTITION_RE = re.compile(r"^consumption_log_p(\d{4})_(\d{2})$")
+
+
+def month_start(day: date) -> date:
+    return date(day.year, day.month, 1)
+
+
+def add_months(day: date, months: int) -> date:
+    index = day.year * 12 + day.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def partition_name(month: date) -> str:
+    return f"{PARENT_TABLE}_p{month:%Y_%m}"
+
+
+def list_partitions(conn: Connection) -> List[date]:
+    """Return the months that currently have an attached partition, sorted."""
+    rows = conn.execute(
+        text(
+            "SELECT child.relname FROM pg_inherits "
+            "JOIN pg_class parent ON parent.oid = pg_inherits.inhparent "
+            "JOIN pg_class child ON child.oid = pg_inherits.inhrelid "
+            "WHERE parent.relname = :parent"
+        ),
+        {"parent": PARENT_TABLE},
+    )
+    months = []
+    for (name,) in rows:
+        match = _PARTITION_RE.match(name)
+        if match:
+            months.append(date(int(match.group(1)), int(match.group(2)), 1))
+    return sorted(months)
+
+
+def ensure_partitions(
+    conn: Connection, start: Optional[date] = None, months_ahead: int = 3
+) -> List[str]:
+    """
+    Create missing monthly partitions from ``start``'s month (default: this
+    month) through ``months_ahead`` months later. Returns created table names.
+
+    Run this well ahead of time: a new partition cannot be attached while the
+    default partition already holds rows for its range.
+    """
+    first = month_start(start or date.today())
+    existing = set(list_partitions(conn))
+    created = []
+    for offset in range(months_ahead + 1):
+        month = add_months(first, offset)
+        if month in existing:
+            continue
+        name = partition_name(month)
+        conn.execute(
+            text(
+                f'CREATE TABLE IF NOT EXISTS "{name}" PARTITION OF {PARENT_TABLE} '
+                f"FOR VALUES FROM ('{month.isoformat()}') "
+                f"TO ('{add_months(month, 1).isoformat()}')"
+            )
+        )
+        created.append(name)
+    return created
+
+
+def list_detached_partitions(conn: Connection) -> List[date]:
+    """
+    Months whose partition table exists but is no longer attached, i.e. left
+    behind by an archive run that failed after detaching.
+    """
+    rows = conn.execute(
+        text(
+            "SELECT relname FROM pg_class "
+            "WHERE relkind = 'r' AND relname LIKE :prefix "
+            "AND NOT relispartition"
+        ),
+        {"prefix": f"{PARENT_TABLE}_p%"},
+    )
+    months = []
+    for (name,) in rows:
+        match = _PARTITION_RE.match(name)
+        if match:
+            months.append(date(int(match.group(1)), int(match.group(2)), 1))
+    return sorted(months)
+
+
+def _copy_to_gzip(conn: Connection, query: str, path: Path) -> None:
+    """COPY ``query`` as gzipped CSV to ``path``; no partial file is left behind."""
+    cursor = conn.connection.cursor()
+    try:
+        with gzip.open(path, "wb") as out:
+            cursor.copy_expert(
+                f"COPY {query} TO STDOUT WITH (FORMAT csv, HEADER true)", out
+            )
+    except BaseException:
+        path.unlink(missing_ok=True)
+        raise
+    finally:
+        cursor.close()
+
+
+def archive_partitions(engine: Engine, before: date, output_dir: Path) -> List[Path]:
+    """
+    Detach every monthly partition that ends on or before ``before``, export it
+    to ``<output_dir>/<partition>.csv.gz`` and drop it. Rows older than
+    ``before`` that landed in the default partition are exported to
+    ``<output_dir>/consumption_log_default_before_<date>.csv.gz`` and deleted.
+
+    Each partition is handled in its own short transactions: the DETACH, which
+    takes an ACCESS EXCLUSIVE lock on consumption_log, is committed before the
+    export starts, so reads and inserts are only blocked for the detach itself.
+    (DETACH ... CONCURRENTLY is not an option while a default partition
+    exists.) A partition whose export fails stays detached and is picked up by
+    the next run.
+    """
+    output_dir.mkdir(parents=True, exist_ok=True)
+    archived = []
+    with engine.connect() as conn:
+        attached = [m for m in list_partitions(conn) if add_months(m, 1) <= before]
+        detached = [
+            m for m in list_detached_partitions(conn) if add_months(m, 1) <= before
+        ]
+        conn.rollback()
+
+    for month in sorted(set(attached) | set(detached)):
+        name = partition_name(month)
+        path = output_dir / f"{name}.csv.gz"
+        if month in attached:
+            with engine.begin() as conn:
+                conn.execute(
+                    text(f'ALTER TABLE {PARENT_TABLE} DETACH PARTITION "{name}"')
+                )
+        with engine.begin() as conn:
+            _copy_to_gzip(conn, f'"{name}"', path)
+            conn.execute(text(f'DROP TABLE "{name}"'))
+        archived.append(path)
+
+    path = output_dir / f"{DEFAULT_PARTITION}_before_{before:%Y_%m_%d}.csv.gz"
+    predicate = f"consumed_at < '{before.isoformat()}'"
+    # One snapshot for the export and the delete, so rows inserted in between
+    # are neither exported nor deleted.
+    with engine.connect().execution_options(isolation_level="REPEATABLE READ") as conn:
+        with conn.begin():
+            stale = conn.execute(
+                text(f"SELECT count(*) FROM {DEFAULT_PARTITION} WHERE {predicate}")
+            ).scalar()
+            if stale:
+                _copy_to_gzip(
+                    conn, f"(SELECT * FROM {DEFAULT_PARTITION} WHERE {predicate})", path
+                )
+                conn.execute(text(f"DELETE FROM {DEFAULT_PARTITION} WHERE {predicate}"))
+                archived.append(path)
+    return archived
+
+
+def retention_cutoff(retain_months: int, today: Optional[date] = None) -> date:
+    """First day of the oldest month to keep when retaining ``retain_months``."""
+    return add_months(month_start(today or datetime.utcnow().date()), -retain_months)
@@ -0,0 +1,176 @@
+import time
+from typing import Any, Dict, Optional
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.pool import AsyncAdaptedQueuePool, NullPool, QueuePool
+
+from app.db.settings import DatabaseSettings, get_database_settings
+from app.utils.metrics import metrics
+
+checkout_wait_seconds = metrics.histogram(
+    "db_pool_checkout_wait_seconds",
+    "Time spent waiting for a connection from the pool",
+    buckets=(0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 30.0),
+)
+checked_out_connections = metrics.gauge(
+    "db_pool_checked_out", "Connections currently checked out of the pool"
+)
+overflow_connections = metrics.gauge(
+    "db_pool_overflow", "Connections open beyond pool_size (negative = idle capacity)"
+)
+checkout_timeouts = metrics.counter(
+    "db_pool_checkout_timeouts_total", "Checkouts that gave up after pool_timeout"
+)
+
+
+class _TimedCheckoutMixin:
+    # Pool events only fire once a connection has been handed out, so the wait
+    # for a free slot (plus connect/pre-ping, if any) is timed around the
+    # public Pool.connect(), which Engine.raw_connection() calls.
+    def connect(self):
+        pool_name = self.logging_name or "default"
+        start = time.perf_counter()
+        try:
+            return super().connect()
+        except PoolTimeoutError:
+            checkout_timeouts.inc(pool=pool_name)
+            raise
+        finally:
+            checkout_wait_seconds.observe(time.perf_counter() - start, pool=pool_name)
+
+
+class InstrumentedQueuePool(_TimedCheckoutMixin, QueuePool):
+    pass
+
+
+class InstrumentedAsyncAdaptedQueuePool(_TimedCheckoutMixin, AsyncAdaptedQueuePool):
+    pass
+
+
+def _server_settings(settings: DatabaseSettings) -> Dict[str, str]:
+    server_settings = {"timezone": "utc"}
+    if settings.DB_STATEMENT_TIMEOUT_MS:
+        server_settings["statement_timeout"] = str(settings.DB_STATEMENT_TIMEOUT_MS)
+    return server_settings
+
+
+def _connect_args(settings: DatabaseSettings, is_async: bool) -> Dict[str, Any]:
+    if settings.DB_PGBOUNCER_MODE:
+        # PgBouncer refuses libpq "options" and drops startup parameters it
+        # does not track (TimeZone is tracked); the rest is applied per
+        # transaction by apply_session_settings.
+        if not is_async:
+            return {}
+        # Prepared statements are per server connection, which PgBouncer in
+        # transaction mode does not pin to a client.
+        return {
+            "server_settings": {"timezone": "utc"},
+            "statement_cache_size": 0,
+            "prepared_statement_cache_size": 0,
+        }
+    server_settings = _server_settings(settings)
+    if is_async:
+        return {"server_settings": server_settings}
+    return {
+        "options": " ".join(
+            f"-c {key}={value}" for key, value in server_settings.items()
+        )
+    }
+
+
+def _transaction_settings(settings: DatabaseSettings, is_async: bool) -> Dict[str, str]:
+    """Settings _connect_args could not send at startup (PgBouncer mode)."""
+    if not settings.DB_PGBOUNCER_MODE:
+        return {}
+    transaction_settings = _server_settings(settings)
+    if is_async:
+        transaction_settings.pop("timezone")
+    return transaction_settings
+
+
+def engine_kwargs(
+    name: str,
+    is_async: bool = False,
+    settings: Optional[DatabaseSettings] = None,
+    **overrides,
+) -> Dict[str, Any]:
+    """
+    Keyword arguments for create_engine/create_async_engine built from
+    DatabaseSettings (read from the environment unless ``settings`` is given).
+
+    ``name`` labels the pool in metrics. Explicit ``overrides`` win; passing
+    ``poolclass=NullPool`` (or enabling DB_PGBOUNCER_MODE) drops the sizing
+    options, which NullPool does not accept.
+    """
+    settings = settings or get_database_settings()
+    kwargs: Dict[str, Any] = {
+        "connect_args": _connect_args(settings, is_async),
+        "pool_pre_ping": settings.DB_POOL_PRE_PING,
+        "pool_logging_name": name,
+    }
+    if settings.DB_PGBOUNCER_MODE:
+        kwargs["poolclass"] = NullPool
+    else:
+        kwargs.update(
+            poolclass=(
+                InstrumentedAsyncAdaptedQueuePool if is_async else InstrumentedQueuePool
+            ),
+            pool_size=settings.DB_POOL_SIZE,
+            max_overflow=settings.DB_MAX_OVERFLOW,
+            pool_timeout=settings.DB_POOL_TIMEOUT,
+            pool_recycle=settings.DB_POOL_RECYCLE,
+        )
+    kwargs.update(overrides)
+    if kwargs["poolclass"] is NullPool:
+        for key in ("pool_size", "max_overflow", "pool_timeout", "pool_recycle"):
+            kwargs.pop(key, None)
+    return kwargs
+
+
+def instrument_engine(engine: Engine, name: str) -> None:
+    """
+    Record checked-out and overflow gauges on every checkout/checkin.
+    For an AsyncEngine pass ``engine.sync_engine``.
+    """
+
+    def _record(returning: int):
+        pool = engine.pool
+        if isinstance(pool, QueuePool):
+            checked_out_connections.set(pool.checkedout() - returning, pool=name)
+            overflow_connections.set(pool.overflow(), pool=name)
+
+    def _on_checkout(dbapi_connection, connection_record, connection_proxy):
+        _record(0)
+
+    def _on_checkin(dbapi_connection, connection_record):
+        # Fires just before the connection goes back into the pool.
+        _record(1)
+
+    event.listen(engine, "checkout", _on_checkout)
+    event.listen(engine, "checkin", _on_checkin)
+
+
+def apply_session_settings(
+    engine: Engine, is_async: bool = False, settings: Optional[DatabaseSettings] = None
+) -> None:
+    """
+    In DB_PGBOUNCER_MODE, ``SET LOCAL`` the settings that cannot be sent at
+    connect time at the start of every transaction, since consecutive
+    transactions may run on different server connections.
+    For an AsyncEngine pass ``engine.sync_engine``.
+    """
+    settings = settings or get_database_settings()
+    statements = [
+        f"SET LOCAL {key} = '{value}'"
+        for key, value in _transaction_settings(settings, is_async).items()
+    ]
+    if not statements:
+        return
+
+    def _on_begin(conn):
+        for statement in statements:
+            conn.exec_driver_sql(statement)
+
+    event.listen(engine, "begin", _on_begin)
@@ -0,0 +1,43 @@
+from functools import lru_cache
+from typing import Optional
+
+from pydantic import Field
+from pydantic_settings import BaseSettings, SettingsConfigDict
+
+from app.utils.env import ENV_FILES
+
+
+class DatabaseSettings(BaseSettings):
+    """
+    Connection URL and pool settings. Kept apart from app.core.config.Settings so that
+    jobs and workers that only need the database do not require the API
+    secrets (JWT_SECRET_KEY, GEMINI_API_KEY) to be set.
+    """
+
+    DATABASE_URL: Optional[str] = None
+
+    DB_POOL_SIZE: int = Field(5, ge=1, description="Persistent connections per pool")
+    DB_MAX_OVERFLOW: int = Field(
+        10, ge=0, description="Extra connections allowed above DB_POOL_SIZE"
+    )
+    DB_POOL_TIMEOUT: float = Field(
+        30.0, gt=0, description="Seconds to wait for a free connection"
+    )
+    DB_POOL_RECYCLE: int = Field(
+        1800, ge=-1, description="Recycle connections older than this (-1 = never)"
+    )
+    DB_POOL_PRE_PING: bool = True
+    DB_STATEMENT_TIMEOUT_MS: int = Field(
+        0, ge=0, description="Server-side statement_timeout (0 = disabled)"
+    )
+    # Transaction-pooling PgBouncer: no client-side pool, no prepared statements.
+    DB_PGBOUNCER_MODE: bool = False
+
+    model_config = SettingsConfigDict(
+        case_sensitive=True, env_file=ENV_FILES, extra="ignore"
+    )
+
+
+@lru_cache
+def get_database_settings() -> DatabaseSettings:
+    return DatabaseSettings()
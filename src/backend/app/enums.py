@@ -26,3 +26,18 @@ class ImageUploadStatus(str, Enum):
     processing = "processing"
     complete = "complete"
     failed = "failed"
+
+
+class AlertTypeEnum(str, Enum):
+    expiry = "expiry"
+    calorie_intake = "calorie_intake"
+
+
+class ExportDatasetEnum(str, Enum):
+    consumption_log = "consumption_log"
+    inventory = "inventory"
+
+
+class ExportFormatEnum(str, Enum):
+    parquet = "parquet"
+    arrow = "arrow"
@@ -0,0 +1 @@
+"""Scheduled jobs and maintenance commands, run with ``python -m app.jobs.<name>``."""
@@ -0,0 +1,51 @@
+"""
+Manage the monthly partitions of the consumption_log table.
+
+    python -m app.jobs.consumption_log_partitions ensure --months-ahead 3
+    python -m app.jobs.consumption_log_partitions archive --retain-months 24 \
+        --output-dir /var/backups/consumption_log
+
+Run ``ensure`` daily so next months' partitions always exist before rows
+arrive; run ``archive`` monthly to detach, export (gzipped CSV) and drop
+partitions older than the retention window.
+"""
+
+import argparse
+from pathlib import Path
+
+from app.db import engine
+from app.db import partitions
+from app.utils.logger import get_logger
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    ensure = commands.add_parser("ensure", help="Create upcoming partitions")
+    ensure.add_argument("--months-ahead", type=int, default=3)
+
+    archive = commands.add_parser("archive", help="Export and drop old partitions")
+    archive.add_argument("--retain-months", type=int, required=True)
+    archive.add_argument("--output-dir", type=Path, required=True)
+
+    args = parser.parse_args(argv)
+    logger = get_logger("ConsumptionLogPartitionsJob")
+
+    if args.command == "ensure":
+        with engine.begin() as conn:
+            created = partitions.ensure_partitions(conn, months_ahead=args.months_ahead)
+        logger.info(f"Created partitions: {created or 'none'}")
+    else:
+        # Manages its own short transactions, one partition at a time.
+        cutoff = partitions.retention_cutoff(args.retain_months)
+        archived = partitions.archive_partitions(engine, cutoff, args.output_dir)
+        logger.info(
+            f"Archived {len(archived)} partitions older than {cutoff}: "
+            f"{[str(path) for path in archived]}"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,41 @@
+"""
+Evaluate expiry and calorie alerts for every user whose local day has started.
+
+Schedule this hourly (cron, Kubernetes CronJob, ...). Each user is evaluated at
+most once per local calendar day, so running it more often is cheap.
+
+    python -m app.jobs.evaluate_alerts --chunk-size 500 --workers 4
+"""
+
+import argparse
+
+from app.services import alert_service
+from app.utils.logger import get_logger
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument(
+        "--chunk-size",
+        type=int,
+        default=alert_service.DEFAULT_CHUNK_SIZE,
+        help="Number of users evaluated per worker task",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=None,
+        help="Worker processes (default: CPU count, 1 runs inline)",
+    )
+    args = parser.parse_args(argv)
+
+    logger = get_logger("EvaluateAlertsJob")
+    total = alert_service.evaluate_alerts(
+        chunk_size=args.chunk_size, max_workers=args.workers
+    )
+    logger.info(f"Wrote {total} alerts")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
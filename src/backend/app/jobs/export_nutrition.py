@@ -0,0 +1,52 @@
+"""
+Export ConsumptionLog or Inventory history to a Parquet file or Arrow IPC stream.
+
+    python -m app.jobs.export_nutrition consumption_log exports/log.parquet
+    python -m app.jobs.export_nutrition inventory exports/inv.arrows --format arrow
+
+Rows are streamed through a server-side cursor in bounded chunks, so the
+whole table can be exported without loading it into memory.
+"""
+
+import argparse
+import uuid
+from pathlib import Path
+
+from app.db import SessionLocal
+from app.enums import ExportDatasetEnum, ExportFormatEnum
+from app.services import export_service
+from app.utils.logger import get_logger
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("dataset", type=ExportDatasetEnum)
+    parser.add_argument("output", type=Path)
+    parser.add_argument(
+        "--format", type=ExportFormatEnum, default=ExportFormatEnum.parquet
+    )
+    parser.add_argument("--user-id", type=uuid.UUID, default=None)
+    parser.add_argument(
+        "--chunk-size", type=int, default=export_service.DEFAULT_CHUNK_SIZE
+    )
+    args = parser.parse_args(argv)
+
+    logger = get_logger("ExportNutritionJob")
+    args.output.parent.mkdir(parents=True, exist_ok=True)
+    db = SessionLocal()
+    written = 0
+    try:
+        with open(args.output, "wb") as out:
+            for data in export_service.stream_export(
+                db, args.dataset, args.format, args.user_id, args.chunk_size
+            ):
+                out.write(data)
+                written += len(data)
+    finally:
+        db.close()
+    logger.info(f"Exported {args.dataset.value} to {args.output} ({written} bytes)")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -1,10 +1,35 @@
-from fastapi import FastAPI
+from contextlib import asynccontextmanager
+
+from fastapi import FastAPI, Request, status
+from fastapi.responses import JSONResponse
 from fastapi.middleware.cors import CORSMiddleware
+from app.api import metrics
 from app.api.v1.api import api_router
 from app.core.config import settings
+from app.middleware.rate_limit import RateLimitMiddleware
+from app.services.llm_usage import usage_tracker
+from app.services.recipe_suggestions import scheduler as suggestion_scheduler
+from app.utils.executor import ExecutorBusyError
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    if settings.LLM_USAGE_RECORDING_ENABLED:
+        await usage_tracker.start()
+    if settings.RECIPE_SUGGESTIONS_ENABLED:
+        await suggestion_scheduler.start()
+    try:
+        yield
+    finally:
+        await suggestion_scheduler.stop()
+        # After the scheduler, so its last calls are written too.
+        await usage_tracker.stop()
+
 
-app = FastAPI(title=settings.PROJECT_NAME)
+app = FastAPI(title=settings.PROJECT_NAME, lifespan=lifespan)
 
+# Added first so it sits inside CORS and 429s still carry CORS headers.
+app.add_middleware(RateLimitMiddleware)
 app.add_middleware(
     CORSMiddleware,
     allow_origins=["*"],  # Allow all origins for development
@@ -13,4 +38,17 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+
+@app.exception_handler(ExecutorBusyError)
+async def executor_busy_handler(request: Request, exc: ExecutorBusyError):
+    # A saturated worker pool (e.g. password hashing) sheds load instead of
+    # queueing without bound.
+    return JSONResponse(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        content={"detail": "Server busy, please retry shortly"},
+        headers={"Retry-After": "1"},
+    )
+
+
 app.include_router(api_router, prefix=settings.API_V1_STR)
+app.include_router(metrics.router)
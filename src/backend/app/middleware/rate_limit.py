@@ -0,0 +1,272 @@
+import math
+import threading
+import time
+import uuid
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Sequence, Tuple
+from urllib.parse import parse_qs
+
+from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.config import settings
+from app.utils.cache import LRUCache
+from app.utils.logger import get_logger
+from app.utils.metrics import metrics
+
+logger = get_logger("RateLimiter")
+
+rate_limited_requests = metrics.counter(
+    "rate_limited_requests_total", "Requests rejected by the rate limiter"
+)
+
+# Login forms are tiny; anything bigger is not parsed for the account key.
+MAX_FORM_BYTES = 16 * 1024
+
+
+class MemoryRateLimitBackend:
+    """
+    Per-process token buckets: ``limit`` tokens refilled evenly over
+    ``window`` seconds, so a client can burst up to ``limit`` and then gets
+    one request per ``window / limit``. Idle buckets are evicted after a
+    window (when they would be full again anyway).
+    """
+
+    def __init__(self, max_keys: int = 100000):
+        self._buckets = LRUCache(maxsize=max_keys)
+        self._lock = threading.Lock()
+
+    async def hit(self, key: str, limit: int, window: float) -> Tuple[bool, float]:
+        """Take one token; returns (allowed, seconds until a token is available)."""
+        rate = limit / window
+        now = time.monotonic()
+        with self._lock:
+            tokens, last = self._buckets.get(key, (float(limit), now))
+            tokens = min(float(limit), tokens + (now - last) * rate)
+            allowed = tokens >= 1
+            if allowed:
+                tokens -= 1
+            self._buckets.set(key, (tokens, now), ttl=window)
+        return allowed, 0.0 if allowed else (1 - tokens) / rate
+
+    async def reset(self) -> None:
+        self._buckets.clear()
+
+
+# Trim the window, then record the request only if it fits, in one atomic
+# step so concurrent workers cannot overshoot and rejected requests are never
+# written. Replies {1} when allowed, else {0, score of the oldest entry}.
+SLIDING_WINDOW_SCRIPT = """
+local key = KEYS[1]
+local now = tonumber(ARGV[1])
+local window = tonumber(ARGV[2])
+redis.call('ZREMRANGEBYSCORE', key, 0, now - window)
+if redis.call('ZCARD', key) < tonumber(ARGV[3]) then
+    redis.call('ZADD', key, now, ARGV[4])
+    redis.call('PEXPIRE', key, math.ceil(window * 1000))
+    return {1}
+end
+local oldest = redis.call('ZRANGE', key, 0, 0, 'WITHSCORES')
+return {0, oldest[2]}
+"""
+
+
+class RedisRateLimitBackend:
+    """
+    Sliding-window log shared by all workers, kept in one sorted set per key
+    (member per request, scored by its timestamp). Works with any client
+    speaking the redis-py asyncio API.
+    """
+
+    def __init__(self, client, prefix: str = "ratelimit:"):
+        self.client = client
+        self.prefix = prefix
+        self._script = client.register_script(SLIDING_WINDOW_SCRIPT)
+
+    @classmethod
+    def from_url(cls, url: str) -> "RedisRateLimitBackend":
+        try:
+            import redis.asyncio as redis
+        except ImportError:
+            raise RuntimeError(
+                "redis package is required for RATE_LIMIT_BACKEND=redis. "
+                "Install with 'pip install redis'."
+            )
+        return cls(redis.Redis.from_url(url))
+
+    async def hit(self, key: str, limit: int, window: float) -> Tuple[bool, float]:
+        now = time.time()
+        member = f"{now}:{uuid.uuid4().hex}"
+        reply = await self._script(
+            keys=[self.prefix + key], args=[repr(now), repr(window), limit, member]
+        )
+        if int(reply[0]) == 1:
+            return True, 0.0
+        oldest = reply[1] if len(reply) > 1 else None
+        retry_after = float(oldest) + window - now if oldest else window
+        return False, max(retry_after, 0.0)
+
+    async def reset(self) -> None:
+        async for key in self.client.scan_iter(match=self.prefix + "*"):
+            await self.client.delete(key)
+
+
+@dataclass(frozen=True)
+class RateLimitRule:
+    """
+    ``limit`` requests per ``window`` seconds for requests whose path starts
+    with ``path`` (or equals it, with ``exact``). ``per_account`` additionally
+    limits by the ``username`` field of a form-encoded body.
+    """
+
+    path: str
+    limit: int
+    window: float = 60.0
+    methods: Optional[Sequence[str]] = None
+    exact: bool = False
+    per_account: bool = False
+
+    def matches(self, method: str, path: str) -> bool:
+        if self.methods and method not in self.methods:
+            return False
+        return path == self.path if self.exact else path.startswith(self.path)
+
+
+_backend = None
+
+
+def get_backend():
+    """Process-wide backend chosen by RATE_LIMIT_BACKEND, created on first use."""
+    global _backend
+    if _backend is None:
+        if settings.RATE_LIMIT_BACKEND == "redis":
+            _backend = RedisRateLimitBackend.from_url(settings.RATE_LIMIT_REDIS_URL)
+        else:
+            _backend = MemoryRateLimitBackend()
+    return _backend
+
+
+def set_backend(backend) -> None:
+    global _backend
+    _backend = backend
+
+
+def default_rules() -> List[RateLimitRule]:
+    """
+    Login gets RATE_LIMIT_PER_MINUTE per client IP and per account; every
+    entry of RATE_LIMIT_RULES (path prefix -> requests per minute) adds a
+    per-IP limit. Longer prefixes are listed first.
+    """
+    rules = [
+        RateLimitRule(
+            path=f"{settings.API_V1_STR}/auth/login",
+            limit=settings.RATE_LIMIT_PER_MINUTE,
+            methods=("POST",),
+            exact=True,
+            per_account=True,
+        )
+    ]
+    for prefix, per_minute in sorted(
+        settings.RATE_LIMIT_RULES.items(), key=lambda item: -len(item[0])
+    ):
+        rules.append(RateLimitRule(path=prefix, limit=per_minute))
+    return rules
+
+
+def _client_ip(scope: Scope) -> str:
+    if settings.RATE_LIMIT_TRUST_FORWARDED:
+        for name, value in scope.get("headers", []):
+            if name == b"x-forwarded-for":
+                return value.decode("latin-1").split(",")[0].strip()
+    client = scope.get("client")
+    return client[0] if client else "unknown"
+
+
+async def _read_body(receive: Receive) -> Tuple[bytes, List[Message]]:
+    """Buffer the request body, returning it and the messages to replay."""
+    messages, chunks, size = [], [], 0
+    while True:
+        message = await receive()
+        messages.append(message)
+        if message["type"] != "http.request":
+            break
+        chunks.append(message.get("body", b""))
+        size += len(chunks[-1])
+        if not message.get("more_body") or size > MAX_FORM_BYTES:
+            break
+    return b"".join(chunks), messages
+
+
+def _form_username(scope: Scope, body: bytes) -> Optional[str]:
+    headers = dict(scope.get("headers", []))
+    content_type = headers.get(b"content-type", b"").decode("latin-1")
+    if not content_type.startswith("application/x-www-form-urlencoded"):
+        return None
+    if len(body) > MAX_FORM_BYTES:
+        return None
+    values = parse_qs(body.decode("utf-8", "replace")).get("username")
+    return values[0].strip().lower() if values and values[0].strip() else None
+
+
+class RateLimitMiddleware:
+    """
+    ASGI middleware rejecting over-limit requests with 429 before routing, so
+    throttled logins never reach the database or bcrypt. The first matching
+    rule applies.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        rules: Optional[Sequence[RateLimitRule]] = None,
+        backend=None,
+    ):
+        self.app = app
+        self.rules = list(rules) if rules is not None else default_rules()
+        self.backend = backend
+
+    def _rule_for(self, scope: Scope) -> Optional[RateLimitRule]:
+        for rule in self.rules:
+            if rule.matches(scope["method"], scope["path"]):
+                return rule
+        return None
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or not settings.RATE_LIMIT_ENABLED:
+            await self.app(scope, receive, send)
+            return
+        rule = self._rule_for(scope)
+        if rule is None:
+            await self.app(scope, receive, send)
+            return
+
+        keys: Dict[str, str] = {"ip": _client_ip(scope)}
+        if rule.per_account:
+            body, messages = await _read_body(receive)
+            username = _form_username(scope, body)
+            if username:
+                keys["account"] = username
+
+            async def replay() -> Message:
+                return messages.pop(0) if messages else await receive()
+
+            receive = replay
+
+        backend = self.backend or get_backend()
+        for kind, value in keys.items():
+            allowed, retry_after = await backend.hit(
+                f"{rule.path}:{kind}:{value}", rule.limit, rule.window
+            )
+            if not allowed:
+                rate_limited_requests.inc(path=rule.path, key=kind)
+                logger.warning(
+                    f"Rate limit exceeded: path={scope['path']}, {kind}={value}"
+                )
+                response = JSONResponse(
+                    {"detail": "Too many requests, please retry later"},
+                    status_code=429,
+                    headers={"Retry-After": str(max(1, math.ceil(retry_after)))},
+                )
+                await response(scope, receive, send)
+                return
+        await self.app(scope, receive, send)
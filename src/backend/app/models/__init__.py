@@ -3,5 +3,17 @@ from .inventory import Inventory  # noqa
 from .consumption_log import ConsumptionLog  # noqa
 from .image_upload import ImageUpload  # noqa
 from .detection_result import DetectionResult  # noqa
+from .alert import Alert  # noqa
+from .refresh_token import RefreshToken  # noqa
+from .llm_usage import LLMUsage  # noqa
 
-__all__ = ["User", "Inventory", "ConsumptionLog", "ImageUpload", "DetectionResult"]
+__all__ = [
+    "User",
+    "Inventory",
+    "ConsumptionLog",
+    "ImageUpload",
+    "DetectionResult",
+    "Alert",
+    "RefreshToken",
+    "LLMUsage",
+]
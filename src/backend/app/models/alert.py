@@ -0,0 +1,53 @@
+from sqlalchemy import (
+    Column,
+    String,
+    ForeignKey,
+    DateTime,
+    Date,
+    Index,
+    UniqueConstraint,
+    Enum as SAEnum,
+)
+from sqlalchemy.orm import relationship
+from sqlalchemy.dialects.postgresql import UUID
+import uuid
+from datetime import datetime
+from app.db import Base
+from app.enums import AlertTypeEnum
+
+
+class Alert(Base):
+    """
+    Precomputed alert produced by the scheduled alert evaluator.
+
+    Alerts are written once per user-local day (``alert_date``) so that
+    ``GET /alerts`` is a single indexed read on ``(user_id, alert_date)``.
+    """
+
+    __tablename__ = "alerts"
+
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    user_id = Column(UUID(as_uuid=True), ForeignKey("users.id"), nullable=False)
+    inventory_item_id = Column(
+        UUID(as_uuid=True),
+        ForeignKey("inventory.id", ondelete="CASCADE"),
+        nullable=True,
+    )
+    alert_type = Column(SAEnum(AlertTypeEnum, name="alert_type_enum"), nullable=False)
+    message = Column(String, nullable=False)
+    alert_date = Column(Date, nullable=False)
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+
+    user = relationship("User")
+    inventory_item = relationship("Inventory")
+
+    __table_args__ = (
+        Index("ix_alerts_user_id_alert_date", "user_id", "alert_date"),
+        UniqueConstraint(
+            "user_id",
+            "alert_type",
+            "inventory_item_id",
+            "alert_date",
+            name="uq_alerts_user_type_item_date",
+        ),
+    )
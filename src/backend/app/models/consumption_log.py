@@ -4,6 +4,9 @@ from sqlalchemy import (
     ForeignKey,
     DateTime,
     Float,
+    Index,
+    DDL,
+    event,
 )
 from sqlalchemy.orm import relationship
 from sqlalchemy.dialects.postgresql import UUID
@@ -13,6 +16,15 @@ from app.db import Base
 
 
 class ConsumptionLog(Base):
+    """
+    Consumption log, range-partitioned by month on ``consumed_at``.
+
+    The partition key must be part of the primary key, hence the composite
+    ``(id, consumed_at)`` key. Queries that filter on ``consumed_at`` only
+    touch the matching monthly partitions. Partitions are managed by
+    ``app.db.partitions`` / ``python -m app.jobs.consumption_log_partitions``.
+    """
+
     __tablename__ = "consumption_log"
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
@@ -26,9 +38,28 @@ class ConsumptionLog(Base):
     protein_consumed_g = Column(Float, nullable=False)
     carbs_consumed_g = Column(Float, nullable=False)
     fats_consumed_g = Column(Float, nullable=False)
-    consumed_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    consumed_at = Column(
+        DateTime, primary_key=True, default=datetime.utcnow, nullable=False
+    )
 
     user = relationship("User")
     inventory_item = relationship(
         "Inventory", back_populates="consumption_logs", lazy="select"
     )
+
+    __table_args__ = (
+        Index("ix_consumption_log_user_id_consumed_at", "user_id", "consumed_at"),
+        {"postgresql_partition_by": "RANGE (consumed_at)"},
+    )
+
+
+# Rows outside every monthly partition land here instead of failing the insert.
+# The migration creates the same partition; this covers metadata.create_all().
+event.listen(
+    ConsumptionLog.__table__,
+    "after_create",
+    DDL(
+        "CREATE TABLE IF NOT EXISTS consumption_log_default "
+        "PARTITION OF consumption_log DEFAULT"
+    ),
+)
@@ -2,7 +2,7 @@ from sqlalchemy import Column, String, ForeignKey, DateTime, Float, Integer
 from sqlalchemy.dialects.postgresql import UUID, JSONB
 from sqlalchemy.orm import relationship
 import uuid
-from datetime import datetime, timezone
+from datetime import datetime
 from app.db import Base
 from .image_upload import ImageUpload
 
@@ -18,6 +18,6 @@ class DetectionResult(Base):
     quantity = Column(Integer, nullable=False, default=1)
     confidence = Column(Float, nullable=False)
     bbox = Column(JSONB, nullable=False)  # [x1, y1, x2, y2]
-    created_at = Column(DateTime, default=datetime.now(timezone.utc), nullable=False)
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
 
     image_upload = relationship("ImageUpload", back_populates="detection_results")
@@ -1,5 +1,17 @@
 import uuid
-from sqlalchemy import Column, ForeignKey, String, JSON
+from datetime import datetime
+from sqlalchemy import (
+    Boolean,
+    Column,
+    DateTime,
+    Float,
+    ForeignKey,
+    Index,
+    Integer,
+    String,
+    JSON,
+    false,
+)
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 from app.db import Base
@@ -13,5 +25,27 @@ class GeneratedRecipe(Base):
     title = Column(String, nullable=False)
     ingredients = Column(JSON, nullable=False)
     directions = Column(String, nullable=False)
+    calories = Column(Integer, nullable=True)
+    protein = Column(Float, nullable=True)
+    carbs = Column(Float, nullable=True)
+    fats = Column(Float, nullable=True)
+    # Hash of the available ingredients and fitness goal the recipe was
+    # generated for (see recipe_service.inventory_fingerprint).
+    inventory_fingerprint = Column(String(64), nullable=True)
+    # Pre-computed by the suggestion scheduler and not yet served; served
+    # recipes (suggested=False) make up the user's history.
+    suggested = Column(Boolean, nullable=False, default=False, server_default=false())
+    # When the recipe joined the history (for suggestions: when served).
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
 
     user = relationship("User")
+
+    __table_args__ = (
+        Index(
+            "ix_generated_recipes_user_id_fingerprint",
+            "user_id",
+            "inventory_fingerprint",
+        ),
+        # History pages (see RecipeService.get_generated_recipes).
+        Index("ix_generated_recipes_user_id_created_at", "user_id", "created_at"),
+    )
@@ -2,7 +2,7 @@ from sqlalchemy import Column, String, ForeignKey, DateTime, Enum as SAEnum, Tex
 from sqlalchemy.dialects.postgresql import UUID, JSONB
 from sqlalchemy.orm import relationship
 import uuid
-from datetime import datetime, timezone
+from datetime import datetime
 from app.db import Base
 from app.enums import ImageUploadStatus
 
@@ -20,11 +20,11 @@ class ImageUpload(Base):
         default=ImageUploadStatus.pending,
     )
     error_message = Column(Text, nullable=True)
-    created_at = Column(DateTime, default=datetime.now(timezone.utc), nullable=False)
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
     updated_at = Column(
         DateTime,
-        default=datetime.now(timezone.utc),
-        onupdate=datetime.now(timezone.utc),
+        default=datetime.utcnow,
+        onupdate=datetime.utcnow,
         nullable=False,
     )
 
@@ -26,7 +26,7 @@ class Inventory(Base):
     carbs_g_per_serving = Column(Float, nullable=True)
     fats_g_per_serving = Column(Float, nullable=True)
     serving_size_unit = Column(String, nullable=True)
-    expiry_date = Column(Date, nullable=True)
+    expiry_date = Column(Date, nullable=True, index=True)
     source = Column(String, nullable=True, default="manual")  # e.g., 'image', 'manual'
     added_at = Column(DateTime, default=datetime.utcnow, nullable=False)
     updated_at = Column(
@@ -0,0 +1,42 @@
+from sqlalchemy import (
+    Boolean,
+    Column,
+    DateTime,
+    Float,
+    ForeignKey,
+    Index,
+    Integer,
+    String,
+)
+from sqlalchemy.dialects.postgresql import UUID
+import uuid
+from datetime import datetime
+from app.db import Base
+
+
+class LLMUsage(Base):
+    """
+    One LLM call, or one recipe served from cache instead (``cache_hit``),
+    as recorded by llm_usage.UsageTracker.
+    """
+
+    __tablename__ = "llm_usage"
+
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    user_id = Column(
+        UUID(as_uuid=True), ForeignKey("users.id", ondelete="CASCADE"), nullable=True
+    )
+    endpoint = Column(String(64), nullable=False)
+    model = Column(String(64), nullable=False)
+    prompt_tokens = Column(Integer, nullable=False, default=0)
+    completion_tokens = Column(Integer, nullable=False, default=0)
+    # Retries and hedged requests included.
+    attempts = Column(Integer, nullable=False, default=0)
+    latency_seconds = Column(Float, nullable=False)
+    cache_hit = Column(Boolean, nullable=False, default=False)
+    outcome = Column(String(16), nullable=False)
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+
+    __table_args__ = (
+        Index("ix_llm_usage_user_id_created_at", "user_id", "created_at"),
+    )
@@ -0,0 +1,32 @@
+from sqlalchemy import Column, String, ForeignKey, DateTime, Index
+from sqlalchemy.dialects.postgresql import UUID
+import uuid
+from datetime import datetime
+from app.db import Base
+
+
+class RefreshToken(Base):
+    """
+    Opaque refresh token, stored only as its SHA-256 digest.
+
+    Every rotation issues a new row in the same ``family_id`` and marks the
+    old one revoked; presenting a revoked token again means it leaked, so the
+    whole family is revoked.
+    """
+
+    __tablename__ = "refresh_tokens"
+
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    user_id = Column(
+        UUID(as_uuid=True), ForeignKey("users.id", ondelete="CASCADE"), nullable=False
+    )
+    family_id = Column(UUID(as_uuid=True), nullable=False, default=uuid.uuid4)
+    token_hash = Column(String(64), nullable=False, unique=True)
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    expires_at = Column(DateTime, nullable=False)
+    revoked_at = Column(DateTime, nullable=True)
+
+    __table_args__ = (
+        Index("ix_refresh_tokens_user_id", "user_id"),
+        Index("ix_refresh_tokens_family_id", "family_id"),
+    )
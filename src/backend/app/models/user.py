@@ -6,6 +6,7 @@ from sqlalchemy import (
     Float,
     Enum,
     DateTime,
+    Date,
     func,
 )
 from sqlalchemy.dialects.postgresql import UUID
@@ -34,6 +35,8 @@ class User(Base):
     fitness_goal = Column(
         SAEnum(FitnessGoalEnum, name="fitness_goal_enum"), nullable=True
     )
+    timezone = Column(String, nullable=False, default="UTC", server_default="UTC")
+    alerts_evaluated_on = Column(Date, nullable=True)
     created_at = Column(DateTime, nullable=False, server_default=func.now())
     updated_at = Column(
         DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False
@@ -6,3 +6,5 @@ from .consumption_log import *
 from .token import *
 from .detection_result import *
 from .image_upload import *
+from .alert import *
+from .nutrition import *
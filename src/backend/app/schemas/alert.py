@@ -0,0 +1,38 @@
+import uuid
+from typing import Optional
+from datetime import date, datetime
+from pydantic import BaseModel, Field, ConfigDict
+from app.enums import AlertTypeEnum
+
+
+class AlertRead(BaseModel):
+    """Precomputed alert returned by ``GET /alerts``."""
+
+    id: uuid.UUID = Field(
+        ...,
+        description="Alert ID",
+        json_schema_extra={"example": "b3b7c7e2-8c2a-4e2a-9e2a-123456789abc"},
+    )
+    alert_type: AlertTypeEnum = Field(
+        ..., description="Kind of alert", json_schema_extra={"example": "expiry"}
+    )
+    message: str = Field(
+        ...,
+        description="Human readable alert message",
+        json_schema_extra={"example": "Greek Yogurt expires tomorrow"},
+    )
+    inventory_item_id: Optional[uuid.UUID] = Field(
+        None,
+        description="Related inventory item (expiry alerts only)",
+        json_schema_extra={"example": "b3b7c7e2-8c2a-4e2a-9e2a-123456789abc"},
+    )
+    alert_date: date = Field(
+        ...,
+        description="User-local date the alert was evaluated for",
+        json_schema_extra={"example": "2024-06-01"},
+    )
+    created_at: datetime = Field(
+        ..., json_schema_extra={"example": "2024-06-01T00:05:00Z"}
+    )
+
+    model_config = ConfigDict(from_attributes=True)
@@ -1,6 +1,7 @@
 import uuid
+from datetime import datetime
 from pydantic import BaseModel
-from typing import List
+from typing import List, Optional
 
 
 class GeneratedRecipeBase(BaseModel):
@@ -15,6 +16,39 @@ class GeneratedRecipeCreate(GeneratedRecipeBase):
 
 class GeneratedRecipeRead(GeneratedRecipeBase):
     id: uuid.UUID
+    calories: Optional[int] = None
+    protein: Optional[float] = None
+    carbs: Optional[float] = None
+    fats: Optional[float] = None
+    created_at: datetime
 
     class Config:
         from_attributes = True
+
+
+class GeneratedRecipeSummary(BaseModel):
+    """
+    A recipe in the history list: no ingredients or directions, which are
+    fetched by id (GeneratedRecipeRead).
+    """
+
+    id: uuid.UUID
+    title: str
+    calories: Optional[int] = None
+    protein: Optional[float] = None
+    carbs: Optional[float] = None
+    fats: Optional[float] = None
+    created_at: datetime
+
+    class Config:
+        from_attributes = True
+
+
+class GeneratedRecipePage(BaseModel):
+    """
+    One page of the history, newest first. Pass ``next_cursor`` back as
+    ``cursor`` for the next page; it is None on the last page.
+    """
+
+    items: List[GeneratedRecipeSummary]
+    next_cursor: Optional[str] = None
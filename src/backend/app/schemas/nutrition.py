@@ -0,0 +1,62 @@
+from datetime import date
+from typing import Optional
+
+from pydantic import BaseModel, ConfigDict, Field
+
+
+class NutritionTargetsRead(BaseModel):
+    """Daily targets derived from the user's profile."""
+
+    bmr: float = Field(
+        ...,
+        description="Basal metabolic rate (kcal)",
+        json_schema_extra={"example": 1780.0},
+    )
+    tdee: float = Field(
+        ...,
+        description="Total daily energy expenditure (kcal)",
+        json_schema_extra={"example": 2759.0},
+    )
+    calories: float = Field(
+        ..., description="Daily calorie target", json_schema_extra={"example": 2259.0}
+    )
+    protein_g: float = Field(
+        ...,
+        description="Daily protein target (g)",
+        json_schema_extra={"example": 160.0},
+    )
+    carbs_g: float = Field(
+        ..., description="Daily carbs target (g)", json_schema_extra={"example": 260.0}
+    )
+    fats_g: float = Field(
+        ..., description="Daily fat target (g)", json_schema_extra={"example": 62.8}
+    )
+
+    model_config = ConfigDict(from_attributes=True)
+
+
+class DailySummaryRead(BaseModel):
+    """Intake so far on the user's local day, next to their targets."""
+
+    day: date = Field(
+        ...,
+        description="User-local calendar day",
+        json_schema_extra={"example": "2024-06-01"},
+    )
+    targets: Optional[NutritionTargetsRead] = Field(
+        None, description="Daily targets; null until the profile is complete"
+    )
+    calories: float = Field(
+        ..., description="Calories consumed", json_schema_extra={"example": 1320.0}
+    )
+    protein_g: float = Field(
+        ..., description="Protein consumed (g)", json_schema_extra={"example": 85.0}
+    )
+    carbs_g: float = Field(
+        ..., description="Carbs consumed (g)", json_schema_extra={"example": 140.0}
+    )
+    fats_g: float = Field(
+        ..., description="Fats consumed (g)", json_schema_extra={"example": 40.0}
+    )
+
+    model_config = ConfigDict(from_attributes=True)
@@ -12,16 +12,30 @@ class Token(BaseModel):
     token_type: str = Field(
         ..., description="Type of the token", json_schema_extra={"example": "bearer"}
     )
+    refresh_token: Optional[str] = Field(
+        None,
+        description="Opaque single-use token for POST /auth/refresh",
+        json_schema_extra={"example": "3q2-7wVx0nS1bB8a9LkR4yUe..."},
+    )
     model_config = ConfigDict(
         json_schema_extra={
             "example": {
                 "access_token": "eyJhbGciOiJIUzI1NiIsInR5cCI6...",
                 "token_type": "bearer",
+                "refresh_token": "3q2-7wVx0nS1bB8a9LkR4yUe...",
             }
         }
     )
 
 
+class RefreshTokenRequest(BaseModel):
+    refresh_token: str = Field(
+        ...,
+        description="Refresh token returned by /auth/login or /auth/refresh",
+        json_schema_extra={"example": "3q2-7wVx0nS1bB8a9LkR4yUe..."},
+    )
+
+
 class TokenData(BaseModel):
     username: str | None = Field(
         None,
@@ -42,5 +56,10 @@ class TokenPayload(BaseModel):
         description="Expiration time (as UNIX timestamp)",
         json_schema_extra={"example": 1712345678},
     )
+    jti: Optional[str] = Field(
+        None,
+        description="Token id, used for revocation",
+        json_schema_extra={"example": "9f1c2e7d4b6a48c3a0e5d1f2b3c4d5e6"},
+    )
 
     model_config = ConfigDict(extra="allow")
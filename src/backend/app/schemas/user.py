@@ -1,6 +1,7 @@
 import uuid
 from typing import Optional
-from pydantic import BaseModel, EmailStr, ConfigDict, Field
+from pydantic import BaseModel, EmailStr, ConfigDict, Field, field_validator
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
 from datetime import datetime
 from enum import Enum
 from app.enums import SexEnum, ActivityLevelEnum, FitnessGoalEnum
@@ -39,6 +40,21 @@ class UserBase(BaseModel):
         description="User's fitness goal",
         json_schema_extra={"example": "lose"},
     )
+    timezone: Optional[str] = Field(
+        None,
+        description="IANA timezone used to schedule daily alerts",
+        json_schema_extra={"example": "Asia/Kolkata"},
+    )
+
+    @field_validator("timezone")
+    @classmethod
+    def valid_timezone(cls, v):
+        if v is not None:
+            try:
+                ZoneInfo(v)
+            except (ZoneInfoNotFoundError, ValueError):
+                raise ValueError(f"Unknown timezone: {v}")
+        return v
 
 
 # Properties to receive on user creation
@@ -105,6 +121,7 @@ class User(UserBase):
                 "sex": "male",
                 "activity_level": "moderate",
                 "fitness_goal": "lose",
+                "timezone": "Asia/Kolkata",
                 "created_at": "2024-06-01T12:00:00Z",
                 "updated_at": "2024-06-01T12:00:00Z",
             }
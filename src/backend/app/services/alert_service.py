@@ -0,0 +1,258 @@
+import math
+import uuid
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date, datetime, timedelta, timezone
+from typing import Dict, Iterable, List, Optional
+
+from sqlalchemy import Date, DateTime, cast, func, or_
+from sqlalchemy.orm import Session
+
+from app.db import SessionLocal, engine
+from app.enums import AlertTypeEnum
+from app.models.alert import Alert
+from app.models.consumption_log import ConsumptionLog
+from app.models.inventory import Inventory
+from app.models.user import User
+from app.services import nutrition_service
+from app.utils.logger import get_logger
+from app.utils.timezones import local_date, utc_day_bounds
+
+# Items expiring within this many days of the user's local date raise an alert.
+EXPIRY_WINDOW_DAYS = 2
+# Daily intake outside [target * LOW, target * HIGH] raises a calorie alert.
+CALORIE_LOW_RATIO = 0.75
+CALORIE_HIGH_RATIO = 1.15
+DEFAULT_CHUNK_SIZE = 500
+
+
+def _expiry_message(name: str, days_left: int) -> str:
+    if days_left == 0:
+        return f"{name} expires today"
+    if days_left == 1:
+        return f"{name} expires tomorrow"
+    return f"{name} expires in {days_left} days"
+
+
+def _due_users_filter(now: datetime):
+    """SQL filter for users whose local day has not been evaluated yet."""
+    local_today = cast(
+        func.timezone(User.timezone, cast(now, DateTime(timezone=True))), Date
+    )
+    return or_(
+        User.alerts_evaluated_on.is_(None),
+        User.alerts_evaluated_on < local_today,
+    )
+
+
+def iter_due_user_chunks(
+    db: Session, now: datetime, chunk_size: int = DEFAULT_CHUNK_SIZE
+) -> Iterable[List[uuid.UUID]]:
+    """
+    Yield ids of users due for evaluation in keyset-paginated chunks.
+    """
+    last_id = None
+    while True:
+        query = db.query(User.id).filter(_due_users_filter(now))
+        if last_id is not None:
+            query = query.filter(User.id > last_id)
+        chunk = [row.id for row in query.order_by(User.id).limit(chunk_size).all()]
+        if not chunk:
+            return
+        yield chunk
+        last_id = chunk[-1]
+
+
+def _build_expiry_alerts(
+    db: Session, users: List[User], local_dates: Dict[uuid.UUID, date]
+) -> List[Alert]:
+    window_start = min(local_dates.values())
+    window_end = max(local_dates.values()) + timedelta(days=EXPIRY_WINDOW_DAYS)
+    # Range scan on the expiry_date index, narrowed to this chunk of users.
+    items = (
+        db.query(Inventory.id, Inventory.user_id, Inventory.name, Inventory.expiry_date)
+        .filter(
+            Inventory.expiry_date >= window_start,
+            Inventory.expiry_date <= window_end,
+            Inventory.user_id.in_([user.id for user in users]),
+            Inventory.quantity > 0,
+        )
+        .order_by(Inventory.expiry_date)
+        .all()
+    )
+    alerts = []
+    for item in items:
+        today = local_dates[item.user_id]
+        days_left = (item.expiry_date - today).days
+        if 0 <= days_left <= EXPIRY_WINDOW_DAYS:
+            alerts.append(
+                Alert(
+                    user_id=item.user_id,
+                    inventory_item_id=item.id,
+                    alert_type=AlertTypeEnum.expiry,
+                    message=_expiry_message(item.name, days_left),
+                    alert_date=today,
+                )
+            )
+    return alerts
+
+
+def _build_calorie_alerts(
+    db: Session, users: List[User], local_dates: Dict[uuid.UUID, date]
+) -> List[Alert]:
+    """
+    Compare each user's intake for the previous (complete) local day against
+    their daily calorie target. Targets for the whole chunk are computed in
+    one vectorized pass.
+    """
+    bulk = nutrition_service.calculate_targets_bulk(
+        [user.height for user in users],
+        [user.weight for user in users],
+        [user.age for user in users],
+        [user.sex for user in users],
+        [user.activity_level for user in users],
+        [user.fitness_goal for user in users],
+    )
+    targets = {
+        user.id: float(calories)
+        for user, calories in zip(users, bulk["calories"])
+        if not math.isnan(calories)  # NaN means an incomplete profile
+    }
+    by_timezone = defaultdict(list)
+    for user in users:
+        if user.id in targets:
+            by_timezone[user.timezone].append(user.id)
+
+    alerts = []
+    for tz_name, user_ids in by_timezone.items():
+        # All users in a timezone share the same local date within one run.
+        today = local_dates[user_ids[0]]
+        start, end = utc_day_bounds(today - timedelta(days=1), tz_name)
+        totals = (
+            db.query(
+                ConsumptionLog.user_id,
+                func.sum(ConsumptionLog.calories_consumed).label("calories"),
+            )
+            .filter(
+                ConsumptionLog.user_id.in_(user_ids),
+                ConsumptionLog.consumed_at >= start,
+                ConsumptionLog.consumed_at < end,
+            )
+            .group_by(ConsumptionLog.user_id)
+            .all()
+        )
+        for row in totals:
+            target = targets[row.user_id]
+            if row.calories < target * CALORIE_LOW_RATIO:
+                message = (
+                    f"You ate {row.calories:.0f} kcal yesterday, well below "
+                    f"your {target:.0f} kcal target"
+                )
+            elif row.calories > target * CALORIE_HIGH_RATIO:
+                message = (
+                    f"You ate {row.calories:.0f} kcal yesterday, well above "
+                    f"your {target:.0f} kcal target"
+                )
+            else:
+                continue
+            alerts.append(
+                Alert(
+                    user_id=row.user_id,
+                    alert_type=AlertTypeEnum.calorie_intake,
+                    message=message,
+                    alert_date=today,
+                )
+            )
+    return alerts
+
+
+def evaluate_user_chunk(user_ids: List[uuid.UUID], now: datetime) -> int:
+    """
+    Evaluate and persist alerts for one chunk of users.
+
+    Runs in a worker process, so it opens its own session. Existing alerts for
+    the same local date are replaced, which makes re-running a chunk safe.
+    Returns the number of alerts written.
+    """
+    logger = get_logger("AlertService")
+    db = SessionLocal()
+    try:
+        users = db.query(User).filter(User.id.in_(user_ids)).all()
+        if not users:
+            return 0
+        local_dates = {user.id: local_date(now, user.timezone) for user in users}
+
+        alerts = _build_expiry_alerts(db, users, local_dates)
+        alerts += _build_calorie_alerts(db, users, local_dates)
+
+        for user in users:
+            db.query(Alert).filter(
+                Alert.user_id == user.id, Alert.alert_date == local_dates[user.id]
+            ).delete(synchronize_session=False)
+            user.alerts_evaluated_on = local_dates[user.id]
+        db.add_all(alerts)
+        db.commit()
+        return len(alerts)
+    except Exception as e:
+        db.rollback()
+        logger.error(f"Alert evaluation failed for {len(user_ids)} users: {e}")
+        raise
+    finally:
+        db.close()
+
+
+def _init_worker():
+    # Connections inherited from the parent process must not be reused.
+    engine.dispose(close=False)
+
+
+def evaluate_alerts(
+    now: Optional[datetime] = None,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    max_workers: Optional[int] = None,
+) -> int:
+    """
+    Evaluate alerts for every user whose local day has rolled over.
+
+    Intended to be run periodically (e.g. hourly); each user is evaluated at
+    most once per local calendar day. Chunks of users are fanned out across a
+    process pool unless ``max_workers`` is 1.
+    """
+    logger = get_logger("AlertService")
+    now = now or datetime.now(timezone.utc)
+    db = SessionLocal()
+    total = 0
+    try:
+        chunks = iter_due_user_chunks(db, now, chunk_size)
+        if max_workers == 1:
+            for chunk in chunks:
+                total += evaluate_user_chunk(chunk, now)
+        else:
+            with ProcessPoolExecutor(
+                max_workers=max_workers, initializer=_init_worker
+            ) as pool:
+                futures = [
+                    pool.submit(evaluate_user_chunk, chunk, now) for chunk in chunks
+                ]
+                total = sum(future.result() for future in futures)
+    finally:
+        db.close()
+    logger.info(f"Alert evaluation complete: {total} alerts written")
+    return total
+
+
+def get_active_alerts(db: Session, user_id: uuid.UUID) -> List[Alert]:
+    """
+    Return the alerts from the user's most recent evaluation.
+
+    Filtering on the user's alerts_evaluated_on (rather than the newest
+    alert_date) means an evaluation that produced no alerts clears the list.
+    Served from the (user_id, alert_date) index.
+    """
+    return (
+        db.query(Alert)
+        .join(User, User.id == Alert.user_id)
+        .filter(Alert.user_id == user_id, Alert.alert_date == User.alerts_evaluated_on)
+        .order_by(Alert.alert_type, Alert.created_at)
+        .all()
+    )
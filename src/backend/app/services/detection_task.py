@@ -4,9 +4,7 @@ from app.models.image_upload import ImageUpload
 from app.models.user import User
 from app.models.detection_result import DetectionResult
 from app.enums import ImageUploadStatus
-from app.services.detection_service import DetectionService
-from app.services.storage_service import StorageService
-from app.services.ml_services.image_processing.yolo_detector import YOLODetector
+from app.services.locator import locator
 from app.utils.logger import get_logger
 
 
@@ -38,8 +36,8 @@ def run_detection_task(image_upload_id, user_id, file_path):
 
         # Run detection
         try:
-            yolo_detector = YOLODetector()
-            detection_service = DetectionService(StorageService, yolo_detector)
+            # Built (and the YOLO weights loaded) on the first detection only.
+            detection_service = locator.get("detection_service")
             results = detection_service.run_detection(user, file_path)
 
             new_detections = []
@@ -0,0 +1,156 @@
+import enum
+import uuid
+from typing import TYPE_CHECKING, Iterator, List, Optional
+
+from sqlalchemy import Date, DateTime, Float, Integer, select
+from sqlalchemy.orm import Session
+
+from app.enums import ExportDatasetEnum, ExportFormatEnum
+from app.models.consumption_log import ConsumptionLog
+from app.models.inventory import Inventory
+
+if TYPE_CHECKING:
+    import pyarrow
+
+DEFAULT_CHUNK_SIZE = 5000
+
+EXPORT_MODELS = {
+    ExportDatasetEnum.consumption_log: ConsumptionLog,
+    ExportDatasetEnum.inventory: Inventory,
+}
+
+MEDIA_TYPES = {
+    ExportFormatEnum.parquet: "application/vnd.apache.parquet",
+    ExportFormatEnum.arrow: "application/vnd.apache.arrow.stream",
+}
+FILE_EXTENSIONS = {
+    ExportFormatEnum.parquet: "parquet",
+    ExportFormatEnum.arrow: "arrows",
+}
+
+
+def _require_pyarrow():
+    try:
+        import pyarrow
+    except ImportError:
+        raise ImportError(
+            "pyarrow package is required for exports. Install with 'pip install pyarrow'."
+        )
+    return pyarrow
+
+
+def _arrow_type(pa, column):
+    if isinstance(column.type, Float):
+        return pa.float64()
+    if isinstance(column.type, Integer):
+        return pa.int64()
+    if isinstance(column.type, DateTime):
+        return pa.timestamp("us")
+    if isinstance(column.type, Date):
+        return pa.date32()
+    # UUIDs, strings and enums are exported as text
+    return pa.string()
+
+
+def _to_python(value):
+    if isinstance(value, uuid.UUID):
+        return str(value)
+    if isinstance(value, enum.Enum):
+        return value.value
+    return value
+
+
+def export_schema(dataset: ExportDatasetEnum):
+    pa = _require_pyarrow()
+    columns = EXPORT_MODELS[dataset].__table__.columns
+    return pa.schema(
+        [pa.field(column.name, _arrow_type(pa, column)) for column in columns]
+    )
+
+
+def iter_record_batches(
+    db: Session,
+    dataset: ExportDatasetEnum,
+    user_id: Optional[uuid.UUID] = None,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+) -> Iterator["pyarrow.RecordBatch"]:
+    """
+    Stream a dataset as Arrow record batches of at most ``chunk_size`` rows.
+
+    Rows are fetched through a server-side cursor (``yield_per``), so memory
+    use is bounded by one chunk regardless of table size.
+    """
+    pa = _require_pyarrow()
+    model = EXPORT_MODELS[dataset]
+    columns: List = list(model.__table__.columns)
+    schema = export_schema(dataset)
+
+    stmt = select(*columns).execution_options(yield_per=chunk_size)
+    if user_id is not None:
+        stmt = stmt.where(model.user_id == user_id)
+
+    for rows in db.execute(stmt).partitions():
+        arrays = [
+            pa.array([_to_python(row[i]) for row in rows], type=field.type)
+            for i, field in enumerate(schema)
+        ]
+        yield pa.RecordBatch.from_arrays(arrays, schema=schema)
+
+
+class _ChunkSink:
+    """Write-only file object that buffers bytes until drained."""
+
+    closed = False
+
+    def __init__(self):
+        self._chunks: List[bytes] = []
+
+    def write(self, data) -> int:
+        self._chunks.append(bytes(data))
+        return len(data)
+
+    def flush(self) -> None:
+        pass
+
+    def close(self) -> None:
+        pass
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+def stream_export(
+    db: Session,
+    dataset: ExportDatasetEnum,
+    fmt: ExportFormatEnum,
+    user_id: Optional[uuid.UUID] = None,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+) -> Iterator[bytes]:
+    """
+    Yield an encoded Parquet file or Arrow IPC stream piece by piece.
+
+    Each record batch is written (one Parquet row group per batch) and the
+    encoded bytes are yielded straight away, so the full result is never
+    materialized in memory.
+    """
+    pa = _require_pyarrow()
+    schema = export_schema(dataset)
+    sink = _ChunkSink()
+    if fmt == ExportFormatEnum.parquet:
+        import pyarrow.parquet as pq
+
+        writer = pq.ParquetWriter(sink, schema, compression="zstd")
+    else:
+        writer = pa.ipc.new_stream(sink, schema)
+
+    try:
+        for batch in iter_record_batches(db, dataset, user_id, chunk_size):
+            writer.write_batch(batch)
+            data = sink.drain()
+            if data:
+                yield data
+    finally:
+        writer.close()
+    yield sink.drain()
@@ -0,0 +1,246 @@
+import bisect
+import difflib
+import re
+from collections import Counter, deque
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+from app.utils.cache import LRUCache
+
+# Generated ingredients look like "2. 200 grams chicken breast (diced)".
+_LIST_MARKER = re.compile(r"^\s*[\d\.\)\-\*]+\s*")
+_MEASUREMENT = re.compile(
+    r"\d+\s*(grams?|cups?|tbsp|tsp|ounces?|oz|lbs?|pounds?|slices?|pieces?|cloves?|inch(es)?|cubes?|chunks?)",
+    re.IGNORECASE,
+)
+_PARENTHESES = re.compile(r"\(.*?\)")
+_WORD = re.compile(r"[a-z0-9]+")
+
+# Separates inventory names in the joined haystack; never part of a name.
+_SEPARATOR = "\x00"
+
+# Minimum difflib ratio for a fuzzy match ("brocoli" -> "broccoli"), and
+# how many names sharing the most character trigrams with a line are
+# compared.
+FUZZY_CUTOFF = 0.85
+FUZZY_CANDIDATES = 8
+
+
+def clean_ingredient(text: str) -> str:
+    """Drop list markers, measurements and parenthesised notes."""
+    text = _LIST_MARKER.sub("", text).strip()
+    text = _MEASUREMENT.sub("", text)
+    text = _PARENTHESES.sub("", text)
+    return text.strip()
+
+
+def _trigrams(text: str) -> set:
+    grams = set()
+    for word in _WORD.findall(text):
+        padded = f" {word} "
+        grams.update(padded[i : i + 3] for i in range(len(padded) - 2))
+    return grams
+
+
+class IngredientMatcher:
+    """
+    Maps generated ingredient lines to inventory names, built once per
+    inventory.
+
+    A line matches the first inventory item (in inventory order) whose
+    lower-cased name occurs in it, or that contains it. Names occurring in
+    the line are found in one pass by an Aho-Corasick automaton over all
+    names; a line occurring in a name is found with one ``str.find`` over
+    the names joined into a single haystack. Lines matching neither way
+    fall back to the most similar name (difflib ratio of at least
+    FUZZY_CUTOFF against some run of the line's words) among the
+    FUZZY_CANDIDATES names sharing the most character trigrams with it,
+    looked up in a trigram index; otherwise the cleaned line is kept.
+    """
+
+    def __init__(self, inventory_names: Sequence[str]):
+        self.names = list(inventory_names)
+        lowered = [name.lower() for name in self.names]
+        self._lowered = lowered
+
+        # Aho-Corasick automaton: goto edges per state, failure links, and
+        # the lowest inventory index of any name ending at each state.
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._first: List[Optional[int]] = [None]
+        for index, name in enumerate(lowered):
+            if not name:
+                continue
+            state = 0
+            for char in name:
+                nxt = self._goto[state].get(char)
+                if nxt is None:
+                    nxt = len(self._goto)
+                    self._goto[state][char] = nxt
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._first.append(None)
+                state = nxt
+            if self._first[state] is None:
+                self._first[state] = index
+        self._link_failures()
+
+        self._haystack = _SEPARATOR.join(lowered)
+        self._offsets: List[int] = []
+        offset = 0
+        for name in lowered:
+            self._offsets.append(offset)
+            offset += len(name) + len(_SEPARATOR)
+
+        # Built on the first fuzzy lookup; most lines match exactly.
+        self._trigrams: Optional[Dict[str, List[int]]] = None
+        self._word_counts: List[int] = []
+
+    def _index_trigrams(self) -> Dict[str, List[int]]:
+        if self._trigrams is None:
+            trigrams: Dict[str, List[int]] = {}
+            for index, name in enumerate(self._lowered):
+                self._word_counts.append(max(len(_WORD.findall(name)), 1))
+                for gram in _trigrams(name):
+                    trigrams.setdefault(gram, []).append(index)
+            self._trigrams = trigrams
+        return self._trigrams
+
+    def _link_failures(self) -> None:
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, nxt in self._goto[state].items():
+                queue.append(nxt)
+                fallback = self._fail[state]
+                while fallback and char not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                target = self._goto[fallback].get(char, 0)
+                self._fail[nxt] = target if target != nxt else 0
+                # A state also ends every name its failure state ends.
+                inherited = self._first[self._fail[nxt]]
+                if inherited is not None and (
+                    self._first[nxt] is None or inherited < self._first[nxt]
+                ):
+                    self._first[nxt] = inherited
+
+    def _first_name_in(self, text: str) -> Optional[int]:
+        """Lowest index of an inventory name occurring in ``text``."""
+        best = None
+        state = 0
+        for char in text:
+            while state and char not in self._goto[state]:
+                state = self._fail[state]
+            state = self._goto[state].get(char, 0)
+            found = self._first[state]
+            if found is not None and (best is None or found < best):
+                best = found
+                if best == 0:
+                    break
+        return best
+
+    def _first_name_containing(self, text: str) -> Optional[int]:
+        """Lowest index of an inventory name that contains ``text``."""
+        position = self._haystack.find(text)
+        if position < 0:
+            return None
+        return bisect.bisect_right(self._offsets, position) - 1
+
+    def _closest(self, text: str) -> Optional[int]:
+        """
+        Most similar inventory name, compared with each run of as many words
+        of ``text`` as the name has ("cup brocolli" vs "broccoli" compares
+        "cup" and "brocolli").
+        """
+        words = _WORD.findall(text)
+        if not words:
+            return None
+        index_by_gram = self._index_trigrams()
+        grams = sorted(_trigrams(text))
+        shared = Counter()
+        # Sorted so that ties rank in the same order in every process.
+        common = max(len(self.names) // 4, FUZZY_CANDIDATES)
+        for gram in grams:
+            postings = index_by_gram.get(gram, ())
+            # Skip trigrams so common they say little ("ed ", " fr").
+            if len(postings) <= common:
+                shared.update(postings)
+        # A close spelling keeps most trigrams of at least one word.
+        least = max(len(grams) // (2 * len(words)), 1)
+        candidates = [
+            index
+            for index, count in shared.most_common(FUZZY_CANDIDATES)
+            if count >= least
+        ]
+        # difflib indexes its second sequence, so index the few windows of
+        # the line once rather than every candidate name.
+        windows: Dict[int, List[difflib.SequenceMatcher]] = {}
+        best, best_ratio = None, FUZZY_CUTOFF
+        for index in candidates:
+            name = self._lowered[index]
+            size = self._word_counts[index]
+            if size not in windows:
+                windows[size] = [
+                    difflib.SequenceMatcher(
+                        b=" ".join(words[start : start + size]), autojunk=False
+                    )
+                    for start in range(max(len(words) - size, 0) + 1)
+                ]
+            for matcher in windows[size]:
+                matcher.set_seq1(name)
+                if (
+                    matcher.real_quick_ratio() < best_ratio
+                    or matcher.quick_ratio() < best_ratio
+                ):
+                    continue
+                ratio = matcher.ratio()
+                if ratio > best_ratio or (ratio == best_ratio and best is None):
+                    best, best_ratio = index, ratio
+        return best
+
+    def match(self, generated: str) -> Optional[str]:
+        """
+        The inventory name for one generated ingredient line, else the
+        cleaned line; None when nothing is left after cleaning.
+        """
+        cleaned = clean_ingredient(generated)
+        if not cleaned:
+            return None
+        text = cleaned.lower()
+        found = [
+            index
+            for index in (
+                self._first_name_in(text),
+                self._first_name_containing(text),
+            )
+            if index is not None
+        ]
+        if not found:
+            closest = self._closest(text)
+            if closest is not None:
+                found = [closest]
+        return self.names[min(found)] if found else cleaned
+
+    def match_all(self, generated: Iterable[str]) -> List[str]:
+        """Match every line, dropping duplicates but keeping first-seen order."""
+        matched: List[str] = []
+        seen = set()
+        for line in generated:
+            name = self.match(line)
+            if name is not None and name not in seen:
+                seen.add(name)
+                matched.append(name)
+        return matched
+
+
+# Matchers by inventory, so every recipe of a batch (and repeat requests for
+# an unchanged pantry) reuses the automaton.
+_matchers = LRUCache(maxsize=256)
+
+
+def matcher_for(inventory_names: Sequence[str]) -> IngredientMatcher:
+    key: Tuple[str, ...] = tuple(inventory_names)
+    matcher = _matchers.get(key)
+    if matcher is None:
+        matcher = IngredientMatcher(key)
+        _matchers.set(key, matcher)
+    return matcher
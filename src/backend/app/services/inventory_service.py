@@ -1,12 +1,15 @@
 import os
-import shutil
 from datetime import datetime, timezone
-from fastapi import UploadFile
-from sqlalchemy.orm import Session, selectinload
+from typing import Union
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, noload, selectinload
 from sqlalchemy.exc import SQLAlchemyError
 from app.models import Inventory
 from app.schemas.inventory import InventoryCreate, InventoryUpdate
 from app.models.user import User
+from app.schemas.user import User as UserSchema
+from app.services.recipe_suggestions import notify_inventory_changed
 import uuid
 
 
@@ -32,23 +35,15 @@ def get_inventory_detail(db: Session, id: uuid.UUID, include: str = None):
     return item
 
 
-def create_inventory_item(db: Session, user: User, item_in: InventoryCreate):
+def create_inventory_item(
+    db: Session, user: Union[User, UserSchema], item_in: InventoryCreate
+):
     try:
-        db_item = Inventory(
-            user_id=user.id,
-            name=item_in.name,
-            quantity=item_in.quantity,
-            calories_per_serving=item_in.calories_per_serving,
-            protein_g_per_serving=item_in.protein_g_per_serving,
-            carbs_g_per_serving=item_in.carbs_g_per_serving,
-            fats_g_per_serving=item_in.fats_g_per_serving,
-            serving_size_unit=item_in.serving_size_unit,
-            expiry_date=item_in.expiry_date,
-            source=item_in.source or "manual",
-        )
+        db_item = _inventory_from_schema(user, item_in)
         db.add(db_item)
         db.commit()
         db.refresh(db_item)
+        notify_inventory_changed(user.id)
         return db_item
     except SQLAlchemyError as e:
         db.rollback()
@@ -56,7 +51,7 @@ def create_inventory_item(db: Session, user: User, item_in: InventoryCreate):
 
 
 def update_inventory_item(
-    db: Session, user: User, id: uuid.UUID, item_in: InventoryUpdate
+    db: Session, user: Union[User, UserSchema], id: uuid.UUID, item_in: InventoryUpdate
 ):
     try:
         db_item = (
@@ -77,13 +72,14 @@ def update_inventory_item(
         db.add(db_item)
         db.commit()
         db.refresh(db_item)
+        notify_inventory_changed(user.id)
         return db_item
     except SQLAlchemyError as e:
         db.rollback()
         raise e
 
 
-def delete_inventory_item(db: Session, user: User, id: uuid.UUID):
+def delete_inventory_item(db: Session, user: Union[User, UserSchema], id: uuid.UUID):
     try:
         db_item = (
             db.query(Inventory)
@@ -94,13 +90,122 @@ def delete_inventory_item(db: Session, user: User, id: uuid.UUID):
             return None
         db.delete(db_item)
         db.commit()
+        notify_inventory_changed(user.id)
+        return db_item
+    except SQLAlchemyError as e:
+        raise e
+
+
+def _inventory_from_schema(
+    user: Union[User, UserSchema], item_in: InventoryCreate
+) -> Inventory:
+    return Inventory(
+        user_id=user.id,
+        name=item_in.name,
+        quantity=item_in.quantity,
+        calories_per_serving=item_in.calories_per_serving,
+        protein_g_per_serving=item_in.protein_g_per_serving,
+        carbs_g_per_serving=item_in.carbs_g_per_serving,
+        fats_g_per_serving=item_in.fats_g_per_serving,
+        serving_size_unit=item_in.serving_size_unit,
+        expiry_date=item_in.expiry_date,
+        source=item_in.source or "manual",
+    )
+
+
+# Async variants of the functions above, for use with deps.get_async_db.
+
+
+async def async_list_inventory(db: AsyncSession, page: int, per_page: int):
+    total = await db.scalar(select(func.count()).select_from(Inventory))
+    result = await db.scalars(
+        select(Inventory)
+        .order_by(Inventory.added_at.desc())
+        .offset((page - 1) * per_page)
+        .limit(per_page)
+    )
+    return total, result.all()
+
+
+async def async_get_inventory_detail(
+    db: AsyncSession, id: uuid.UUID, include: str = None
+):
+    stmt = select(Inventory).filter(Inventory.id == id)
+    if include and "consumption_logs" in include.split(","):
+        stmt = stmt.options(selectinload(Inventory.consumption_logs))
+    else:
+        # No implicit lazy loads under asyncio; leave the relationship empty.
+        stmt = stmt.options(noload(Inventory.consumption_logs))
+    return (await db.scalars(stmt)).first()
+
+
+async def async_create_inventory_item(
+    db: AsyncSession, user: Union[User, UserSchema], item_in: InventoryCreate
+):
+    try:
+        db_item = _inventory_from_schema(user, item_in)
+        db.add(db_item)
+        await db.commit()
+        await db.refresh(db_item)
+        notify_inventory_changed(user.id)
+        return db_item
+    except SQLAlchemyError as e:
+        await db.rollback()
+        raise e
+
+
+async def _async_get_owned_item(
+    db: AsyncSession, user: Union[User, UserSchema], id: uuid.UUID
+):
+    return (
+        await db.scalars(
+            select(Inventory).filter(Inventory.id == id, Inventory.user_id == user.id)
+        )
+    ).first()
+
+
+async def async_update_inventory_item(
+    db: AsyncSession,
+    user: Union[User, UserSchema],
+    id: uuid.UUID,
+    item_in: InventoryUpdate,
+):
+    try:
+        db_item = await _async_get_owned_item(db, user, id)
+        if not db_item:
+            return None
+        update_data = item_in.model_dump(exclude_unset=True)
+        for field in ["id", "user_id", "added_at", "updated_at"]:
+            update_data.pop(field, None)
+        for field, value in update_data.items():
+            setattr(db_item, field, value)
+        await db.commit()
+        await db.refresh(db_item)
+        notify_inventory_changed(user.id)
+        return db_item
+    except SQLAlchemyError as e:
+        await db.rollback()
+        raise e
+
+
+async def async_delete_inventory_item(
+    db: AsyncSession, user: Union[User, UserSchema], id: uuid.UUID
+):
+    try:
+        db_item = await _async_get_owned_item(db, user, id)
+        if not db_item:
+            return None
+        await db.delete(db_item)
+        await db.commit()
+        notify_inventory_changed(user.id)
         return db_item
     except SQLAlchemyError as e:
+        await db.rollback()
         raise e
 
 
 def process_inventory_image(
-    file_bytes: bytes, filename: str, content_type: str, user: User
+    file_bytes: bytes, filename: str, content_type: str, user: Union[User, UserSchema]
 ):
     """
     Process and save an uploaded inventory image for a user.
@@ -0,0 +1,296 @@
+import asyncio
+import contextvars
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from datetime import date, datetime, timedelta
+from typing import Callable, Dict, Iterator, List, Optional
+
+from app.core.config import settings
+from app.utils.logger import get_logger
+from app.utils.metrics import metrics
+
+logger = get_logger("LLMUsage")
+
+llm_requests = metrics.counter(
+    "llm_requests_total", "LLM requests by endpoint and outcome (incl. cache_hit)"
+)
+llm_tokens = metrics.counter(
+    "llm_tokens_total", "LLM tokens by endpoint and kind (prompt, completion)"
+)
+llm_attempts = metrics.counter(
+    "llm_attempts_total", "LLM attempts (retries and hedges included) by endpoint"
+)
+llm_request_seconds = metrics.histogram(
+    "llm_request_seconds",
+    "LLM request latency by endpoint, all attempts included",
+    buckets=(0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 20.0, 30.0, 60.0),
+)
+quota_rejections = metrics.counter(
+    "llm_quota_rejections_total", "LLM requests refused by the daily token quota"
+)
+usage_rows_written = metrics.counter(
+    "llm_usage_rows_written_total", "Rows written to the llm_usage table"
+)
+usage_rows_dropped = metrics.counter(
+    "llm_usage_rows_dropped_total", "llm_usage rows lost, by reason"
+)
+usage_rows_buffered = metrics.gauge(
+    "llm_usage_rows_buffered", "llm_usage rows waiting for the next batch write"
+)
+
+
+@dataclass(frozen=True)
+class UsageScope:
+    """Who an LLM call is made for: the user and the endpoint serving them."""
+
+    user_id: Optional[uuid.UUID]
+    endpoint: str
+
+
+_scope: contextvars.ContextVar[Optional[UsageScope]] = contextvars.ContextVar(
+    "llm_usage_scope", default=None
+)
+
+UNSCOPED = UsageScope(user_id=None, endpoint="unknown")
+
+
+@contextmanager
+def llm_usage_scope(user_id: Optional[uuid.UUID], endpoint: str) -> Iterator[None]:
+    """
+    Attribute LLM calls made inside the block (and in tasks started from it)
+    to ``user_id`` and ``endpoint``. Works inside async generators too: the
+    previous scope is put back rather than reset by token.
+    """
+    previous = _scope.get()
+    _scope.set(UsageScope(user_id, endpoint))
+    try:
+        yield
+    finally:
+        _scope.set(previous)
+
+
+def current_scope() -> UsageScope:
+    return _scope.get() or UNSCOPED
+
+
+class QuotaExceededError(RuntimeError):
+    """The user has used LLM_USER_DAILY_TOKEN_QUOTA tokens today (UTC)."""
+
+    def __init__(self, user_id: uuid.UUID, retry_after: float):
+        super().__init__("Daily recipe generation quota used up")
+        self.user_id = user_id
+        self.retry_after = retry_after
+
+
+@dataclass
+class LLMCall:
+    """
+    Usage of one logical LLM call, summed over its attempts. Token counts
+    come from the model's usage metadata, or are estimated from the text
+    when the model does not report them (streams, fakes).
+    """
+
+    scope: UsageScope
+    model: str
+    prompt_tokens: int = 0
+    completion_tokens: int = 0
+    attempts: int = 0
+    cache_hit: bool = False
+    started: float = field(default_factory=time.perf_counter)
+
+    def add_tokens(self, prompt: int, completion: int) -> None:
+        self.prompt_tokens += prompt
+        self.completion_tokens += completion
+
+
+class UsageTracker:
+    """
+    Accounts every LLM call and recipe cache hit.
+
+    Each finished call is aggregated into metrics (by endpoint, never by
+    user), added to the user's token tally for today, and, while started,
+    buffered for the ``llm_usage`` table. A background task writes the
+    buffer in multi-row inserts of up to ``batch_size`` rows, every
+    ``flush_interval`` seconds or as soon as a batch is full; at most
+    ``max_buffered`` rows wait, older ones are dropped first.
+
+    The daily tallies live in this process, so checking a quota is a dict
+    lookup; with several workers each enforces the quota on its own share
+    of the traffic.
+    """
+
+    def __init__(
+        self,
+        flush_interval: float,
+        batch_size: int,
+        max_buffered: int,
+        session_factory: Optional[Callable] = None,
+        clock: Callable[[], datetime] = datetime.utcnow,
+    ):
+        self.flush_interval = flush_interval
+        self.batch_size = batch_size
+        self.max_buffered = max_buffered
+        self._session_factory = session_factory
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._buffer: List[dict] = []
+        self._day: Optional[date] = None
+        self._tokens_today: Dict[uuid.UUID, int] = {}
+        self._task: Optional[asyncio.Task] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._wake: Optional[asyncio.Event] = None
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None
+
+    def tokens_today(self, user_id: uuid.UUID) -> int:
+        with self._lock:
+            self._roll_day()
+            return self._tokens_today.get(user_id, 0)
+
+    def _roll_day(self) -> None:
+        today = self._clock().date()
+        if today != self._day:
+            self._day = today
+            self._tokens_today.clear()
+
+    def start_call(self, model: str) -> LLMCall:
+        """
+        Begin accounting an LLM call for the current scope.
+
+        Raises:
+            QuotaExceededError: the scope's user has no tokens left today
+        """
+        scope = current_scope()
+        quota = settings.LLM_USER_DAILY_TOKEN_QUOTA
+        if quota and scope.user_id is not None:
+            if self.tokens_today(scope.user_id) >= quota:
+                quota_rejections.inc(endpoint=scope.endpoint)
+                now = self._clock()
+                midnight = datetime.combine(
+                    now.date() + timedelta(days=1), datetime.min.time()
+                )
+                raise QuotaExceededError(
+                    scope.user_id, (midnight - now).total_seconds()
+                )
+        return LLMCall(scope=scope, model=model)
+
+    def finish_call(self, call: LLMCall, outcome: str) -> None:
+        """Record a call started with start_call, whatever its outcome."""
+        seconds = time.perf_counter() - call.started
+        endpoint = call.scope.endpoint
+        llm_requests.inc(endpoint=endpoint, outcome=outcome)
+        llm_attempts.inc(call.attempts, endpoint=endpoint)
+        llm_tokens.inc(call.prompt_tokens, endpoint=endpoint, kind="prompt")
+        llm_tokens.inc(call.completion_tokens, endpoint=endpoint, kind="completion")
+        llm_request_seconds.observe(seconds, endpoint=endpoint)
+        tokens = call.prompt_tokens + call.completion_tokens
+        if call.scope.user_id is not None and tokens:
+            with self._lock:
+                self._roll_day()
+                self._tokens_today[call.scope.user_id] = (
+                    self._tokens_today.get(call.scope.user_id, 0) + tokens
+                )
+        self._buffer_row(call, outcome, seconds)
+
+    def record_cache_hit(self, model: str = "cache") -> None:
+        """Record a recipe served without an LLM call (cache or suggestion)."""
+        call = LLMCall(scope=current_scope(), model=model, cache_hit=True)
+        self.finish_call(call, "cache_hit")
+
+    def _buffer_row(self, call: LLMCall, outcome: str, seconds: float) -> None:
+        if not self.running:
+            return
+        row = {
+            "user_id": call.scope.user_id,
+            "endpoint": call.scope.endpoint,
+            "model": call.model,
+            "prompt_tokens": call.prompt_tokens,
+            "completion_tokens": call.completion_tokens,
+            "attempts": call.attempts,
+            "latency_seconds": seconds,
+            "cache_hit": call.cache_hit,
+            "outcome": outcome,
+            "created_at": self._clock(),
+        }
+        with self._lock:
+            self._buffer.append(row)
+            overflow = len(self._buffer) - self.max_buffered
+            if overflow > 0:
+                del self._buffer[:overflow]
+            buffered = len(self._buffer)
+        usage_rows_buffered.set(buffered)
+        if overflow > 0:
+            usage_rows_dropped.inc(overflow, reason="overflow")
+        if buffered >= self.batch_size:
+            # May be called from a worker thread (the blocking generate path).
+            self._loop.call_soon_threadsafe(self._wake.set)
+
+    async def start(self) -> None:
+        if self.running:
+            return
+        self._loop = asyncio.get_running_loop()
+        self._wake = asyncio.Event()
+        self._task = asyncio.create_task(self._run())
+        logger.info("LLM usage recorder started")
+
+    async def stop(self) -> None:
+        """Stop the background writer after writing what is buffered."""
+        task, self._task = self._task, None
+        if task is None:
+            return
+        task.cancel()
+        await asyncio.gather(task, return_exceptions=True)
+        await self.flush()
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await asyncio.wait_for(self._wake.wait(), self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wake.clear()
+            await self.flush()
+
+    def _session(self):
+        if self._session_factory is None:
+            from app.db.async_session import AsyncSessionLocal
+
+            self._session_factory = AsyncSessionLocal
+        return self._session_factory()
+
+    async def flush(self) -> int:
+        """Write the buffered rows in batches; returns how many were written."""
+        from sqlalchemy import insert
+
+        from app.models.llm_usage import LLMUsage
+
+        with self._lock:
+            rows, self._buffer = self._buffer, []
+        usage_rows_buffered.set(0)
+        written = 0
+        for start in range(0, len(rows), self.batch_size):
+            batch = rows[start : start + self.batch_size]
+            try:
+                async with self._session() as db:
+                    await db.execute(insert(LLMUsage), batch)
+                    await db.commit()
+            except Exception as e:
+                usage_rows_dropped.inc(len(batch), reason="write_error")
+                logger.error(f"Writing {len(batch)} llm_usage rows failed: {e}")
+                continue
+            written += len(batch)
+        if written:
+            usage_rows_written.inc(written)
+        return written
+
+
+usage_tracker = UsageTracker(
+    flush_interval=settings.LLM_USAGE_FLUSH_SECONDS,
+    batch_size=settings.LLM_USAGE_BATCH_SIZE,
+    max_buffered=settings.LLM_USAGE_MAX_BUFFERED,
+)
@@ -0,0 +1,89 @@
+import importlib
+import threading
+from typing import Any, Callable, Dict, Optional, Union
+
+Factory = Callable[[], Any]
+
+
+def _import_factory(path: str) -> Factory:
+    """Resolve ``"package.module:attr"`` to the callable it names."""
+    module_name, _, attr = path.partition(":")
+    return getattr(importlib.import_module(module_name), attr)
+
+
+class ServiceLocator:
+    """
+    Registry of application-scoped services that are built on first use.
+
+    Factories may be given as ``"package.module:callable"`` strings, so heavy
+    dependencies (OpenCV, Ultralytics, LangChain/Gemini) are not imported
+    until a request actually needs the service. Each service is created once
+    per process; a factory that raises leaves nothing cached, so the next
+    ``get`` retries.
+    """
+
+    def __init__(self):
+        self._factories: Dict[str, Union[str, Factory]] = {}
+        self._instances: Dict[str, Any] = {}
+        self._lock = threading.RLock()
+
+    def register(self, name: str, factory: Union[str, Factory]) -> None:
+        with self._lock:
+            self._factories[name] = factory
+            self._instances.pop(name, None)
+
+    def get(self, name: str) -> Any:
+        instance = self._instances.get(name)
+        if instance is not None:
+            return instance
+        with self._lock:
+            instance = self._instances.get(name)
+            if instance is None:
+                try:
+                    factory = self._factories[name]
+                except KeyError:
+                    raise LookupError(f"No service registered as {name!r}")
+                if isinstance(factory, str):
+                    factory = _import_factory(factory)
+                instance = self._instances[name] = factory()
+            return instance
+
+    def is_loaded(self, name: str) -> bool:
+        return name in self._instances
+
+    def override(self, name: str, instance: Any) -> None:
+        """Use ``instance`` for ``name`` (e.g. a fake in tests)."""
+        with self._lock:
+            self._instances[name] = instance
+
+    def reset(self, name: Optional[str] = None) -> None:
+        """Drop the cached instance(s); the next get() builds them again."""
+        with self._lock:
+            if name is None:
+                self._instances.clear()
+            else:
+                self._instances.pop(name, None)
+
+
+def _build_detection_service():
+    from app.services.detection_service import DetectionService
+    from app.services.storage_service import StorageService
+
+    return DetectionService(StorageService, locator.get("yolo_detector"))
+
+
+locator = ServiceLocator()
+locator.register(
+    "yolo_detector",
+    "app.services.ml_services.image_processing.yolo_detector:YOLODetector",
+)
+locator.register("detection_service", _build_detection_service)
+locator.register(
+    "local_recipe_engine",
+    "app.services.ml_services.recipe_generation.local_recipe_engine:LocalRecipeEngine",
+)
+locator.register(
+    "recipe_generator",
+    "app.services.ml_services.recipe_generation.gemini_recipe_generator:"
+    "GeminiRecipeGenerator",
+)
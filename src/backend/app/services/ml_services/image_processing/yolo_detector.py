@@ -1,12 +1,15 @@
 from typing import List, Dict
 import numpy as np
 import os
+import threading
 
 
 class YOLODetector:
     """
     YOLOv8 Object Detector using Ultralytics.
     Loads the model once and provides a detect() method for inference.
+    One instance is shared per process (see app.services.locator); inference
+    is serialised because the Ultralytics predictor is not thread-safe.
     """
 
     def __init__(
@@ -22,6 +25,7 @@ class YOLODetector:
         if not os.path.exists(model_path):
             raise FileNotFoundError(f"Model weights not found at {model_path}")
         self.model = YOLO(model_path)
+        self._lock = threading.Lock()
 
     def detect(self, image: np.ndarray) -> List[Dict]:
         """
@@ -36,7 +40,8 @@ class YOLODetector:
         if not isinstance(image, np.ndarray):
             raise TypeError("Input must be a numpy array.")
         try:
-            results = self.model(image)
+            with self._lock:
+                results = self.model(image)
         except Exception as e:
             raise RuntimeError(f"YOLO detection failed: {e}")
         detections = []
@@ -1,11 +1,57 @@
+import asyncio
+import time
 from langchain_google_genai import ChatGoogleGenerativeAI
 from langchain.prompts import PromptTemplate
 from pydantic import BaseModel, Field
 from app.core.config import settings
-from typing import List, Optional
+from typing import AsyncIterator, List, Optional, Tuple
 from app.models.inventory import Inventory
+from app.services.llm_usage import LLMCall, usage_tracker
+from app.services.ml_services.recipe_generation.prompt_builder import (
+    build_pantry,
+    estimate_tokens,
+)
+from app.utils.logger import get_logger
+from app.utils.metrics import metrics
+from app.utils.resilience import (
+    CircuitBreaker,
+    CircuitOpenError,
+    ResilientCaller,
+)
 import json
 
+logger = get_logger("GeminiRecipeGenerator")
+
+llm_calls_in_flight = metrics.gauge(
+    "recipe_llm_calls_in_flight", "Recipe LLM calls currently awaiting a response"
+)
+llm_call_seconds = metrics.histogram(
+    "recipe_llm_call_seconds",
+    "Recipe LLM call latency, including the wait for a free slot",
+    buckets=(0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 20.0, 30.0, 60.0),
+)
+llm_calls = metrics.counter("recipe_llm_calls_total", "Recipe LLM calls by outcome")
+batch_recipes = metrics.histogram(
+    "recipe_llm_batch_recipes",
+    "Recipes returned by one batch LLM call",
+    buckets=(1, 2, 3, 4, 5, 8, 10),
+)
+
+prompt_tokens = metrics.histogram(
+    "recipe_prompt_tokens",
+    "Estimated prompt tokens per recipe LLM call",
+    buckets=(100, 200, 300, 400, 600, 800, 1200, 1600, 2400),
+)
+prompt_items_dropped = metrics.counter(
+    "recipe_prompt_items_dropped_total",
+    "Inventory items left out of recipe prompts by the token budget",
+)
+
+# Output tokens allowed per recipe; batch calls get this times the count.
+MAX_TOKENS_PER_RECIPE = 1024
+
+GEMINI_MODEL = "gemini-2.5-flash-lite"
+
 
 class RecipeSchema(BaseModel):
     title: str = Field(description="Recipe title")
@@ -17,42 +63,251 @@ class RecipeSchema(BaseModel):
     directions: str = Field(description="Step-by-step cooking instructions")
 
 
+class RecipeBatchSchema(BaseModel):
+    recipes: List[RecipeSchema] = Field(
+        description="Distinct recipes, each a complete alternative"
+    )
+
+
 class GeminiRecipeGenerator:
-    def __init__(self):
+    """
+    Recipe generator backed by Gemini through LangChain.
+
+    Building it creates the Gemini API client (one channel that multiplexes
+    concurrent requests), the structured-output wrapper and the prompt, so
+    the application keeps a single instance: get it from the service
+    locator as ``locator.get("recipe_generator")`` rather than constructing
+    one per request. ``generate_recipe`` is safe to call from several
+    threads at once.
+
+    ``agenerate_recipe`` is the non-blocking path. At most
+    RECIPE_LLM_MAX_CONCURRENCY async calls are outstanding per instance
+    (i.e. per process); the rest wait for a slot, and each call, wait
+    included, is bounded by RECIPE_LLM_TIMEOUT_SECONDS.
+
+    ``generate_recipes``/``agenerate_recipes`` ask for several distinct
+    recipes in one call, so the prompt is sent (and paid for) once rather
+    than once per recipe.
+
+    Every call goes through ``resilience`` (see build_resilience): a
+    per-attempt timeout, jittered retries, optional hedging and a circuit
+    breaker that raises CircuitOpenError while Gemini keeps failing.
+    Streams only use the breaker, as partial output cannot be retried.
+
+    Every call is also accounted in llm_usage (tokens, latency, attempts),
+    attributed to the caller's llm_usage_scope, and refused with
+    QuotaExceededError once that user's daily token quota is used up.
+    Gemini's structured answers include the raw message, for its token
+    usage metadata.
+    """
+
+    def __init__(
+        self, model=None, stream_model=None, batch_model=None, resilience=None
+    ):
         """
         Initialize the GEMINI recipe generator with LangChain integration.
+
+        Args:
+            model: Runnable mapping the prompt to a RecipeSchema, used instead
+                of Gemini (e.g. a local fake in tests)
+            stream_model: Runnable streaming the prompt's answer as growing
+                partial recipe dicts, used instead of Gemini's JSON mode
+            batch_model: Runnable mapping the batch prompt to a
+                RecipeBatchSchema, used instead of Gemini
+            resilience: ResilientCaller for the model calls, instead of one
+                configured from settings
         """
         try:
-            # Initialize the GEMINI model through LangChain with structured output
-            self.model = ChatGoogleGenerativeAI(
-                model="gemini-2.5-flash-lite",
-                google_api_key=settings.GEMINI_API_KEY,
-                temperature=0.7,
-                max_tokens=1024,
-            ).with_structured_output(RecipeSchema)
+            if model is None:
+                # Initialize the GEMINI model through LangChain with structured output
+                self.llm = ChatGoogleGenerativeAI(
+                    model=GEMINI_MODEL,
+                    google_api_key=settings.GEMINI_API_KEY,
+                    temperature=0.7,
+                    max_tokens=MAX_TOKENS_PER_RECIPE,
+                    timeout=settings.RECIPE_LLM_CALL_TIMEOUT_SECONDS,
+                    # Retries happen in self.resilience.
+                    max_retries=0,
+                )
+                model = self.llm.with_structured_output(RecipeSchema, include_raw=True)
+                if batch_model is None:
+                    # Same client, with room for the largest batch.
+                    batch_llm = self.llm.model_copy(
+                        update={
+                            "max_output_tokens": MAX_TOKENS_PER_RECIPE
+                            * settings.RECIPE_BATCH_MAX_COUNT
+                        }
+                    )
+                    batch_model = batch_llm.with_structured_output(
+                        RecipeBatchSchema, include_raw=True
+                    )
+                if stream_model is None:
+                    # Tool-call output arrives in one piece; JSON mode streams
+                    # text that the parser turns into growing partial dicts.
+                    stream_model = self.llm.with_structured_output(
+                        RecipeSchema.model_json_schema(), method="json_mode"
+                    )
+                self.model_name = GEMINI_MODEL
+            else:
+                self.model_name = "custom"
+            self.model = model
+            self.stream_model = stream_model
+            self.batch_model = batch_model
 
             # Create prompt template for recipe generation
+            # The pantry lists each ingredient once, with its nutrition; see
+            # prompt_builder.build_pantry.
             self.prompt_template = PromptTemplate(
-                input_variables=["ingredients", "fitness_goal", "inventory_details"],
-                template="""You are a professional chef and nutritionist. Generate a healthy recipe using the following ingredients: {ingredients}.
+                input_variables=["pantry", "fitness_goal"],
+                template="""You are a professional chef and nutritionist. Generate a healthy recipe using ingredients from this pantry:
+{pantry}
 
 The recipe should be appropriate for someone with the fitness goal: {fitness_goal}.
 
-Available ingredients with their nutritional information:
-{inventory_details}
-
 Make sure to:
-1. Use only the provided ingredients when possible
+1. Use only the listed ingredients when possible
 2. Provide clear, concise cooking instructions
 3. Keep the recipe healthy and aligned with the fitness goal
 4. Consider the nutritional values and quantities when creating the recipe""",
             )
+            self.batch_prompt_template = PromptTemplate(
+                input_variables=["count", "pantry", "fitness_goal"],
+                template="""You are a professional chef and nutritionist. Generate {count} different healthy recipes using ingredients from this pantry:
+{pantry}
+
+The recipes should be appropriate for someone with the fitness goal: {fitness_goal}.
+
+Make sure to:
+1. Use only the listed ingredients when possible
+2. Provide clear, concise cooking instructions
+3. Keep the recipes healthy and aligned with the fitness goal
+4. Consider the nutritional values and quantities when creating the recipes
+5. Make each recipe a real alternative: a different dish, not a variation of another one""",
+            )
 
             # Create the chain
             self.chain = self.prompt_template | self.model
+            self.stream_chain = (
+                self.prompt_template | self.stream_model if self.stream_model else None
+            )
+            self.batch_chain = (
+                self.batch_prompt_template | self.batch_model
+                if self.batch_model
+                else None
+            )
         except Exception as e:
             raise RuntimeError(f"Failed to initialize GEMINI recipe generator: {e}")
 
+        self._slots = asyncio.Semaphore(settings.RECIPE_LLM_MAX_CONCURRENCY)
+        self.resilience = resilience or build_resilience()
+
+    def _chain_input(
+        self,
+        ingredients: List[str],
+        fitness_goal: str,
+        inventory_items: Optional[List[Inventory]],
+        count: Optional[int] = None,
+    ) -> dict:
+        """
+        Prompt variables for the single recipe prompt, or for the batch
+        prompt when ``count`` is given. The pantry is trimmed to
+        RECIPE_PROMPT_TOKEN_BUDGET; the estimated prompt size is recorded.
+        """
+        pantry = build_pantry(
+            ingredients,
+            fitness_goal,
+            inventory_items,
+            settings.RECIPE_PROMPT_TOKEN_BUDGET,
+        )
+        chain_input = {"pantry": pantry.text, "fitness_goal": fitness_goal}
+        template = self.prompt_template
+        if count is not None:
+            chain_input["count"] = count
+            template = self.batch_prompt_template
+
+        tokens = estimate_tokens(template.format(**chain_input))
+        prompt_tokens.observe(tokens)
+        if pantry.dropped:
+            prompt_items_dropped.inc(pantry.dropped)
+        logger.debug(
+            f"Recipe prompt: ~{tokens} tokens, {pantry.listed} items listed, "
+            f"{pantry.dropped} dropped"
+        )
+        return chain_input
+
+    @staticmethod
+    def _to_dict(recipe_data: RecipeSchema) -> dict:
+        return {
+            "title": recipe_data.title,
+            "calories": recipe_data.calories,
+            "protein": recipe_data.protein,
+            "carbs": recipe_data.carbs,
+            "fats": recipe_data.fats,
+            "ingredients": recipe_data.ingredients,
+            "directions": recipe_data.directions,
+        }
+
+    def _batch_input(
+        self,
+        ingredients: List[str],
+        fitness_goal: str,
+        inventory_items: Optional[List[Inventory]],
+        count: int,
+    ) -> dict:
+        if self.batch_chain is None:
+            raise RuntimeError("Batch recipe generation is not configured")
+        if not 1 <= count <= settings.RECIPE_BATCH_MAX_COUNT:
+            raise ValueError(
+                f"count must be between 1 and {settings.RECIPE_BATCH_MAX_COUNT}"
+            )
+        return self._chain_input(ingredients, fitness_goal, inventory_items, count)
+
+    def _batch_to_list(self, batch_data: RecipeBatchSchema, count: int) -> List[dict]:
+        """The first ``count`` recipes; fewer is accepted, none is an error."""
+        recipes = [self._to_dict(recipe) for recipe in batch_data.recipes[:count]]
+        if not recipes:
+            raise RuntimeError("GEMINI returned no recipes")
+        if len(recipes) < count:
+            logger.warning(f"Recipe batch short: asked for {count}, got {len(recipes)}")
+        batch_recipes.observe(len(recipes))
+        return recipes
+
+    @staticmethod
+    def _parsed(call: LLMCall, chain, chain_input: dict, result):
+        """
+        The schema object answered by one attempt of ``chain``, adding the
+        attempt's tokens to ``call``: from the raw message's usage metadata,
+        else estimated from the prompt and answer text.
+
+        Raises:
+            RuntimeError: the answer could not be parsed into the schema
+        """
+        raw, parsed, error = None, result, None
+        if isinstance(result, dict) and "parsed" in result:
+            raw, parsed = result.get("raw"), result["parsed"]
+            error = result.get("parsing_error")
+        usage = getattr(raw, "usage_metadata", None)
+        if usage:
+            call.add_tokens(usage.get("input_tokens", 0), usage.get("output_tokens", 0))
+        else:
+            answer = parsed.model_dump_json() if parsed is not None else ""
+            call.add_tokens(
+                estimate_tokens(chain.first.format(**chain_input)),
+                estimate_tokens(answer),
+            )
+        if error is not None or parsed is None:
+            raise RuntimeError(f"GEMINI returned an unparseable answer: {error}")
+        return parsed
+
+    def _invoke(self, call: LLMCall, chain, chain_input: dict):
+        call.attempts += 1
+        return self._parsed(call, chain, chain_input, chain.invoke(chain_input))
+
+    async def _ainvoke_once(self, call: LLMCall, chain, chain_input: dict):
+        call.attempts += 1
+        result = await chain.ainvoke(chain_input)
+        return self._parsed(call, chain, chain_input, result)
+
     def generate_recipe(
         self,
         ingredients: List[str],
@@ -70,49 +325,269 @@ Make sure to:
         Returns:
             Dictionary with recipe data (title, ingredients, directions)
         """
+        chain_input = self._chain_input(ingredients, fitness_goal, inventory_items)
+        call = usage_tracker.start_call(self.model_name)
+        outcome = "error"
         try:
-            # Format ingredients as a comma-separated string
-            ingredients_str = ", ".join(ingredients)
-
-            # Format inventory details with nutritional information
-            inventory_details = "No detailed inventory information available"
-            if inventory_items:
-                inventory_details_lines = []
-                for item in inventory_items:
-                    if item.quantity > 0:  # Only include items with available quantity
-                        details = f"- {item.name}: {item.quantity} {item.serving_size_unit or 'units'}"
-                        if item.calories_per_serving is not None:
-                            details += (
-                                f", {item.calories_per_serving} calories per serving"
-                            )
-                        if item.protein_g_per_serving is not None:
-                            details += f", {item.protein_g_per_serving}g protein"
-                        if item.carbs_g_per_serving is not None:
-                            details += f", {item.carbs_g_per_serving}g carbs"
-                        if item.fats_g_per_serving is not None:
-                            details += f", {item.fats_g_per_serving}g fats"
-                        inventory_details_lines.append(details)
-                if inventory_details_lines:
-                    inventory_details = "\n".join(inventory_details_lines)
-
             # Generate recipe using the chain
-            recipe_data = self.chain.invoke(
-                {
-                    "ingredients": ingredients_str,
-                    "fitness_goal": fitness_goal,
-                    "inventory_details": inventory_details,
-                }
+            recipe_data = self.resilience.call(
+                lambda: self._invoke(call, self.chain, chain_input),
+                deadline=time.monotonic() + settings.RECIPE_LLM_TIMEOUT_SECONDS,
             )
+            outcome = "ok"
 
             # Convert to dictionary
-            return {
-                "title": recipe_data.title,
-                "calories": recipe_data.calories,
-                "protein": recipe_data.protein,
-                "carbs": recipe_data.carbs,
-                "fats": recipe_data.fats,
-                "ingredients": recipe_data.ingredients,
-                "directions": recipe_data.directions,
-            }
+            return self._to_dict(recipe_data)
+        except CircuitOpenError:
+            outcome = "rejected"
+            raise
+        except Exception as e:
+            raise RuntimeError(f"Failed to generate recipe with GEMINI: {e}")
+        finally:
+            usage_tracker.finish_call(call, outcome)
+
+    async def agenerate_recipe(
+        self,
+        ingredients: List[str],
+        fitness_goal: str = "maintain",
+        inventory_items: Optional[List[Inventory]] = None,
+        timeout: Optional[float] = None,
+    ) -> dict:
+        """
+        Async version of generate_recipe that does not hold a thread while
+        Gemini responds.
+
+        Raises:
+            TimeoutError: no slot and response within ``timeout`` seconds
+                (default RECIPE_LLM_TIMEOUT_SECONDS)
+            RuntimeError: the model call failed
+        """
+        chain_input = self._chain_input(ingredients, fitness_goal, inventory_items)
+        recipe_data = await self._ainvoke(self.chain, chain_input, timeout)
+        return self._to_dict(recipe_data)
+
+    def generate_recipes(
+        self,
+        ingredients: List[str],
+        fitness_goal: str = "maintain",
+        inventory_items: Optional[List[Inventory]] = None,
+        count: int = 3,
+    ) -> List[dict]:
+        """
+        Generate up to ``count`` distinct recipes in a single GEMINI call.
+
+        Returns:
+            List of recipe dictionaries, at least one and at most ``count``
+
+        Raises:
+            ValueError: ``count`` is outside 1..RECIPE_BATCH_MAX_COUNT
+            RuntimeError: the model call failed or returned no recipe
+        """
+        chain_input = self._batch_input(
+            ingredients, fitness_goal, inventory_items, count
+        )
+        call = usage_tracker.start_call(self.model_name)
+        outcome = "error"
+        try:
+            batch_data = self.resilience.call(
+                lambda: self._invoke(call, self.batch_chain, chain_input),
+                deadline=time.monotonic() + settings.RECIPE_LLM_TIMEOUT_SECONDS,
+            )
+            outcome = "ok"
+        except CircuitOpenError:
+            outcome = "rejected"
+            raise
+        except Exception as e:
+            raise RuntimeError(f"Failed to generate recipes with GEMINI: {e}")
+        finally:
+            usage_tracker.finish_call(call, outcome)
+        return self._batch_to_list(batch_data, count)
+
+    async def agenerate_recipes(
+        self,
+        ingredients: List[str],
+        fitness_goal: str = "maintain",
+        inventory_items: Optional[List[Inventory]] = None,
+        count: int = 3,
+        timeout: Optional[float] = None,
+    ) -> List[dict]:
+        """
+        Async version of generate_recipes. The batch takes one concurrency
+        slot and is bounded by ``timeout`` like agenerate_recipe.
+        """
+        chain_input = self._batch_input(
+            ingredients, fitness_goal, inventory_items, count
+        )
+        batch_data = await self._ainvoke(self.batch_chain, chain_input, timeout)
+        return self._batch_to_list(batch_data, count)
+
+    async def _ainvoke(self, chain, chain_input: dict, timeout: Optional[float]):
+        """Run ``chain`` within a concurrency slot and the timeout, with metrics."""
+        if timeout is None:
+            timeout = settings.RECIPE_LLM_TIMEOUT_SECONDS
+        call = usage_tracker.start_call(self.model_name)
+        deadline = time.monotonic() + timeout
+
+        async def _call():
+            async with self._slots:
+                llm_calls_in_flight.inc()
+                try:
+                    return await self.resilience.acall(
+                        lambda: self._ainvoke_once(call, chain, chain_input),
+                        hedge_slots=self._slots,
+                        deadline=deadline,
+                    )
+                finally:
+                    llm_calls_in_flight.dec()
+
+        started = time.perf_counter()
+        outcome = "error"
+        try:
+            result = await asyncio.wait_for(_call(), timeout)
+            outcome = "ok"
+        except asyncio.TimeoutError as e:
+            outcome = "timeout"
+            # The last attempt's own timeout carries a message; the overall
+            # one does not.
+            message = str(e) or f"Recipe generation timed out after {timeout}s"
+            logger.warning(message)
+            raise TimeoutError(message)
+        except asyncio.CancelledError:
+            outcome = "cancelled"
+            raise
+        except CircuitOpenError:
+            outcome = "rejected"
+            raise
         except Exception as e:
             raise RuntimeError(f"Failed to generate recipe with GEMINI: {e}")
+        finally:
+            llm_call_seconds.observe(time.perf_counter() - started)
+            llm_calls.inc(outcome=outcome)
+            usage_tracker.finish_call(call, outcome)
+        return result
+
+    async def astream_recipe(
+        self,
+        ingredients: List[str],
+        fitness_goal: str = "maintain",
+        inventory_items: Optional[List[Inventory]] = None,
+        timeout: Optional[float] = None,
+    ) -> AsyncIterator[Tuple[str, dict]]:
+        """
+        Stream a recipe as it is generated.
+
+        Yields ``("partial", fields)`` each time more of the answer has been
+        parsed (values may still be incomplete), then one
+        ``("recipe", recipe)`` with the validated result. Shares the
+        concurrency slots of agenerate_recipe; ``timeout`` bounds the whole
+        stream, including the wait for a slot.
+
+        Raises:
+            TimeoutError: the stream did not finish within ``timeout``
+            RuntimeError: the model call failed or returned an invalid recipe
+        """
+        if self.stream_chain is None:
+            raise RuntimeError("Recipe streaming is not configured")
+        if timeout is None:
+            timeout = settings.RECIPE_LLM_TIMEOUT_SECONDS
+        chain_input = self._chain_input(ingredients, fitness_goal, inventory_items)
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout
+
+        def _remaining() -> float:
+            return max(deadline - loop.time(), 0.0)
+
+        call = usage_tracker.start_call(self.model_name)
+        fields = None
+        started = time.perf_counter()
+        outcome = "error"
+        breaker = self.resilience.breaker
+        # Waiting for a slot is local contention, not a Gemini failure.
+        called = False
+        try:
+            breaker.before_call()
+        except CircuitOpenError:
+            llm_calls.inc(outcome="rejected")
+            usage_tracker.finish_call(call, "rejected")
+            raise
+        try:
+            try:
+                await asyncio.wait_for(self._slots.acquire(), _remaining())
+            except asyncio.TimeoutError:
+                outcome = "timeout"
+                raise TimeoutError(f"Recipe generation timed out after {timeout}s")
+            called = True
+            call.attempts = 1
+            llm_calls_in_flight.inc()
+            stream = self.stream_chain.astream(chain_input).__aiter__()
+            try:
+                while True:
+                    try:
+                        partial = await asyncio.wait_for(
+                            stream.__anext__(), _remaining()
+                        )
+                    except StopAsyncIteration:
+                        break
+                    except asyncio.TimeoutError:
+                        outcome = "timeout"
+                        logger.warning(f"Recipe stream timed out after {timeout}s")
+                        raise TimeoutError(
+                            f"Recipe generation timed out after {timeout}s"
+                        )
+                    except Exception as e:
+                        raise RuntimeError(
+                            f"Failed to generate recipe with GEMINI: {e}"
+                        )
+                    if partial and partial != fields:
+                        fields = partial
+                        yield "partial", fields
+            finally:
+                llm_calls_in_flight.dec()
+                self._slots.release()
+                await stream.aclose()
+            try:
+                recipe_data = RecipeSchema.model_validate(fields or {})
+            except Exception as e:
+                raise RuntimeError(f"GEMINI returned an invalid recipe: {e}")
+            outcome = "ok"
+            breaker.record_success()
+        except (asyncio.CancelledError, GeneratorExit):
+            outcome = "cancelled"
+            breaker.abandon()
+            raise
+        except Exception:
+            if called:
+                breaker.record_failure()
+            else:
+                breaker.abandon()
+            raise
+        finally:
+            llm_call_seconds.observe(time.perf_counter() - started)
+            llm_calls.inc(outcome=outcome)
+            if called:
+                # The streamed JSON carries no usage metadata.
+                call.add_tokens(
+                    estimate_tokens(self.prompt_template.format(**chain_input)),
+                    estimate_tokens(json.dumps(fields)) if fields else 0,
+                )
+            usage_tracker.finish_call(call, outcome)
+        yield "recipe", self._to_dict(recipe_data)
+
+
+def build_resilience() -> ResilientCaller:
+    """The retry/hedging/breaker policy for Gemini calls, from settings."""
+    return ResilientCaller(
+        CircuitBreaker(
+            "gemini",
+            failure_threshold=settings.RECIPE_LLM_BREAKER_FAILURES,
+            reset_timeout=settings.RECIPE_LLM_BREAKER_RESET_SECONDS,
+        ),
+        attempts=settings.RECIPE_LLM_RETRIES + 1,
+        call_timeout=settings.RECIPE_LLM_CALL_TIMEOUT_SECONDS,
+        base_delay=settings.RECIPE_LLM_RETRY_BASE_DELAY_SECONDS,
+        hedge_quantile=(
+            settings.RECIPE_LLM_HEDGE_QUANTILE
+            if settings.RECIPE_LLM_HEDGE_ENABLED
+            else None
+        ),
+    )
@@ -0,0 +1,135 @@
+import json
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+
+from app.services.recipe_cache import canonical_ingredient
+from app.utils.logger import get_logger
+
+logger = get_logger("LocalRecipeEngine")
+
+CORPUS_PATH = Path(__file__).with_name("local_recipes.json")
+
+# Calorie shares of protein, carbs and fats each goal aims for.
+GOAL_MACRO_SHARES: Dict[str, Sequence[float]] = {
+    "gain": (0.30, 0.45, 0.25),
+    "lose": (0.40, 0.35, 0.25),
+    "maintain": (0.25, 0.50, 0.25),
+}
+
+# Weight of pantry coverage against macro fit; both are scaled to 0..1.
+COVERAGE_WEIGHT = 0.7
+MACRO_WEIGHT = 0.3
+
+
+class LocalRecipeEngine:
+    """
+    Offline recipe recommender over a bundled corpus, used when Gemini is
+    slow or failing.
+
+    Recipes are rows of a recipe x ingredient incidence matrix over
+    canonical ingredient names. A pantry scores every recipe at once: the
+    share of its ingredients the pantry (plus common staples) covers, and
+    how close its calorie split is to the fitness goal's. Recipes sharing
+    no non-staple ingredient with the pantry are never suggested. Results
+    are deterministic; ties keep corpus order.
+    """
+
+    def __init__(self, corpus_path: Optional[Path] = None):
+        with open(corpus_path or CORPUS_PATH, encoding="utf-8") as f:
+            corpus = json.load(f)
+        self.recipes: List[dict] = corpus["recipes"]
+
+        staples = {canonical_ingredient(name) for name in corpus.get("staples", ())}
+        vocabulary: Dict[str, int] = {}
+        for recipe in self.recipes:
+            for ingredient in recipe["ingredients"]:
+                vocabulary.setdefault(
+                    canonical_ingredient(ingredient["item"]), len(vocabulary)
+                )
+        self.vocabulary = vocabulary
+
+        self._uses = np.zeros((len(self.recipes), len(vocabulary)), dtype=np.float32)
+        for row, recipe in enumerate(self.recipes):
+            for ingredient in recipe["ingredients"]:
+                self._uses[
+                    row, vocabulary[canonical_ingredient(ingredient["item"])]
+                ] = 1
+        self._staples = np.zeros(len(vocabulary), dtype=np.float32)
+        for name in staples & vocabulary.keys():
+            self._staples[vocabulary[name]] = 1
+        self._sizes = self._uses.sum(axis=1)
+
+        macros = np.array(
+            [[r["protein"], r["carbs"], r["fats"]] for r in self.recipes],
+            dtype=np.float32,
+        )
+        energy = macros * np.array([4, 4, 9], dtype=np.float32)
+        self._shares = energy / np.maximum(energy.sum(axis=1, keepdims=True), 1)
+        logger.info(
+            f"Local recipe corpus loaded: {len(self.recipes)} recipes, "
+            f"{len(vocabulary)} ingredients"
+        )
+
+    def _pantry_vector(self, ingredients: List[str]) -> np.ndarray:
+        """
+        Mark the corpus ingredients the pantry holds. A pantry name also
+        covers its trailing words ("Brown Rice" covers "rice").
+        """
+        pantry = np.zeros(len(self.vocabulary), dtype=np.float32)
+        for name in ingredients:
+            words = canonical_ingredient(name).split()
+            for start in range(len(words)):
+                column = self.vocabulary.get(" ".join(words[start:]))
+                if column is not None:
+                    pantry[column] = 1
+        return pantry
+
+    def scores(self, ingredients: List[str], fitness_goal: str) -> np.ndarray:
+        """Score of every corpus recipe for the pantry; -inf when unusable."""
+        pantry = self._pantry_vector(ingredients)
+        matched = self._uses @ (pantry * (1 - self._staples))
+        covered = self._uses @ np.maximum(pantry, self._staples)
+        coverage = covered / np.maximum(self._sizes, 1)
+
+        target = np.asarray(
+            GOAL_MACRO_SHARES.get(fitness_goal, GOAL_MACRO_SHARES["maintain"]),
+            dtype=np.float32,
+        )
+        macro_fit = 1 - np.abs(self._shares - target).sum(axis=1) / 2
+
+        scores = COVERAGE_WEIGHT * coverage + MACRO_WEIGHT * macro_fit
+        return np.where(matched > 0, scores, -np.inf)
+
+    def recommend(
+        self, ingredients: List[str], fitness_goal: str = "maintain", count: int = 1
+    ) -> List[dict]:
+        """
+        Up to ``count`` best recipes for the pantry, shaped like generated
+        ones; empty when nothing in the corpus uses the pantry. Amounts are
+        given at the start of the directions.
+        """
+        scores = self.scores(ingredients, fitness_goal)
+        order = np.argsort(-scores, kind="stable")[:count]
+        return [self._recipe(int(row)) for row in order if np.isfinite(scores[row])]
+
+    def _recipe(self, row: int) -> dict:
+        recipe = self.recipes[row]
+        return {
+            "title": recipe["title"],
+            "calories": recipe["calories"],
+            "protein": recipe["protein"],
+            "carbs": recipe["carbs"],
+            "fats": recipe["fats"],
+            "ingredients": [ingredient["item"] for ingredient in recipe["ingredients"]],
+            "directions": self._directions(recipe),
+        }
+
+    @staticmethod
+    def _directions(recipe: dict) -> str:
+        amounts = ", ".join(
+            f"{ingredient['amount']} {ingredient['item']}"
+            for ingredient in recipe["ingredients"]
+        )
+        return f"You will need {amounts}. {recipe['directions']}"
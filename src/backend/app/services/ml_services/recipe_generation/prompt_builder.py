@@ -0,0 +1,139 @@
+import math
+from datetime import date
+from typing import List, NamedTuple, Optional, Sequence
+
+from app.models.inventory import Inventory
+from app.services.recipe_cache import canonical_ingredient
+
+# Gemini averages about four characters of English per token; close enough
+# to budget the prompt without a tokenizer round trip.
+CHARS_PER_TOKEN = 4
+
+# Relative weight of each ranking signal; each signal is scaled to 0..1.
+EXPIRY_WEIGHT = 2.0
+MACRO_WEIGHT = 1.0
+QUANTITY_WEIGHT = 0.5
+
+# Calories per serving treated as "dense" when scoring macro fit.
+DENSE_CALORIES = 400.0
+
+
+def estimate_tokens(text: str) -> int:
+    return math.ceil(len(text) / CHARS_PER_TOKEN)
+
+
+class PantryPrompt(NamedTuple):
+    text: str
+    listed: int
+    dropped: int
+
+
+def _expiry_urgency(item: Inventory, today: date) -> float:
+    """1.0 for items expiring today (or already past), falling with days left."""
+    if item.expiry_date is None:
+        return 0.0
+    return 1.0 / (1 + max((item.expiry_date - today).days, 0))
+
+
+def _macro_fit(item: Inventory, fitness_goal: str) -> float:
+    """
+    How well one serving suits the goal: protein-rich and calorie-dense for
+    "gain", protein-rich and light for "lose", balanced for "maintain".
+    Items without nutrition data score a neutral 0.5.
+    """
+    protein = item.protein_g_per_serving or 0.0
+    carbs = item.carbs_g_per_serving or 0.0
+    fats = item.fats_g_per_serving or 0.0
+    energy = 4 * protein + 4 * carbs + 9 * fats
+    if energy <= 0:
+        return 0.5
+    protein_share = 4 * protein / energy
+    density = min((item.calories_per_serving or energy) / DENSE_CALORIES, 1.0)
+    if fitness_goal == "gain":
+        return (protein_share + density) / 2
+    if fitness_goal == "lose":
+        return (protein_share + 1 - density) / 2
+    return 1 - abs(protein_share - 0.3)
+
+
+def _quantity_weight(item: Inventory) -> float:
+    return item.quantity / (item.quantity + 1)
+
+
+def rank_items(
+    inventory_items: Sequence[Inventory],
+    fitness_goal: str,
+    today: Optional[date] = None,
+) -> List[Inventory]:
+    """
+    Available items, most useful first: those about to expire, those whose
+    macros suit ``fitness_goal``, then those there is plenty of. Ties keep
+    inventory order.
+    """
+    today = today or date.today()
+
+    def score(item: Inventory) -> float:
+        return (
+            EXPIRY_WEIGHT * _expiry_urgency(item, today)
+            + MACRO_WEIGHT * _macro_fit(item, fitness_goal)
+            + QUANTITY_WEIGHT * _quantity_weight(item)
+        )
+
+    available = [item for item in inventory_items if item.quantity > 0]
+    return sorted(available, key=score, reverse=True)
+
+
+def describe_item(item: Inventory) -> str:
+    details = f"- {item.name}: {item.quantity} {item.serving_size_unit or 'units'}"
+    if item.calories_per_serving is not None:
+        details += f", {item.calories_per_serving} calories per serving"
+    if item.protein_g_per_serving is not None:
+        details += f", {item.protein_g_per_serving}g protein"
+    if item.carbs_g_per_serving is not None:
+        details += f", {item.carbs_g_per_serving}g carbs"
+    if item.fats_g_per_serving is not None:
+        details += f", {item.fats_g_per_serving}g fats"
+    if item.expiry_date is not None:
+        details += f", use by {item.expiry_date.isoformat()}"
+    return details
+
+
+def build_pantry(
+    ingredients: List[str],
+    fitness_goal: str,
+    inventory_items: Optional[Sequence[Inventory]],
+    token_budget: int,
+    today: Optional[date] = None,
+) -> PantryPrompt:
+    """
+    The pantry section of the prompt: one line per distinct ingredient
+    (canonical name) with its quantity and nutrition, best ranked first,
+    until ``token_budget`` is spent. The first entry is always listed.
+    Without inventory details the plain ``ingredients`` names are listed.
+    """
+    if inventory_items:
+        entries = [
+            (item.name, describe_item(item))
+            for item in rank_items(inventory_items, fitness_goal, today)
+        ]
+        separator = "\n"
+    else:
+        entries = [(name, name) for name in ingredients]
+        separator = ", "
+
+    seen = set()
+    lines = []
+    dropped = 0
+    tokens = 0
+    for name, line in entries:
+        key = canonical_ingredient(name)
+        if key in seen:
+            continue
+        seen.add(key)
+        cost = estimate_tokens(line + separator)
+        if lines and tokens + cost > token_budget:
+            dropped += 1
+            continue
+        lines.append(line)
+        tokens += cost
+    return PantryPrompt(separator.join(lines), len(lines), dropped)
@@ -0,0 +1,206 @@
+import uuid
+from dataclasses import dataclass
+from datetime import date, datetime, timezone
+from typing import TYPE_CHECKING, Dict, Optional, Sequence, Union
+
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+from app.enums import ActivityLevelEnum, FitnessGoalEnum, SexEnum
+from app.models.consumption_log import ConsumptionLog
+from app.models.user import User
+from app.schemas.user import User as UserSchema
+from app.utils.cache import LRUCache
+from app.utils.timezones import local_date, utc_day_bounds
+
+if TYPE_CHECKING:
+    import numpy as np
+
+# User columns that feed into the targets; changing any of them invalidates
+# the cached value.
+TARGET_FIELDS = frozenset(
+    {"height", "weight", "age", "sex", "activity_level", "fitness_goal"}
+)
+
+# Mifflin-St Jeor sex constant; "other" uses the midpoint of male/female.
+SEX_CONSTANTS = {
+    SexEnum.male: 5.0,
+    SexEnum.female: -161.0,
+    SexEnum.other: -78.0,
+}
+ACTIVITY_MULTIPLIERS = {
+    ActivityLevelEnum.sedentary: 1.2,
+    ActivityLevelEnum.light: 1.375,
+    ActivityLevelEnum.moderate: 1.55,
+    ActivityLevelEnum.active: 1.725,
+    ActivityLevelEnum.very_active: 1.9,
+}
+# Daily calorie adjustment relative to TDEE.
+GOAL_ADJUSTMENTS = {
+    FitnessGoalEnum.lose: -500.0,
+    FitnessGoalEnum.maintain: 0.0,
+    FitnessGoalEnum.gain: 300.0,
+}
+# Protein target in grams per kg of body weight.
+PROTEIN_G_PER_KG = {
+    FitnessGoalEnum.lose: 2.0,
+    FitnessGoalEnum.maintain: 1.6,
+    FitnessGoalEnum.gain: 1.8,
+}
+FAT_CALORIE_SHARE = 0.25
+DEFAULT_ACTIVITY = ActivityLevelEnum.sedentary
+DEFAULT_GOAL = FitnessGoalEnum.maintain
+
+# invalidate_targets only reaches the process that handled the update, so
+# entries also expire; other workers pick up profile changes within the TTL.
+TARGETS_CACHE_TTL_SECONDS = 300
+
+_targets_cache = LRUCache(maxsize=10000, ttl=TARGETS_CACHE_TTL_SECONDS)
+
+
+@dataclass(frozen=True)
+class NutritionTargets:
+    bmr: float
+    tdee: float
+    calories: float
+    protein_g: float
+    carbs_g: float
+    fats_g: float
+
+
+def calculate_bmr(weight: float, height: float, age: int, sex: SexEnum) -> float:
+    """Mifflin-St Jeor basal metabolic rate (kcal/day)."""
+    return 10 * weight + 6.25 * height - 5 * age + SEX_CONSTANTS[sex]
+
+
+def calculate_targets(user: Union[User, UserSchema]) -> Optional[NutritionTargets]:
+    """
+    Compute daily targets for a user, or None if the profile is incomplete.
+    Accepts a User row or the snapshot returned by get_current_user.
+    """
+    if not (user.height and user.weight and user.age and user.sex):
+        return None
+    activity = user.activity_level or DEFAULT_ACTIVITY
+    goal = user.fitness_goal or DEFAULT_GOAL
+
+    bmr = calculate_bmr(user.weight, user.height, user.age, user.sex)
+    tdee = bmr * ACTIVITY_MULTIPLIERS[activity]
+    calories = tdee + GOAL_ADJUSTMENTS[goal]
+    protein_g = user.weight * PROTEIN_G_PER_KG[goal]
+    fats_g = calories * FAT_CALORIE_SHARE / 9
+    carbs_g = max(calories - protein_g * 4 - fats_g * 9, 0.0) / 4
+    return NutritionTargets(
+        bmr=bmr,
+        tdee=tdee,
+        calories=calories,
+        protein_g=protein_g,
+        carbs_g=carbs_g,
+        fats_g=fats_g,
+    )
+
+
+def get_targets(user: Union[User, UserSchema]) -> Optional[NutritionTargets]:
+    """
+    Cached variant of calculate_targets, keyed by user id.
+    Entries are dropped by invalidate_targets when the profile changes.
+    """
+    targets = _targets_cache.get(user.id)
+    if targets is None:
+        targets = calculate_targets(user)
+        if targets is not None:
+            _targets_cache.set(user.id, targets)
+    return targets
+
+
+def invalidate_targets(user_id: uuid.UUID) -> None:
+    _targets_cache.pop(user_id)
+
+
+def calculate_targets_bulk(
+    heights: Sequence[Optional[float]],
+    weights: Sequence[Optional[float]],
+    ages: Sequence[Optional[int]],
+    sexes: Sequence[Optional[SexEnum]],
+    activity_levels: Sequence[Optional[ActivityLevelEnum]],
+    fitness_goals: Sequence[Optional[FitnessGoalEnum]],
+) -> Dict[str, "np.ndarray"]:
+    """
+    Vectorized calculate_targets for many users at once.
+
+    Takes parallel per-user sequences and returns a dict of float arrays keyed
+    like NutritionTargets' fields. Users with an incomplete profile get NaN.
+    """
+    import numpy as np
+
+    def _numeric(values):
+        return np.array(
+            [np.nan if not v else float(v) for v in values], dtype=np.float64
+        )
+
+    def _lookup(values, table, default):
+        return np.array(
+            [table.get(v or default, np.nan) for v in values], dtype=np.float64
+        )
+
+    height = _numeric(heights)
+    weight = _numeric(weights)
+    age = _numeric(ages)
+    sex = np.array(
+        [SEX_CONSTANTS.get(s, np.nan) if s else np.nan for s in sexes],
+        dtype=np.float64,
+    )
+    multiplier = _lookup(activity_levels, ACTIVITY_MULTIPLIERS, DEFAULT_ACTIVITY)
+    adjustment = _lookup(fitness_goals, GOAL_ADJUSTMENTS, DEFAULT_GOAL)
+    protein_per_kg = _lookup(fitness_goals, PROTEIN_G_PER_KG, DEFAULT_GOAL)
+
+    bmr = 10 * weight + 6.25 * height - 5 * age + sex
+    tdee = bmr * multiplier
+    calories = tdee + adjustment
+    protein_g = weight * protein_per_kg
+    fats_g = calories * FAT_CALORIE_SHARE / 9
+    carbs_g = np.maximum(calories - protein_g * 4 - fats_g * 9, 0.0) / 4
+    return {
+        "bmr": bmr,
+        "tdee": tdee,
+        "calories": calories,
+        "protein_g": protein_g,
+        "carbs_g": carbs_g,
+        "fats_g": fats_g,
+    }
+
+
+@dataclass(frozen=True)
+class DailySummary:
+    day: date
+    targets: Optional[NutritionTargets]
+    calories: float
+    protein_g: float
+    carbs_g: float
+    fats_g: float
+
+
+def get_daily_summary(
+    db: Session, user: Union[User, UserSchema], now: Optional[datetime] = None
+) -> DailySummary:
+    """
+    Daily tracker: the user's intake so far on their local calendar day next
+    to their (cached) targets.
+    """
+    now = now or datetime.now(timezone.utc)
+    day = local_date(now, user.timezone)
+    start, end = utc_day_bounds(day, user.timezone)
+    totals = (
+        db.query(
+            func.coalesce(func.sum(ConsumptionLog.calories_consumed), 0.0),
+            func.coalesce(func.sum(ConsumptionLog.protein_consumed_g), 0.0),
+            func.coalesce(func.sum(ConsumptionLog.carbs_consumed_g), 0.0),
+            func.coalesce(func.sum(ConsumptionLog.fats_consumed_g), 0.0),
+        )
+        .filter(
+            ConsumptionLog.user_id == user.id,
+            ConsumptionLog.consumed_at >= start,
+            ConsumptionLog.consumed_at < end,
+        )
+        .one()
+    )
+    return DailySummary(day, get_targets(user), *(float(value) for value in totals))
@@ -0,0 +1,161 @@
+import re
+import threading
+from dataclasses import dataclass
+from typing import Dict, FrozenSet, Iterable, Optional, Sequence, Tuple
+
+from app.core.config import settings
+from app.models.inventory import Inventory
+from app.utils.cache import LRUCache
+from app.utils.metrics import metrics
+
+cache_lookups = metrics.counter(
+    "recipe_cache_lookups_total",
+    "Recipe cache lookups by result (exact, similar, miss)",
+)
+llm_calls_avoided = metrics.counter(
+    "recipe_llm_calls_avoided_total", "Recipe LLM calls answered from the cache"
+)
+
+# Calorie shares of protein/carbs/fats are rounded to this step, so pantries
+# with roughly the same macro balance share entries.
+MACRO_SHARE_STEP = 0.1
+
+Macros = Optional[Tuple[float, float, float]]
+
+
+def canonical_ingredient(name: str) -> str:
+    """
+    Normalise an ingredient name for cache keys: lower case, punctuation
+    dropped, whitespace collapsed and a trailing plural removed
+    ("Cherry Tomatoes" -> "cherry tomato").
+    """
+    words = re.sub(r"[^a-z0-9 ]+", " ", name.lower()).split()
+    if not words:
+        return ""
+    last = words[-1]
+    if len(last) > 4 and last.endswith("ies"):
+        last = last[:-3] + "y"
+    elif len(last) > 4 and last.endswith("oes"):
+        last = last[:-2]
+    elif len(last) > 3 and last.endswith("s") and not last.endswith(("ss", "us", "is")):
+        last = last[:-1]
+    return " ".join(words[:-1] + [last])
+
+
+def macro_profile(inventory_items: Optional[Sequence[Inventory]]) -> Macros:
+    """
+    Calorie shares of protein, carbs and fats across the available items
+    (weighted by quantity), rounded to MACRO_SHARE_STEP; None without
+    nutrition data.
+    """
+    protein = carbs = fats = 0.0
+    for item in inventory_items or ():
+        if item.quantity <= 0:
+            continue
+        protein += (item.protein_g_per_serving or 0.0) * item.quantity
+        carbs += (item.carbs_g_per_serving or 0.0) * item.quantity
+        fats += (item.fats_g_per_serving or 0.0) * item.quantity
+    energy = 4 * protein + 4 * carbs + 9 * fats
+    if energy <= 0:
+        return None
+    return tuple(
+        round(round(kcal / energy / MACRO_SHARE_STEP) * MACRO_SHARE_STEP, 2)
+        for kcal in (4 * protein, 4 * carbs, 9 * fats)
+    )
+
+
+@dataclass(frozen=True)
+class RecipeCacheKey:
+    ingredients: FrozenSet[str]
+    fitness_goal: str
+    macros: Macros
+
+    @classmethod
+    def build(
+        cls,
+        ingredients: Iterable[str],
+        fitness_goal: str,
+        inventory_items: Optional[Sequence[Inventory]] = None,
+    ) -> "RecipeCacheKey":
+        names = frozenset(filter(None, map(canonical_ingredient, ingredients)))
+        return cls(names, fitness_goal, macro_profile(inventory_items))
+
+
+def jaccard(a: FrozenSet[str], b: FrozenSet[str]) -> float:
+    if not a and not b:
+        return 1.0
+    return len(a & b) / len(a | b)
+
+
+class RecipeCache:
+    """
+    Generated recipes keyed on the canonical ingredient set, fitness goal and
+    rounded macro profile of the pantry they were generated for.
+
+    ``get`` first tries the exact key, then (unless
+    RECIPE_CACHE_SIMILARITY_THRESHOLD is 1) the entry with the same goal and
+    macro profile whose ingredient set is most similar by Jaccard index, if
+    that similarity reaches the threshold. Entries are evicted LRU beyond
+    ``maxsize`` and expire after ``ttl`` seconds. Stored recipes are the raw
+    generator output; callers still match ingredient names against the
+    requesting pantry. Per process.
+    """
+
+    def __init__(self, maxsize: int, ttl: Optional[float]):
+        self._entries = LRUCache(maxsize=maxsize, ttl=ttl)
+        # (goal, macros) -> keys that may still be in _entries, for the
+        # similarity scan; evicted keys are dropped lazily.
+        self._groups: Dict[Tuple[str, Macros], Dict[RecipeCacheKey, None]] = {}
+        self._lock = threading.Lock()
+
+    def _nearest(self, key: RecipeCacheKey, threshold: float) -> Optional[dict]:
+        with self._lock:
+            group = self._groups.get((key.fitness_goal, key.macros), {})
+            candidates = list(group)
+        best, best_score = None, threshold
+        for candidate in candidates:
+            recipe = self._entries.get(candidate)
+            if recipe is None:
+                with self._lock:
+                    group.pop(candidate, None)
+                continue
+            score = jaccard(key.ingredients, candidate.ingredients)
+            if score >= best_score:
+                best, best_score = recipe, score
+        return best
+
+    def get(self, key: RecipeCacheKey) -> Optional[dict]:
+        if not settings.RECIPE_CACHE_ENABLED:
+            return None
+        recipe = self._entries.get(key)
+        result = "exact"
+        if recipe is None and settings.RECIPE_CACHE_SIMILARITY_THRESHOLD < 1:
+            recipe = self._nearest(key, settings.RECIPE_CACHE_SIMILARITY_THRESHOLD)
+            result = "similar"
+        if recipe is None:
+            cache_lookups.inc(result="miss")
+            return None
+        cache_lookups.inc(result=result)
+        llm_calls_avoided.inc()
+        return recipe
+
+    def set(self, key: RecipeCacheKey, recipe: dict) -> None:
+        if not settings.RECIPE_CACHE_ENABLED:
+            return
+        self._entries.set(key, recipe)
+        with self._lock:
+            group = self._groups.setdefault((key.fitness_goal, key.macros), {})
+            group[key] = None
+            if len(group) > self._entries.maxsize:
+                for stale in [k for k in group if k not in self._entries]:
+                    del group[stale]
+
+    def clear(self) -> None:
+        self._entries.clear()
+        with self._lock:
+            self._groups.clear()
+
+
+recipe_cache = RecipeCache(
+    maxsize=settings.RECIPE_CACHE_MAX_SIZE, ttl=settings.RECIPE_CACHE_TTL_SECONDS
+)
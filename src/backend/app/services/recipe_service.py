@@ -1,21 +1,95 @@
+import asyncio
+import hashlib
+import math
 import re
-from sqlalchemy.orm import Session
-from app.services.ml_services.recipe_generation.gemini_recipe_generator import (
-    GeminiRecipeGenerator,
+from datetime import datetime
+from typing import (
+    Any,
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    List,
+    NamedTuple,
+    Optional,
+    Tuple,
 )
+from sqlalchemy import delete, func, select, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
 from app.models.inventory import Inventory
 from app.models.user import User
 from app.models.generated_recipe import GeneratedRecipe
+from app.services.ingredient_matcher import matcher_for
+from app.services.llm_usage import (
+    QuotaExceededError,
+    llm_usage_scope,
+    usage_tracker,
+)
+from app.services.locator import locator
+from app.services.recipe_cache import (
+    RecipeCacheKey,
+    canonical_ingredient,
+    recipe_cache,
+)
+from app.core.config import settings
+from app.utils.logger import get_logger
+from app.utils.metrics import metrics
+from app.utils.pagination import decode_cursor, encode_cursor
+from app.utils.resilience import CircuitOpenError
 from fastapi import HTTPException
 import uuid
 
+logger = get_logger("RecipeService")
+
+suggestions_served = metrics.counter(
+    "recipe_suggestions_served_total",
+    "generate-from-inventory requests answered with a pre-generated recipe",
+)
+local_fallbacks = metrics.counter(
+    "recipe_local_fallbacks_total",
+    "Recipe requests answered from the local corpus, by reason (error, deadline)",
+)
+
+
+def inventory_fingerprint(ingredients: List[str], fitness_goal: str) -> str:
+    """
+    Identify a pantry by its available ingredients (canonical names, in any
+    order) and the fitness goal. Quantity changes that leave an ingredient
+    available do not change it.
+    """
+    names = sorted({canonical_ingredient(name) for name in ingredients} - {""})
+    return hashlib.sha256("\n".join([fitness_goal, *names]).encode()).hexdigest()
+
+
+class Pantry(NamedTuple):
+    inventory_items: List[Inventory]
+    ingredients: List[str]
+    fitness_goal: str
+
+    @property
+    def fingerprint(self) -> str:
+        return inventory_fingerprint(self.ingredients, self.fitness_goal)
+
 
 class RecipeService:
-    def __init__(self):
-        try:
-            self.recipe_generator = GeminiRecipeGenerator()
-        except RuntimeError as e:
-            raise HTTPException(status_code=500, detail=str(e))
+    def __init__(self, recipe_generator=None):
+        self._recipe_generator = recipe_generator
+
+    @property
+    def recipe_generator(self):
+        """
+        The process-wide GeminiRecipeGenerator, built on first use.
+
+        LangChain/Gemini take over a second to import and the client is
+        expensive to create, so read-only calls never touch it and
+        generating calls share one instance through the service locator.
+        """
+        if self._recipe_generator is None:
+            try:
+                self._recipe_generator = locator.get("recipe_generator")
+            except RuntimeError as e:
+                raise HTTPException(status_code=500, detail=str(e))
+        return self._recipe_generator
 
     def _clean_repetitive_text(self, text: str) -> str:
         """
@@ -46,76 +120,13 @@ class RecipeService:
     ) -> list[str]:
         """
         Match generated ingredients with inventory ingredients to ensure exact names.
-        This function tries to find the closest match from inventory ingredients
-        for each generated ingredient.
-        """
-        matched_ingredients = []
-
-        # Convert inventory ingredients to lowercase for comparison
-        inventory_lower = [item.lower() for item in inventory_ingredients]
-
-        for gen_ing in generated_ingredients:
-            # Clean the generated ingredient
-            gen_ing_clean = re.sub(r"^\s*[\d\.\)\-\*]+\s*", "", gen_ing).strip()
-            # Remove common measurements and descriptors
-            gen_ing_clean = re.sub(
-                r"\d+\s*(grams?|cups?|tbsp|tsp|ounces?|oz|lbs?|pounds?|slices?|pieces?|cloves?|inch(es)?|cubes?|chunks?)",
-                "",
-                gen_ing_clean,
-                flags=re.IGNORECASE,
-            )
-            gen_ing_clean = re.sub(
-                r"\(.*?\)", "", gen_ing_clean
-            )  # Remove anything in parentheses
-            gen_ing_clean = gen_ing_clean.strip()
-
-            # Convert to lowercase for comparison
-            gen_ing_lower = gen_ing_clean.lower()
-
-            # Try to find an exact match first
-            matched = False
-            for i, inv_ing in enumerate(inventory_lower):
-                if inv_ing in gen_ing_lower or gen_ing_lower in inv_ing:
-                    matched_ingredients.append(inventory_ingredients[i])
-                    matched = True
-                    break
-
-            # If no exact match, add the cleaned ingredient
-            if not matched:
-                # Try to find a partial match
-                for i, inv_ing in enumerate(inventory_lower):
-                    if inv_ing in gen_ing_lower or gen_ing_lower in inv_ing:
-                        matched_ingredients.append(inventory_ingredients[i])
-                        matched = True
-                        break
-
-                # If still no match, add the original generated ingredient
-                if not matched:
-                    matched_ingredients.append(gen_ing_clean)
-
-        # Remove duplicates while preserving order
-        seen = set()
-        unique_ingredients = []
-        for item in matched_ingredients:
-            if item not in seen:
-                seen.add(item)
-                unique_ingredients.append(item)
-
-        return unique_ingredients
-
-    def get_recipes_by_ingredients(
-        self,
-        ingredients: list[str],
-        fitness_goal: str = "maintain",
-        inventory_items: list[Inventory] = None,
-    ) -> dict:
-        try:
-            recipe_data = self.recipe_generator.generate_recipe(
-                ingredients, fitness_goal, inventory_items
-            )
-        except RuntimeError as e:
-            raise HTTPException(status_code=500, detail=str(e))
+        Each generated line maps to the first inventory name it contains or
+        that contains it, else to a close spelling, else stays as written;
+        see IngredientMatcher.
+        """
+        return matcher_for(inventory_ingredients).match_all(generated_ingredients)
 
+    def _finalize_recipe(self, recipe_data: dict, ingredients: list[str]) -> dict:
         # Extract data from the dictionary
         title = recipe_data["title"]
         calories = recipe_data["calories"]
@@ -143,6 +154,124 @@ class RecipeService:
             "directions": directions,
         }
 
+    def get_recipes_by_ingredients(
+        self,
+        ingredients: list[str],
+        fitness_goal: str = "maintain",
+        inventory_items: list[Inventory] = None,
+    ) -> dict:
+        cache_key = RecipeCacheKey.build(ingredients, fitness_goal, inventory_items)
+        recipe_data = recipe_cache.get(cache_key)
+        if recipe_data is None:
+            try:
+                recipe_data = self.recipe_generator.generate_recipe(
+                    ingredients, fitness_goal, inventory_items
+                )
+            except QuotaExceededError as e:
+                raise self._llm_http_error(e)
+            except (HTTPException, RuntimeError) as e:
+                local = self._local_recipes(ingredients, fitness_goal, 1)
+                if local is None:
+                    raise self._llm_http_error(e)
+                local_fallbacks.inc(reason="error")
+                logger.warning(f"Recipe LLM failed, using local recipe: {e}")
+                return self._finalize_recipe(local[0], ingredients)
+            recipe_cache.set(cache_key, recipe_data)
+        else:
+            usage_tracker.record_cache_hit("recipe_cache")
+
+        return self._finalize_recipe(recipe_data, ingredients)
+
+    async def async_get_recipes_by_ingredients(
+        self,
+        ingredients: list[str],
+        fitness_goal: str = "maintain",
+        inventory_items: list[Inventory] = None,
+    ) -> dict:
+        cache_key = RecipeCacheKey.build(ingredients, fitness_goal, inventory_items)
+        recipe_data = recipe_cache.get(cache_key)
+        if recipe_data is None:
+
+            async def generate():
+                return await self.recipe_generator.agenerate_recipe(
+                    ingredients, fitness_goal, inventory_items
+                )
+
+            def local():
+                recipes = self._local_recipes(ingredients, fitness_goal, 1)
+                return recipes[0] if recipes else None
+
+            try:
+                recipe_data, generated = await self._race_local(generate(), local)
+            except (TimeoutError, RuntimeError) as e:
+                raise self._llm_http_error(e)
+            if generated:
+                recipe_cache.set(cache_key, recipe_data)
+        else:
+            usage_tracker.record_cache_hit("recipe_cache")
+
+        return self._finalize_recipe(recipe_data, ingredients)
+
+    def _local_recipes(
+        self, ingredients: List[str], fitness_goal: str, count: int
+    ) -> Optional[List[dict]]:
+        """Best recipes from the bundled corpus; None if disabled or no match."""
+        if not settings.RECIPE_LOCAL_FALLBACK_ENABLED:
+            return None
+        try:
+            engine = locator.get("local_recipe_engine")
+        except Exception as e:
+            logger.error(f"Local recipe engine unavailable: {e}")
+            return None
+        return engine.recommend(ingredients, fitness_goal, count) or None
+
+    async def _race_local(
+        self, generating: Awaitable, local: Callable[[], Any]
+    ) -> Tuple[Any, bool]:
+        """
+        Await the LLM call ``generating``, answering with ``local()`` instead
+        if the call fails or has not finished within
+        RECIPE_LOCAL_FALLBACK_DEADLINE_SECONDS (the call is then cancelled).
+        Without a local answer the LLM's result or error stands, and an
+        exhausted quota is never answered locally. Returns the result and
+        whether it came from the LLM.
+        """
+        if not settings.RECIPE_LOCAL_FALLBACK_ENABLED:
+            return await generating, True
+        task = asyncio.ensure_future(generating)
+        try:
+            done, _ = await asyncio.wait(
+                {task}, timeout=settings.RECIPE_LOCAL_FALLBACK_DEADLINE_SECONDS
+            )
+        except asyncio.CancelledError:
+            task.cancel()
+            raise
+
+        if task in done:
+            try:
+                return task.result(), True
+            except QuotaExceededError:
+                raise
+            except (HTTPException, RuntimeError, TimeoutError) as e:
+                fallback = local()
+                if fallback is None:
+                    raise
+                local_fallbacks.inc(reason="error")
+                logger.warning(f"Recipe LLM failed, using local recipes: {e}")
+                return fallback, False
+
+        fallback = local()
+        if fallback is None:
+            return await task, True
+        task.cancel()
+        local_fallbacks.inc(reason="deadline")
+        logger.warning(
+            "Recipe LLM missed the "
+            f"{settings.RECIPE_LOCAL_FALLBACK_DEADLINE_SECONDS}s deadline, "
+            "using local recipes"
+        )
+        return fallback, False
+
     def generate_recipe_from_inventory(self, db: Session, user_id: uuid.UUID) -> dict:
         # Fetch inventory items for the user
         inventory_items = db.query(Inventory).filter(Inventory.user_id == user_id).all()
@@ -160,16 +289,14 @@ class RecipeService:
         )
 
         # Generate recipe using the existing method
-        recipe_data = self.get_recipes_by_ingredients(
-            ingredients, fitness_goal, inventory_items
-        )
+        with llm_usage_scope(user_id, "generate"):
+            recipe_data = self.get_recipes_by_ingredients(
+                ingredients, fitness_goal, inventory_items
+            )
 
         # Save the generated recipe to the database
-        generated_recipe = GeneratedRecipe(
-            user_id=user_id,
-            title=recipe_data["title"],
-            ingredients=recipe_data["ingredients"],
-            directions=recipe_data["directions"],
+        generated_recipe = self._recipe_row(
+            user_id, recipe_data, inventory_fingerprint(ingredients, fitness_goal)
         )
         db.add(generated_recipe)
         db.commit()
@@ -177,9 +304,351 @@ class RecipeService:
 
         return recipe_data
 
+    async def async_load_pantry(self, db: AsyncSession, user_id: uuid.UUID) -> Pantry:
+        """
+        Read what generation needs from the database, then end the read
+        transaction so the pooled connection is not held for the seconds the
+        LLM takes; the detached rows keep their values.
+        """
+        inventory_items = (
+            await db.scalars(select(Inventory).filter(Inventory.user_id == user_id))
+        ).all()
+        ingredients = [item.name for item in inventory_items if item.quantity > 0]
+
+        if not ingredients:
+            raise HTTPException(
+                status_code=400, detail="No ingredients available in inventory"
+            )
+
+        user = await db.get(User, user_id)
+        fitness_goal = (
+            user.fitness_goal.value if user and user.fitness_goal else "maintain"
+        )
+
+        db.expunge_all()
+        await db.rollback()
+        return Pantry(inventory_items, ingredients, fitness_goal)
+
+    @staticmethod
+    def _recipe_row(
+        user_id: uuid.UUID,
+        recipe_data: dict,
+        fingerprint: Optional[str] = None,
+        suggested: bool = False,
+    ) -> GeneratedRecipe:
+        return GeneratedRecipe(
+            user_id=user_id,
+            title=recipe_data["title"],
+            ingredients=recipe_data["ingredients"],
+            directions=recipe_data["directions"],
+            calories=recipe_data.get("calories"),
+            protein=recipe_data.get("protein"),
+            carbs=recipe_data.get("carbs"),
+            fats=recipe_data.get("fats"),
+            inventory_fingerprint=fingerprint,
+            suggested=suggested,
+        )
+
+    @staticmethod
+    def _recipe_from_row(row: GeneratedRecipe) -> dict:
+        return {
+            "title": row.title,
+            "calories": row.calories,
+            "protein": row.protein,
+            "carbs": row.carbs,
+            "fats": row.fats,
+            "ingredients": row.ingredients,
+            "directions": row.directions,
+        }
+
+    async def _async_save_recipes(
+        self, db: AsyncSession, user_id: uuid.UUID, recipes: List[dict], pantry: Pantry
+    ) -> None:
+        db.add_all(
+            self._recipe_row(user_id, recipe_data, pantry.fingerprint)
+            for recipe_data in recipes
+        )
+        await db.commit()
+
+    async def async_take_suggestion(
+        self, db: AsyncSession, user_id: uuid.UUID, fingerprint: str
+    ) -> Optional[dict]:
+        """
+        Serve one pre-generated recipe for the pantry ``fingerprint``, moving
+        it into the user's history; None if there is none. Concurrent
+        requests never get the same row.
+        """
+        row = (
+            await db.scalars(
+                select(GeneratedRecipe)
+                .filter(
+                    GeneratedRecipe.user_id == user_id,
+                    GeneratedRecipe.suggested.is_(True),
+                    GeneratedRecipe.inventory_fingerprint == fingerprint,
+                )
+                .limit(1)
+                .with_for_update(skip_locked=True)
+            )
+        ).first()
+        if row is None:
+            await db.rollback()
+            return None
+        row.suggested = False
+        row.created_at = datetime.utcnow()
+        await db.commit()
+        suggestions_served.inc()
+        usage_tracker.record_cache_hit("suggestion")
+        return self._recipe_from_row(row)
+
+    async def async_count_suggestions(
+        self, db: AsyncSession, user_id: uuid.UUID, fingerprint: str
+    ) -> int:
+        count = await db.scalar(
+            select(func.count())
+            .select_from(GeneratedRecipe)
+            .filter(
+                GeneratedRecipe.user_id == user_id,
+                GeneratedRecipe.suggested.is_(True),
+                GeneratedRecipe.inventory_fingerprint == fingerprint,
+            )
+        )
+        await db.rollback()
+        return count
+
+    async def async_store_suggestions(
+        self,
+        db: AsyncSession,
+        user_id: uuid.UUID,
+        fingerprint: Optional[str],
+        recipes: List[dict],
+    ) -> None:
+        """
+        Add ``recipes`` as suggestions for ``fingerprint`` and drop unserved
+        suggestions made for any other pantry state (all of them when
+        ``fingerprint`` is None).
+        """
+        stale = delete(GeneratedRecipe).filter(
+            GeneratedRecipe.user_id == user_id, GeneratedRecipe.suggested.is_(True)
+        )
+        if fingerprint is not None:
+            stale = stale.filter(
+                GeneratedRecipe.inventory_fingerprint.is_distinct_from(fingerprint)
+            )
+        await db.execute(stale)
+        db.add_all(
+            self._recipe_row(user_id, recipe, fingerprint, suggested=True)
+            for recipe in recipes
+        )
+        await db.commit()
+
+    async def async_generate_recipe_from_inventory(
+        self, db: AsyncSession, user_id: uuid.UUID
+    ) -> dict:
+        with llm_usage_scope(user_id, "generate"):
+            pantry = await self.async_load_pantry(db, user_id)
+            suggestion = await self.async_take_suggestion(
+                db, user_id, pantry.fingerprint
+            )
+            if suggestion is not None:
+                return suggestion
+            recipe_data = await self.async_get_recipes_by_ingredients(
+                pantry.ingredients, pantry.fitness_goal, pantry.inventory_items
+            )
+            await self._async_save_recipes(db, user_id, [recipe_data], pantry)
+            return recipe_data
+
+    async def async_generate_recipes_from_inventory(
+        self, db: AsyncSession, user_id: uuid.UUID, count: int
+    ) -> List[dict]:
+        """
+        ``count`` distinct recipes for the user's pantry: pre-generated
+        suggestions first, the rest from a single batch LLM call. Bypasses
+        the recipe cache, which holds one recipe per pantry.
+        """
+        if not 1 <= count <= settings.RECIPE_BATCH_MAX_COUNT:
+            raise HTTPException(
+                status_code=422,
+                detail=f"count must be between 1 and {settings.RECIPE_BATCH_MAX_COUNT}",
+            )
+        with llm_usage_scope(user_id, "generate_batch"):
+            pantry = await self.async_load_pantry(db, user_id)
+            recipes = []
+            while len(recipes) < count:
+                suggestion = await self.async_take_suggestion(
+                    db, user_id, pantry.fingerprint
+                )
+                if suggestion is None:
+                    break
+                recipes.append(suggestion)
+            if len(recipes) == count:
+                return recipes
+
+            missing = count - len(recipes)
+
+            async def generate():
+                return await self.recipe_generator.agenerate_recipes(
+                    pantry.ingredients,
+                    pantry.fitness_goal,
+                    pantry.inventory_items,
+                    count=missing,
+                )
+
+            try:
+                generated, _ = await self._race_local(
+                    generate(),
+                    lambda: self._local_recipes(
+                        pantry.ingredients, pantry.fitness_goal, missing
+                    ),
+                )
+            except (TimeoutError, RuntimeError) as e:
+                raise self._llm_http_error(e)
+            generated = [
+                self._finalize_recipe(recipe_data, pantry.ingredients)
+                for recipe_data in generated
+            ]
+            await self._async_save_recipes(db, user_id, generated, pantry)
+            return recipes + generated
+
+    async def async_stream_recipe(
+        self, db: AsyncSession, user_id: uuid.UUID, pantry: Pantry
+    ) -> AsyncIterator[Tuple[str, dict]]:
+        """
+        Stream the recipe for ``pantry`` as ``(event, data)`` pairs: any number
+        of ``"partial"`` field dicts, then the finished ``"recipe"`` (saved
+        like generate_recipe_from_inventory). Failures after the stream has
+        started arrive as one ``"error"`` event with ``detail`` and
+        ``status_code``, unless the local corpus has a recipe for the pantry,
+        which is then sent as the ``"recipe"`` (not when the user's quota is
+        used up). A pre-generated or cached
+        recipe is sent straight away.
+        """
+        with llm_usage_scope(user_id, "stream"):
+            suggestion = await self.async_take_suggestion(
+                db, user_id, pantry.fingerprint
+            )
+            if suggestion is not None:
+                yield "recipe", suggestion
+                return
+
+            cache_key = RecipeCacheKey.build(
+                pantry.ingredients, pantry.fitness_goal, pantry.inventory_items
+            )
+            recipe_data = recipe_cache.get(cache_key)
+            if recipe_data is None:
+                try:
+                    async for event, data in self.recipe_generator.astream_recipe(
+                        pantry.ingredients, pantry.fitness_goal, pantry.inventory_items
+                    ):
+                        if event == "partial":
+                            yield event, data
+                        else:
+                            recipe_data = data
+                except QuotaExceededError as e:
+                    yield "error", self._stream_error(e)
+                    return
+                except (HTTPException, TimeoutError, RuntimeError) as e:
+                    local = self._local_recipes(
+                        pantry.ingredients, pantry.fitness_goal, 1
+                    )
+                    if local is None:
+                        yield "error", self._stream_error(e)
+                        return
+                    local_fallbacks.inc(reason="error")
+                    logger.warning(f"Recipe stream failed, using local recipe: {e}")
+                    recipe_data = local[0]
+                else:
+                    recipe_cache.set(cache_key, recipe_data)
+            else:
+                usage_tracker.record_cache_hit("recipe_cache")
+
+            recipe = self._finalize_recipe(recipe_data, pantry.ingredients)
+            await self._async_save_recipes(db, user_id, [recipe], pantry)
+            yield "recipe", recipe
+
+    @staticmethod
+    def _llm_http_error(e: Exception) -> HTTPException:
+        """
+        The HTTP error for a failed LLM call: 429 once the user's daily
+        token quota is used up, 503 while the circuit breaker is open, 504
+        on timeout, else 500.
+        """
+        if isinstance(e, HTTPException):
+            return e
+        if isinstance(e, QuotaExceededError):
+            return HTTPException(
+                status_code=429,
+                detail=str(e),
+                headers={"Retry-After": str(max(math.ceil(e.retry_after), 1))},
+            )
+        if isinstance(e, CircuitOpenError):
+            return HTTPException(
+                status_code=503,
+                detail=str(e),
+                headers={"Retry-After": str(max(math.ceil(e.retry_after), 1))},
+            )
+        status_code = 504 if isinstance(e, TimeoutError) else 500
+        return HTTPException(status_code=status_code, detail=str(e))
+
+    @classmethod
+    def _stream_error(cls, e: Exception) -> dict:
+        error = cls._llm_http_error(e)
+        return {"detail": error.detail, "status_code": error.status_code}
+
+    @staticmethod
     def get_generated_recipes(
-        self, db: Session, user_id: uuid.UUID
-    ) -> list[GeneratedRecipe]:
+        db: Session, user_id: uuid.UUID, limit: int = 20, cursor: Optional[str] = None
+    ) -> Tuple[list, Optional[str]]:
+        """
+        One page of the user's recipe history, newest first, and the cursor
+        of the next page (None on the last one).
+
+        Rows carry the summary columns only, never ingredients or
+        directions. Pages are keyset-paginated on ``(created_at, id)``, so
+        each is one range scan of ix_generated_recipes_user_id_created_at
+        however deep it is, and recipes generated meanwhile do not shift
+        later pages.
+        """
+        query = db.query(
+            GeneratedRecipe.id,
+            GeneratedRecipe.title,
+            GeneratedRecipe.calories,
+            GeneratedRecipe.protein,
+            GeneratedRecipe.carbs,
+            GeneratedRecipe.fats,
+            GeneratedRecipe.created_at,
+        ).filter(
+            GeneratedRecipe.user_id == user_id, GeneratedRecipe.suggested.is_(False)
+        )
+        if cursor is not None:
+            try:
+                created_at, id = decode_cursor(cursor)
+            except ValueError as e:
+                raise HTTPException(status_code=400, detail=str(e))
+            query = query.filter(
+                tuple_(GeneratedRecipe.created_at, GeneratedRecipe.id)
+                < tuple_(created_at, id)
+            )
+        rows = (
+            query.order_by(GeneratedRecipe.created_at.desc(), GeneratedRecipe.id.desc())
+            .limit(limit + 1)
+            .all()
+        )
+        if len(rows) <= limit:
+            return rows, None
+        rows = rows[:limit]
+        return rows, encode_cursor(rows[-1].created_at, rows[-1].id)
+
+    @staticmethod
+    def get_generated_recipe(
+        db: Session, user_id: uuid.UUID, recipe_id: uuid.UUID
+    ) -> Optional[GeneratedRecipe]:
+        """A recipe from the user's history, in full; None if not theirs."""
         return (
-            db.query(GeneratedRecipe).filter(GeneratedRecipe.user_id == user_id).all()
+            db.query(GeneratedRecipe)
+            .filter(
+                GeneratedRecipe.id == recipe_id,
+                GeneratedRecipe.user_id == user_id,
+                GeneratedRecipe.suggested.is_(False),
+            )
+            .first()
         )
@@ -0,0 +1,212 @@
+import asyncio
+import threading
+import time
+import uuid
+from typing import Callable, Dict, List, Optional, Set
+
+from fastapi import HTTPException
+
+from app.core.config import settings
+from app.services.llm_usage import llm_usage_scope
+from app.services.recipe_service import RecipeService
+from app.utils.logger import get_logger
+from app.utils.metrics import metrics
+
+logger = get_logger("RecipeSuggestions")
+
+suggestion_jobs = metrics.counter(
+    "recipe_suggestion_jobs_total",
+    "Suggestion refreshes by result (generated, unchanged, empty, error)",
+)
+suggestions_generated = metrics.counter(
+    "recipe_suggestions_generated_total", "Recipes pre-generated in the background"
+)
+pending_users = metrics.gauge(
+    "recipe_suggestion_pending_users",
+    "Users whose inventory changed and await a suggestion refresh",
+)
+
+# Quota key shared by every process using the same rate limit backend.
+QUOTA_KEY = "llm:recipe-suggestions"
+
+
+class RecipeSuggestionScheduler:
+    """
+    Pre-generates recipes for users whose inventory changed, so that
+    generate-from-inventory can answer from the database.
+
+    ``notify`` (safe to call from any thread) marks a user dirty; the refresh
+    runs once no further change has arrived for ``debounce`` seconds.
+    ``workers`` tasks then generate the missing suggestions for the pantry
+    fingerprint in one batch LLM call, which takes a token from a
+    ``calls_per_minute`` budget in the rate limit backend (shared across
+    workers with the redis backend). Nothing is recorded unless the
+    scheduler has been started.
+    """
+
+    def __init__(
+        self,
+        debounce: float,
+        workers: int,
+        calls_per_minute: int,
+        count: int,
+        session_factory: Optional[Callable] = None,
+        quota=None,
+        tick: float = 1.0,
+    ):
+        self.debounce = debounce
+        self.workers = workers
+        self.calls_per_minute = calls_per_minute
+        self.count = count
+        self.tick = tick
+        self._session_factory = session_factory
+        self._quota = quota
+        # user id -> monotonic time the refresh is due
+        self._pending: Dict[uuid.UUID, float] = {}
+        self._queued: Set[uuid.UUID] = set()
+        self._lock = threading.Lock()
+        self._tasks: List[asyncio.Task] = []
+        self._queue: Optional[asyncio.Queue] = None
+
+    @property
+    def running(self) -> bool:
+        return bool(self._tasks)
+
+    def notify(self, user_id: uuid.UUID) -> None:
+        if not self.running:
+            return
+        with self._lock:
+            self._pending[user_id] = time.monotonic() + self.debounce
+            pending_users.set(len(self._pending))
+
+    def _take_due(self) -> List[uuid.UUID]:
+        now = time.monotonic()
+        with self._lock:
+            due = [
+                user_id
+                for user_id, due_at in self._pending.items()
+                if due_at <= now and user_id not in self._queued
+            ]
+            for user_id in due:
+                del self._pending[user_id]
+                self._queued.add(user_id)
+            pending_users.set(len(self._pending))
+        return due
+
+    async def start(self) -> None:
+        if self.running:
+            return
+        self._queue = asyncio.Queue()
+        self._tasks = [asyncio.create_task(self._dispatch())] + [
+            asyncio.create_task(self._work()) for _ in range(self.workers)
+        ]
+        logger.info(f"Recipe suggestion scheduler started: workers={self.workers}")
+
+    async def stop(self) -> None:
+        tasks, self._tasks = self._tasks, []
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        with self._lock:
+            self._pending.clear()
+            self._queued.clear()
+            pending_users.set(0)
+
+    async def _dispatch(self) -> None:
+        while True:
+            await asyncio.sleep(self.tick)
+            for user_id in self._take_due():
+                self._queue.put_nowait(user_id)
+
+    async def _work(self) -> None:
+        while True:
+            user_id = await self._queue.get()
+            try:
+                await self.refresh(user_id)
+            except Exception as e:
+                suggestion_jobs.inc(result="error")
+                logger.error(f"Suggestion refresh failed: user={user_id}, error={e}")
+            finally:
+                with self._lock:
+                    self._queued.discard(user_id)
+
+    async def _acquire_quota(self) -> None:
+        if self._quota is None:
+            from app.middleware.rate_limit import get_backend
+
+            self._quota = get_backend()
+        while True:
+            allowed, retry_after = await self._quota.hit(
+                QUOTA_KEY, self.calls_per_minute, 60.0
+            )
+            if allowed:
+                return
+            await asyncio.sleep(retry_after)
+
+    def _session(self):
+        if self._session_factory is None:
+            from app.db.async_session import AsyncSessionLocal
+
+            self._session_factory = AsyncSessionLocal
+        return self._session_factory()
+
+    async def refresh(self, user_id: uuid.UUID) -> int:
+        """
+        Bring the user's suggestions up to ``count`` for the current pantry,
+        dropping ones made for an older pantry. Returns how many recipes were
+        generated.
+        """
+        service = RecipeService()
+        async with self._session() as db:
+            try:
+                pantry = await service.async_load_pantry(db, user_id)
+            except HTTPException:
+                await service.async_store_suggestions(db, user_id, None, [])
+                suggestion_jobs.inc(result="empty")
+                return 0
+
+            fingerprint = pantry.fingerprint
+            missing = self.count - await service.async_count_suggestions(
+                db, user_id, fingerprint
+            )
+            if missing <= 0:
+                suggestion_jobs.inc(result="unchanged")
+                return 0
+
+            await self._acquire_quota()
+            try:
+                with llm_usage_scope(user_id, "suggestions"):
+                    generated = await service.recipe_generator.agenerate_recipes(
+                        pantry.ingredients,
+                        pantry.fitness_goal,
+                        pantry.inventory_items,
+                        count=min(missing, settings.RECIPE_BATCH_MAX_COUNT),
+                    )
+            except (RuntimeError, TimeoutError) as e:
+                logger.warning(
+                    f"Suggestion generation failed: user={user_id}, error={e}"
+                )
+                generated = []
+            recipes = [
+                service._finalize_recipe(recipe_data, pantry.ingredients)
+                for recipe_data in generated
+            ]
+
+            await service.async_store_suggestions(db, user_id, fingerprint, recipes)
+        suggestions_generated.inc(len(recipes))
+        suggestion_jobs.inc(result="generated" if recipes else "error")
+        logger.info(f"Suggestions refreshed: user={user_id}, generated={len(recipes)}")
+        return len(recipes)
+
+
+scheduler = RecipeSuggestionScheduler(
+    debounce=settings.RECIPE_SUGGESTION_DEBOUNCE_SECONDS,
+    workers=settings.RECIPE_SUGGESTION_WORKERS,
+    calls_per_minute=settings.RECIPE_SUGGESTION_LLM_CALLS_PER_MINUTE,
+    count=settings.RECIPE_SUGGESTION_COUNT,
+)
+
+
+def notify_inventory_changed(user_id: uuid.UUID) -> None:
+    """Schedule a suggestion refresh for ``user_id`` (debounced)."""
+    scheduler.notify(user_id)
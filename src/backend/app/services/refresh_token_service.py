@@ -0,0 +1,101 @@
+import hashlib
+import secrets
+import uuid
+from datetime import datetime, timedelta
+from typing import Optional, Tuple
+
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.models.refresh_token import RefreshToken
+from app.utils.logger import get_logger
+
+
+class InvalidRefreshTokenError(Exception):
+    """Unknown, expired or revoked refresh token."""
+
+
+def hash_refresh_token(token: str) -> str:
+    # Tokens are 256 random bits, so a fast unsalted digest is enough to keep
+    # a database leak from yielding usable tokens.
+    return hashlib.sha256(token.encode()).hexdigest()
+
+
+def _new_refresh_token(
+    user_id: uuid.UUID, family_id: Optional[uuid.UUID] = None
+) -> Tuple[str, RefreshToken]:
+    token = secrets.token_urlsafe(32)
+    now = datetime.utcnow()
+    row = RefreshToken(
+        user_id=user_id,
+        family_id=family_id or uuid.uuid4(),
+        token_hash=hash_refresh_token(token),
+        created_at=now,
+        expires_at=now + timedelta(days=settings.REFRESH_TOKEN_EXPIRE_DAYS),
+    )
+    return token, row
+
+
+async def _get_for_update(db: AsyncSession, token: str) -> Optional[RefreshToken]:
+    return (
+        await db.scalars(
+            select(RefreshToken)
+            .filter(RefreshToken.token_hash == hash_refresh_token(token))
+            .with_for_update()
+        )
+    ).first()
+
+
+async def _revoke_family(db: AsyncSession, family_id: uuid.UUID) -> None:
+    await db.execute(
+        update(RefreshToken)
+        .where(RefreshToken.family_id == family_id, RefreshToken.revoked_at.is_(None))
+        .values(revoked_at=datetime.utcnow())
+    )
+
+
+async def async_issue_refresh_token(db: AsyncSession, user_id: uuid.UUID) -> str:
+    """Start a new token family (one per login) and return its first token."""
+    token, row = _new_refresh_token(user_id)
+    db.add(row)
+    await db.commit()
+    return token
+
+
+async def async_rotate_refresh_token(
+    db: AsyncSession, token: str
+) -> Tuple[uuid.UUID, str]:
+    """
+    Exchange a refresh token for its successor; returns (user_id, new token).
+
+    The presented token is revoked. Presenting an already revoked token
+    revokes its whole family, since either the client or an attacker holds a
+    stolen copy. The row lock serialises concurrent refreshes of one token.
+    """
+    row = await _get_for_update(db, token)
+    if row is None or row.expires_at <= datetime.utcnow():
+        await db.rollback()
+        raise InvalidRefreshTokenError()
+    if row.revoked_at is not None:
+        get_logger("RefreshTokenService").warning(
+            f"Refresh token reuse detected: user={row.user_id}, family={row.family_id}"
+        )
+        await _revoke_family(db, row.family_id)
+        await db.commit()
+        raise InvalidRefreshTokenError()
+
+    row.revoked_at = datetime.utcnow()
+    new_token, new_row = _new_refresh_token(row.user_id, row.family_id)
+    db.add(new_row)
+    user_id = row.user_id
+    await db.commit()
+    return user_id, new_token
+
+
+async def async_revoke_refresh_token(db: AsyncSession, token: str) -> None:
+    """Log out: revoke the token's family. Unknown tokens are ignored."""
+    row = await _get_for_update(db, token)
+    if row is not None:
+        await _revoke_family(db, row.family_id)
+    await db.commit()
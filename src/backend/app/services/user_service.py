@@ -2,24 +2,70 @@ from typing import Any, Dict, Optional, Union
 import uuid
 from datetime import datetime
 
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
-from app.core.security import get_password_hash, verify_password
+from app.core.config import settings
+from app.core.security import (
+    async_get_password_hash,
+    async_verify_and_update,
+    get_password_hash,
+    verify_and_update,
+)
 from app.models.user import User
-from app.schemas.user import UserCreate, UserUpdate
+from app.schemas.user import User as UserSchema, UserCreate, UserUpdate
+from app.services import nutrition_service
+from app.utils.cache import LRUCache
+
+# user id (or email, for legacy email-subject tokens) -> detached UserSchema
+# snapshot used by get_current_user.
+_user_cache = LRUCache(
+    maxsize=settings.AUTH_CACHE_MAX_SIZE, ttl=settings.AUTH_CACHE_TTL_SECONDS
+)
 
 
 def get_user(db: Session, user_id: uuid.UUID) -> Optional[User]:
-    return db.query(User).filter(User.id == user_id).first()
+    return db.get(User, user_id)
 
 
 def get_user_by_email(db: Session, email: str) -> Optional[User]:
     return db.query(User).filter(User.email == email).first()
 
 
-def create_user(db: Session, user_in: UserCreate) -> User:
-    hashed_password = get_password_hash(user_in.password)
-    db_user = User(
+def _cached_snapshot(key, load) -> Optional[UserSchema]:
+    snapshot = _user_cache.get(key)
+    if snapshot is None:
+        user = load()
+        if not user:
+            return None
+        snapshot = UserSchema.model_validate(user)
+        _user_cache.set(key, snapshot)
+    return snapshot
+
+
+def get_user_snapshot(db: Session, user_id: uuid.UUID) -> Optional[UserSchema]:
+    """
+    Cached, session-independent view of a user for request authentication,
+    loaded by primary key. Entries expire after AUTH_CACHE_TTL_SECONDS and are
+    dropped by update_user, so other processes see profile changes within the
+    TTL.
+    """
+    return _cached_snapshot(user_id, lambda: get_user(db, user_id))
+
+
+def get_user_snapshot_by_email(db: Session, email: str) -> Optional[UserSchema]:
+    """get_user_snapshot for legacy tokens whose subject is the email."""
+    return _cached_snapshot(email, lambda: get_user_by_email(db, email=email))
+
+
+def invalidate_user_cache(user_id: uuid.UUID, *emails: str) -> None:
+    for key in (user_id, *emails):
+        _user_cache.pop(key)
+
+
+def _user_from_schema(user_in: UserCreate, hashed_password: str) -> User:
+    return User(
         email=user_in.email,
         hashed_password=hashed_password,
         height=user_in.height,
@@ -28,17 +74,21 @@ def create_user(db: Session, user_in: UserCreate) -> User:
         sex=user_in.sex,
         activity_level=user_in.activity_level,
         fitness_goal=user_in.fitness_goal,
+        timezone=user_in.timezone or "UTC",
         created_at=datetime.utcnow(),
         updated_at=datetime.utcnow(),
     )
+
+
+def create_user(db: Session, user_in: UserCreate) -> User:
+    db_user = _user_from_schema(user_in, get_password_hash(user_in.password))
     db.add(db_user)
     db.commit()
     return db_user
 
 
-def update_user(
-    db: Session, db_obj: User, obj_in: Union[UserUpdate, Dict[str, Any]]
-) -> User:
+def _apply_user_update(db_obj: User, obj_in: Union[UserUpdate, Dict[str, Any]]) -> bool:
+    """Apply an update to db_obj; returns whether nutrition targets changed."""
     if isinstance(obj_in, dict):
         update_data = obj_in
     else:
@@ -49,12 +99,27 @@ def update_user(
         del update_data["password"]
         update_data["hashed_password"] = hashed_password
 
+    targets_changed = any(
+        getattr(db_obj, field) != value
+        for field, value in update_data.items()
+        if field in nutrition_service.TARGET_FIELDS
+    )
     for field, value in update_data.items():
         setattr(db_obj, field, value)
+    return targets_changed
+
 
+def update_user(
+    db: Session, db_obj: User, obj_in: Union[UserUpdate, Dict[str, Any]]
+) -> User:
+    old_email = db_obj.email
+    targets_changed = _apply_user_update(db_obj, obj_in)
     db.add(db_obj)
     db.commit()
     db.refresh(db_obj)
+    invalidate_user_cache(db_obj.id, old_email, db_obj.email)
+    if targets_changed:
+        nutrition_service.invalidate_targets(db_obj.id)
     return db_obj
 
 
@@ -62,6 +127,70 @@ def authenticate_user(db: Session, email: str, password: str) -> Optional[User]:
     user = get_user_by_email(db, email=email)
     if not user:
         return None
-    if not verify_password(password, user.hashed_password):
+    valid, new_hash = verify_and_update(password, user.hashed_password)
+    if not valid:
+        return None
+    if new_hash:
+        # Stored hash predates the current PASSWORD_HASH_ROUNDS.
+        user.hashed_password = new_hash
+        db.commit()
+    return user
+
+
+# Async variants of the functions above, for use with deps.get_async_db.
+# bcrypt is CPU-bound for ~100ms, so hashing and verification run on the
+# bounded executor from app.core.security instead of blocking the event loop;
+# they raise ExecutorBusyError when that executor is saturated.
+
+
+async def async_get_user(db: AsyncSession, user_id: uuid.UUID) -> Optional[User]:
+    return await db.get(User, user_id)
+
+
+async def async_get_user_by_email(db: AsyncSession, email: str) -> Optional[User]:
+    return (await db.scalars(select(User).filter(User.email == email))).first()
+
+
+async def async_create_user(db: AsyncSession, user_in: UserCreate) -> User:
+    db_user = _user_from_schema(
+        user_in, await async_get_password_hash(user_in.password)
+    )
+    db.add(db_user)
+    await db.commit()
+    return db_user
+
+
+async def async_update_user(
+    db: AsyncSession, db_obj: User, obj_in: Union[UserUpdate, Dict[str, Any]]
+) -> User:
+    old_email = db_obj.email
+    if isinstance(obj_in, dict):
+        update_data = dict(obj_in)
+    else:
+        update_data = obj_in.dict(exclude_unset=True)
+    password = update_data.pop("password", None)
+    if password:
+        update_data["hashed_password"] = await async_get_password_hash(password)
+    targets_changed = _apply_user_update(db_obj, update_data)
+    db.add(db_obj)
+    await db.commit()
+    await db.refresh(db_obj)
+    invalidate_user_cache(db_obj.id, old_email, db_obj.email)
+    if targets_changed:
+        nutrition_service.invalidate_targets(db_obj.id)
+    return db_obj
+
+
+async def async_authenticate_user(
+    db: AsyncSession, email: str, password: str
+) -> Optional[User]:
+    user = await async_get_user_by_email(db, email=email)
+    if not user:
+        return None
+    valid, new_hash = await async_verify_and_update(password, user.hashed_password)
+    if not valid:
         return None
+    if new_hash:
+        user.hashed_password = new_hash
+        await db.commit()
     return user
@@ -0,0 +1,51 @@
+import asyncio
+from typing import Awaitable, TypeVar
+
+from fastapi import HTTPException
+from starlette.requests import Request
+
+from app.utils.logger import get_logger
+from app.utils.metrics import metrics
+
+logger = get_logger("Disconnect")
+
+T = TypeVar("T")
+
+# nginx's "client closed request"; the client never sees it.
+CLIENT_CLOSED_REQUEST = 499
+
+cancelled_requests = metrics.counter(
+    "requests_cancelled_on_disconnect_total",
+    "Requests whose work was cancelled because the client went away",
+)
+
+
+async def cancel_on_disconnect(
+    request: Request, awaitable: Awaitable[T], poll_interval: float = 0.25
+) -> T:
+    """
+    Await ``awaitable``, cancelling it if the client disconnects first.
+
+    Starlette keeps running a handler after its client has gone, so slow
+    work such as an LLM call would otherwise run (and hold its concurrency
+    slot) to completion for nobody. The disconnect is checked every
+    ``poll_interval`` seconds; on disconnect this raises an HTTPException
+    with status 499.
+    """
+    task = asyncio.ensure_future(awaitable)
+    try:
+        while True:
+            done, _ = await asyncio.wait({task}, timeout=poll_interval)
+            if done:
+                return task.result()
+            if await request.is_disconnected():
+                task.cancel()
+                cancelled_requests.inc(path=request.url.path)
+                logger.info(f"Client disconnected, cancelled {request.url.path}")
+                raise HTTPException(
+                    status_code=CLIENT_CLOSED_REQUEST, detail="Client closed request"
+                )
+    finally:
+        # Also covers this coroutine itself being cancelled.
+        if not task.done():
+            task.cancel()
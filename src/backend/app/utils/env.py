@@ -0,0 +1,8 @@
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parents[2]
+
+# .env files read by the settings classes, lowest priority first: the one
+# next to the backend package, then one in the working directory. Real
+# environment variables override both.
+ENV_FILES = (BACKEND_DIR / ".env", Path(".env"))
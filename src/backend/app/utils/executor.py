@@ -0,0 +1,72 @@
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, TypeVar
+
+from app.utils.metrics import metrics
+
+T = TypeVar("T")
+
+queue_wait_seconds = metrics.histogram(
+    "executor_queue_wait_seconds",
+    "Time a task waited for a free executor worker",
+    buckets=(0.001, 0.005, 0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0),
+)
+run_seconds = metrics.histogram(
+    "executor_run_seconds", "Time spent running a task on an executor worker"
+)
+rejected_tasks = metrics.counter(
+    "executor_rejected_total", "Tasks refused because the executor queue was full"
+)
+
+
+class ExecutorBusyError(RuntimeError):
+    """Raised when a BoundedExecutor already has max_workers + max_queue tasks."""
+
+
+class BoundedExecutor:
+    """
+    Thread pool with a hard cap on queued work, awaitable from async code.
+
+    At most ``max_workers`` tasks run at once and at most ``max_queue`` more
+    wait; further submissions fail fast with ExecutorBusyError instead of
+    piling up behind a burst. Queue wait and run time are recorded per
+    ``name`` in the metrics registry.
+    """
+
+    def __init__(self, name: str, max_workers: int, max_queue: int):
+        self.name = name
+        self.max_workers = max_workers
+        self.max_queue = max_queue
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix=name
+        )
+        self._slots = threading.BoundedSemaphore(max_workers + max_queue)
+
+    async def run(self, fn: Callable[..., T], *args: Any) -> T:
+        if not self._slots.acquire(blocking=False):
+            rejected_tasks.inc(executor=self.name)
+            raise ExecutorBusyError(f"{self.name} executor is saturated")
+        submitted = time.perf_counter()
+
+        def _call():
+            started = time.perf_counter()
+            queue_wait_seconds.observe(started - submitted, executor=self.name)
+            try:
+                return fn(*args)
+            finally:
+                run_seconds.observe(time.perf_counter() - started, executor=self.name)
+
+        try:
+            future = self._executor.submit(_call)
+        except BaseException:
+            self._slots.release()
+            raise
+        # Release on completion rather than when the awaiting request goes
+        # away, so cancelled callers cannot push the pool past its bound.
+        future.add_done_callback(lambda _: self._slots.release())
+        return await asyncio.wrap_future(future)
+
+    def shutdown(self, wait: bool = True) -> None:
+        self._executor.shutdown(wait=wait)
@@ -1,3 +1,6 @@
+import base64
+import uuid
+from datetime import datetime
 from typing import Any, Dict, Tuple
 from sqlalchemy.orm import Query
 
@@ -35,3 +38,27 @@ def paginate_query(
         "has_prev": page > 1,
     }
     return items, meta
+
+
+def encode_cursor(created_at: datetime, id: uuid.UUID) -> str:
+    """
+    Opaque keyset cursor for the row ``(created_at, id)``: the next page
+    starts right after it.
+    """
+    raw = f"{created_at.isoformat()}|{id}".encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, uuid.UUID]:
+    """
+    Inverse of encode_cursor.
+
+    Raises:
+        ValueError: ``cursor`` was not made by encode_cursor
+    """
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+        created_at, id = raw.split("|")
+        return datetime.fromisoformat(created_at), uuid.UUID(id)
+    except (ValueError, UnicodeDecodeError) as e:
+        raise ValueError(f"Invalid cursor: {cursor!r}") from e
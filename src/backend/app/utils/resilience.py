@@ -0,0 +1,321 @@
+import asyncio
+import random
+import threading
+import time
+from collections import deque
+from typing import Awaitable, Callable, Optional, TypeVar
+
+from app.utils.logger import get_logger
+from app.utils.metrics import metrics
+
+logger = get_logger("Resilience")
+
+T = TypeVar("T")
+
+breaker_state = metrics.gauge(
+    "circuit_breaker_state", "Circuit breaker state (0 closed, 1 half-open, 2 open)"
+)
+breaker_transitions = metrics.counter(
+    "circuit_breaker_transitions_total", "Circuit breaker state changes by new state"
+)
+breaker_rejections = metrics.counter(
+    "circuit_breaker_rejections_total", "Calls failed fast by an open circuit breaker"
+)
+call_retries = metrics.counter(
+    "resilient_call_retries_total", "Attempts retried after a failure or timeout"
+)
+hedged_calls = metrics.counter(
+    "resilient_call_hedges_total", "Hedged requests sent, by which request answered"
+)
+
+_STATE_VALUES = {"closed": 0, "half_open": 1, "open": 2}
+
+
+class CircuitOpenError(RuntimeError):
+    """Raised instead of calling a dependency whose circuit breaker is open."""
+
+    def __init__(self, name: str, retry_after: float):
+        super().__init__(f"{name} is unavailable; retry in {retry_after:.1f}s")
+        self.name = name
+        self.retry_after = retry_after
+
+
+class CircuitBreaker:
+    """
+    Fails calls fast after ``failure_threshold`` consecutive failures.
+
+    Once open, calls raise CircuitOpenError for ``reset_timeout`` seconds;
+    then one trial call is let through (half-open). Its success closes the
+    circuit, its failure opens it again. Thread-safe; state changes are
+    logged and exported as metrics labelled with ``name``.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        failure_threshold: int = 5,
+        reset_timeout: float = 30.0,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._state = "closed"
+        self._failures = 0
+        self._opened_at = 0.0
+        self._trial_running = False
+        breaker_state.set(0, name=name)
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            self._maybe_half_open()
+            return self._state
+
+    def _maybe_half_open(self) -> None:
+        if (
+            self._state == "open"
+            and self._clock() - self._opened_at >= self.reset_timeout
+        ):
+            self._transition("half_open")
+
+    def _transition(self, state: str) -> None:
+        self._state = state
+        if state == "open":
+            self._opened_at = self._clock()
+        self._trial_running = False
+        breaker_state.set(_STATE_VALUES[state], name=self.name)
+        breaker_transitions.inc(name=self.name, state=state)
+        logger.warning(f"Circuit breaker {self.name} is now {state}")
+
+    def before_call(self) -> None:
+        """Raise CircuitOpenError unless a call may go ahead now."""
+        with self._lock:
+            self._maybe_half_open()
+            if self._state == "closed":
+                return
+            if self._state == "half_open" and not self._trial_running:
+                self._trial_running = True
+                return
+            retry_after = max(self._opened_at + self.reset_timeout - self._clock(), 0)
+        breaker_rejections.inc(name=self.name)
+        raise CircuitOpenError(self.name, retry_after)
+
+    def record_success(self) -> None:
+        with self._lock:
+            self._failures = 0
+            if self._state != "closed":
+                self._transition("closed")
+
+    def abandon(self) -> None:
+        """The call was cancelled: count nothing, but free the trial slot."""
+        with self._lock:
+            self._trial_running = False
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self._failures += 1
+            if self._state == "half_open" or (
+                self._state == "closed" and self._failures >= self.failure_threshold
+            ):
+                self._transition("open")
+
+
+class LatencyWindow:
+    """Latencies of the last ``size`` successful calls, for percentiles."""
+
+    def __init__(self, size: int = 200, min_samples: int = 20):
+        self.min_samples = min_samples
+        self._samples = deque(maxlen=size)
+        self._lock = threading.Lock()
+
+    def observe(self, seconds: float) -> None:
+        with self._lock:
+            self._samples.append(seconds)
+
+    def percentile(self, q: float) -> Optional[float]:
+        """The ``q`` quantile (0..1); None until ``min_samples`` are seen."""
+        with self._lock:
+            if len(self._samples) < self.min_samples:
+                return None
+            ordered = sorted(self._samples)
+        return ordered[min(int(q * len(ordered)), len(ordered) - 1)]
+
+
+class ResilientCaller:
+    """
+    Calls a flaky dependency through a circuit breaker, with a per-attempt
+    timeout and up to ``attempts`` tries separated by full-jitter
+    exponential backoff (a random delay up to ``base_delay * 2**n``,
+    capped at ``max_delay``).
+
+    With ``hedge_quantile``, an async attempt still running after that
+    quantile of recent latencies gets a second, identical request; the
+    first answer wins and the other is cancelled. Hedging needs
+    ``min_samples`` latencies first and, when ``hedge_slots`` is passed,
+    a free slot in that semaphore, so it never exceeds the caller's
+    concurrency cap.
+
+    The breaker sees logical calls, not attempts: it is asked once per call
+    and records one failure only when every attempt allowed has failed.
+    With a ``deadline`` (a time.monotonic() value) no retry starts unless
+    its backoff and ``call_timeout`` fit before it.
+    """
+
+    def __init__(
+        self,
+        breaker: CircuitBreaker,
+        attempts: int = 3,
+        call_timeout: Optional[float] = None,
+        base_delay: float = 0.25,
+        max_delay: float = 2.0,
+        hedge_quantile: Optional[float] = None,
+        latencies: Optional[LatencyWindow] = None,
+    ):
+        self.breaker = breaker
+        self.attempts = attempts
+        self.call_timeout = call_timeout
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.hedge_quantile = hedge_quantile
+        self.latencies = latencies or LatencyWindow()
+
+    def backoff(self, attempt: int) -> float:
+        return random.uniform(0, min(self.max_delay, self.base_delay * 2**attempt))
+
+    def call(self, fn: Callable[[], T], deadline: Optional[float] = None) -> T:
+        """
+        Blocking version without hedging; ``fn`` must enforce the timeout
+        itself (e.g. through its client's request timeout).
+        """
+        self.breaker.before_call()
+        for attempt in range(self.attempts):
+            started = time.perf_counter()
+            try:
+                result = fn()
+            except Exception as e:
+                delay = self._retry_delay(attempt, deadline)
+                if delay is None:
+                    self.breaker.record_failure()
+                    raise
+                self._log_retry(attempt, e)
+                time.sleep(delay)
+                continue
+            self.breaker.record_success()
+            self.latencies.observe(time.perf_counter() - started)
+            return result
+
+    async def acall(
+        self,
+        fn: Callable[[], Awaitable[T]],
+        hedge_slots: Optional[asyncio.Semaphore] = None,
+        deadline: Optional[float] = None,
+    ) -> T:
+        """
+        Raises:
+            CircuitOpenError: the breaker is open
+            TimeoutError: the last attempt exceeded ``call_timeout``
+            Exception: whatever the last attempt raised
+        """
+        self.breaker.before_call()
+        for attempt in range(self.attempts):
+            started = time.perf_counter()
+            try:
+                result = await self._attempt(fn, hedge_slots)
+            except asyncio.CancelledError:
+                self.breaker.abandon()
+                raise
+            except Exception as e:
+                delay = self._retry_delay(attempt, deadline)
+                if delay is None:
+                    self.breaker.record_failure()
+                    raise
+                self._log_retry(attempt, e)
+                try:
+                    await asyncio.sleep(delay)
+                except asyncio.CancelledError:
+                    self.breaker.abandon()
+                    raise
+                continue
+            self.breaker.record_success()
+            self.latencies.observe(time.perf_counter() - started)
+            return result
+
+    def _retry_delay(self, attempt: int, deadline: Optional[float]) -> Optional[float]:
+        """Backoff before the next attempt, or None to give up."""
+        if attempt + 1 >= self.attempts:
+            return None
+        delay = self.backoff(attempt)
+        if deadline is not None:
+            needed = delay + (self.call_timeout or 0.0)
+            if time.monotonic() + needed > deadline:
+                logger.warning(
+                    f"{self.breaker.name} attempt {attempt + 1}/{self.attempts} "
+                    "failed with no time left to retry"
+                )
+                return None
+        return delay
+
+    def _log_retry(self, attempt: int, error: Exception) -> None:
+        call_retries.inc(name=self.breaker.name)
+        logger.warning(
+            f"{self.breaker.name} attempt {attempt + 1}/{self.attempts} failed, "
+            f"retrying: {error!r}"
+        )
+
+    async def _timed(self, fn: Callable[[], Awaitable[T]]) -> T:
+        try:
+            return await asyncio.wait_for(fn(), self.call_timeout)
+        except asyncio.TimeoutError:
+            raise TimeoutError(
+                f"{self.breaker.name} call timed out after {self.call_timeout}s"
+            )
+
+    async def _attempt(
+        self,
+        fn: Callable[[], Awaitable[T]],
+        hedge_slots: Optional[asyncio.Semaphore],
+    ) -> T:
+        delay = None
+        if self.hedge_quantile is not None:
+            delay = self.latencies.percentile(self.hedge_quantile)
+        if delay is None:
+            return await self._timed(fn)
+
+        primary = asyncio.ensure_future(self._timed(fn))
+        try:
+            done, _ = await asyncio.wait({primary}, timeout=delay)
+            if done or (hedge_slots is not None and hedge_slots.locked()):
+                return await primary
+            hedge = asyncio.ensure_future(self._hedge(fn, hedge_slots))
+            return await self._first_success(primary, hedge)
+        finally:
+            primary.cancel()
+
+    async def _hedge(
+        self, fn: Callable[[], Awaitable[T]], hedge_slots: Optional[asyncio.Semaphore]
+    ) -> T:
+        if hedge_slots is None:
+            return await self._timed(fn)
+        async with hedge_slots:
+            return await self._timed(fn)
+
+    async def _first_success(self, primary: asyncio.Task, hedge: asyncio.Task):
+        pending = {primary, hedge}
+        try:
+            while pending:
+                done, pending = await asyncio.wait(
+                    pending, return_when=asyncio.FIRST_COMPLETED
+                )
+                for task in done:
+                    if task.exception() is None:
+                        winner = "hedge" if task is hedge else "primary"
+                        hedged_calls.inc(name=self.breaker.name, winner=winner)
+                        return task.result()
+            hedged_calls.inc(name=self.breaker.name, winner="none")
+            # Both failed: report the original request's error.
+            return primary.result()
+        finally:
+            hedge.cancel()
@@ -0,0 +1,35 @@
+import json
+import time
+from typing import AsyncIterator, Optional, Tuple
+
+from app.utils.metrics import Histogram
+
+SSE_HEADERS = {
+    "Cache-Control": "no-cache",
+    # Stop nginx from buffering the stream.
+    "X-Accel-Buffering": "no",
+}
+
+
+def sse_event(event: str, data) -> str:
+    """Encode one server-sent event with a JSON payload."""
+    return f"event: {event}\ndata: {json.dumps(data, default=str)}\n\n"
+
+
+async def sse_stream(
+    events: AsyncIterator[Tuple[str, object]],
+    started: Optional[float] = None,
+    ttfb: Optional[Histogram] = None,
+    **labels,
+) -> AsyncIterator[str]:
+    """
+    Encode ``(event, data)`` pairs as server-sent events. With ``ttfb``, the
+    time from ``started`` (a time.perf_counter() value) to the first event
+    is observed there.
+    """
+    first = True
+    async for event, data in events:
+        if first and ttfb is not None and started is not None:
+            ttfb.observe(time.perf_counter() - started, **labels)
+        first = False
+        yield sse_event(event, data)
@@ -0,0 +1,18 @@
+from datetime import date, datetime, time, timedelta, timezone
+from typing import Optional, Tuple
+from zoneinfo import ZoneInfo
+
+
+def local_date(now: datetime, tz_name: Optional[str]) -> date:
+    """Calendar date of the aware datetime ``now`` in the given IANA timezone."""
+    return now.astimezone(ZoneInfo(tz_name or "UTC")).date()
+
+
+def utc_day_bounds(day: date, tz_name: Optional[str]) -> Tuple[datetime, datetime]:
+    """Naive UTC [start, end) bounds of a user-local calendar day."""
+    tz = ZoneInfo(tz_name or "UTC")
+    start = datetime.combine(day, time.min, tzinfo=tz).astimezone(timezone.utc)
+    end = datetime.combine(day + timedelta(days=1), time.min, tzinfo=tz).astimezone(
+        timezone.utc
+    )
+    return start.replace(tzinfo=None), end.replace(tzinfo=None)
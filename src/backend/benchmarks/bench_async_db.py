@@ -0,0 +1,101 @@
+"""
+Compare requests/sec of the sync (threadpool + psycopg2) and async (asyncpg)
+database paths under concurrent load.
+
+Each request runs one query that waits on Postgres for --query-ms, which is
+what a slow query looks like to the app: the sync path parks a threadpool
+worker for the duration, the async path only suspends a coroutine.
+
+    python -m benchmarks.bench_async_db --requests 2000 --concurrency 200
+"""
+
+import argparse
+import asyncio
+import time
+
+import httpx
+from fastapi import Depends, FastAPI
+from sqlalchemy import create_engine, text
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+from sqlalchemy.orm import Session, sessionmaker
+
+from app.db import DATABASE_URL
+from app.db.async_session import create_async_db_engine
+
+
+def build_app(query_ms: int, pool_size: int) -> FastAPI:
+    sync_engine = create_engine(DATABASE_URL, pool_size=pool_size, max_overflow=0)
+    async_engine = create_async_db_engine(pool_size=pool_size, max_overflow=0)
+    sync_sessions = sessionmaker(bind=sync_engine)
+    async_sessions = async_sessionmaker(bind=async_engine)
+    query = text("SELECT pg_sleep(:seconds)").bindparams(seconds=query_ms / 1000)
+
+    def get_db():
+        with sync_sessions() as db:
+            yield db
+
+    async def get_async_db():
+        async with async_sessions() as db:
+            yield db
+
+    app = FastAPI()
+
+    @app.get("/sync")
+    def sync_endpoint(db: Session = Depends(get_db)):
+        db.execute(query)
+        return {"ok": True}
+
+    @app.get("/async")
+    async def async_endpoint(db: AsyncSession = Depends(get_async_db)):
+        await db.execute(query)
+        return {"ok": True}
+
+    app.state.engines = (sync_engine, async_engine)
+    return app
+
+
+async def run_load(app: FastAPI, path: str, requests: int, concurrency: int) -> float:
+    transport = httpx.ASGITransport(app=app)
+    semaphore = asyncio.Semaphore(concurrency)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as c:
+
+        async def one():
+            async with semaphore:
+                resp = await c.get(path)
+                resp.raise_for_status()
+
+        await c.get(path)  # warm the pool
+        start = time.perf_counter()
+        await asyncio.gather(*(one() for _ in range(requests)))
+        return requests / (time.perf_counter() - start)
+
+
+async def main_async(args) -> None:
+    app = build_app(args.query_ms, args.pool_size)
+    sync_engine, async_engine = app.state.engines
+    try:
+        for path in ("/sync", "/async"):
+            rps = await run_load(app, path, args.requests, args.concurrency)
+            print(f"{path:<7} {rps:10.1f} req/s")
+    finally:
+        sync_engine.dispose()
+        await async_engine.dispose()
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--requests", type=int, default=1000)
+    parser.add_argument("--concurrency", type=int, default=100)
+    parser.add_argument("--query-ms", type=int, default=20)
+    parser.add_argument("--pool-size", type=int, default=20)
+    args = parser.parse_args(argv)
+    print(
+        f"{args.requests} requests, concurrency {args.concurrency}, "
+        f"{args.query_ms} ms query, pool size {args.pool_size}"
+    )
+    asyncio.run(main_async(args))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
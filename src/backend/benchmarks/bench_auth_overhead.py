@@ -0,0 +1,86 @@
+"""
+Measure per-request authentication overhead for the token resolution paths:
+
+- email:   legacy email-subject token resolved with a users.email lookup
+- id:      id-subject token resolved by primary key (get_current_user)
+- cached:  id-subject token served from the token/user caches
+- id-only: get_current_user_id, which never looks the user up
+
+    python -m benchmarks.bench_auth_overhead --iterations 2000
+"""
+
+import argparse
+import time
+import uuid
+
+from app.api import deps
+from app.auth import auth_service
+from app.auth.auth_service import JWTService
+from app.db import SessionLocal
+from app.models.user import User
+from app.services import user_service
+
+
+def _clear_caches():
+    auth_service._token_cache.clear()
+    user_service._user_cache.clear()
+
+
+def _time(label, fn, iterations, cold):
+    start = time.perf_counter()
+    for _ in range(iterations):
+        if cold:
+            _clear_caches()
+        fn()
+    elapsed = time.perf_counter() - start
+    print(f"{label:<8} {elapsed / iterations * 1e6:10.1f} us/request")
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--iterations", type=int, default=1000)
+    args = parser.parse_args(argv)
+
+    db = SessionLocal()
+    user = User(
+        id=uuid.uuid4(), email=f"bench-{uuid.uuid4()}@example.com", hashed_password="x"
+    )
+    db.add(user)
+    db.commit()
+    email_token = JWTService.create_access_token({"sub": user.email})
+    id_token = JWTService.create_access_token({"sub": str(user.id)})
+    deps.settings.AUTH_ACCEPT_EMAIL_SUBJECT = True
+    try:
+        _time(
+            "email",
+            lambda: deps.get_current_user(db=db, token=email_token),
+            args.iterations,
+            cold=True,
+        )
+        _time(
+            "id",
+            lambda: deps.get_current_user(db=db, token=id_token),
+            args.iterations,
+            cold=True,
+        )
+        _time(
+            "cached",
+            lambda: deps.get_current_user(db=db, token=id_token),
+            args.iterations,
+            cold=False,
+        )
+        _time(
+            "id-only",
+            lambda: deps.get_current_user_id(db=db, token=id_token),
+            args.iterations,
+            cold=True,
+        )
+    finally:
+        db.delete(user)
+        db.commit()
+        db.close()
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
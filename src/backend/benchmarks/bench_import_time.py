@@ -0,0 +1,79 @@
+"""
+Measure the cold-start import cost of a module (``app.main`` by default).
+
+Each run is a fresh interpreter with ``-X importtime``; the report shows the
+median total import time and, for the median run, the self time summed per
+top-level package (numpy, langchain, app, ...), which is where startup time
+goes.
+
+    python -m benchmarks.bench_import_time --runs 5 --top 15
+"""
+
+import argparse
+import os
+import re
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+BACKEND_DIR = Path(__file__).resolve().parents[1]
+
+# "import time:   self [us] | cumulative | imported package"
+_LINE = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \|(\s*)(\S.*)$")
+
+
+def measure_import(
+    module: str = "app.main", env: Optional[Dict[str, str]] = None
+) -> Tuple[float, Dict[str, float]]:
+    """
+    Import ``module`` in a fresh interpreter; return the total import time in
+    seconds and the self time in seconds per top-level package.
+    """
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=BACKEND_DIR,
+        env=env if env is not None else os.environ.copy(),
+        capture_output=True,
+        text=True,
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"import {module} failed:\n{result.stderr[-2000:]}")
+    total, packages = 0.0, {}
+    for line in result.stderr.splitlines():
+        match = _LINE.match(line)
+        if not match:
+            continue
+        package = match.group(4).strip().split(".")[0]
+        packages[package] = packages.get(package, 0.0) + int(match.group(1)) / 1e6
+        if len(match.group(3)) == 1:
+            total += int(match.group(2)) / 1e6
+    return total, packages
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--module", default="app.main")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--top", type=int, default=15)
+    args = parser.parse_args(argv)
+
+    runs = sorted(
+        (measure_import(args.module) for _ in range(args.runs)),
+        key=lambda run: run[0],
+    )
+    total, packages = runs[len(runs) // 2]
+    print(
+        f"import {args.module}: median {total * 1000:.0f} ms "
+        f"(min {runs[0][0] * 1000:.0f} ms, max {runs[-1][0] * 1000:.0f} ms, "
+        f"{args.runs} runs)"
+    )
+    print(f"stdev {statistics.pstdev(run[0] for run in runs) * 1000:.0f} ms")
+    for name, seconds in sorted(packages.items(), key=lambda p: -p[1])[: args.top]:
+        print(f"{seconds * 1000:10.1f} ms  {name}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
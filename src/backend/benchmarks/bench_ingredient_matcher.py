@@ -0,0 +1,104 @@
+"""
+Measure matching generated recipe ingredients to inventory names:
+
+- scan:    the linear substring scan over the lower-cased inventory
+- build:   building an IngredientMatcher and matching once
+- matcher: matching with an already built (cached) IngredientMatcher
+
+    python -m benchmarks.bench_ingredient_matcher --items 500 --generated 30
+"""
+
+import argparse
+import random
+import time
+
+from app.services.ingredient_matcher import IngredientMatcher, clean_ingredient
+
+FOODS = [
+    "chicken breast",
+    "rice",
+    "egg",
+    "milk",
+    "tomato",
+    "onion",
+    "oat",
+    "black bean",
+    "spinach",
+    "salmon",
+    "yogurt",
+    "broccoli",
+    "potato",
+    "lentil",
+    "tofu",
+]
+QUALIFIERS = ["brown", "organic", "frozen", "smoked", "fresh", "canned", "dried"]
+UNITS = ["grams", "cups", "tbsp", "pieces", "oz"]
+
+
+def _inventory(rng, size):
+    names = []
+    for n in range(size):
+        names.append(f"{rng.choice(QUALIFIERS)} {rng.choice(FOODS)} {n}")
+    # The items a recipe actually uses sit at the end of a large pantry.
+    names[-len(FOODS) :] = FOODS
+    return names
+
+
+def _generated(rng, size):
+    lines = []
+    for n in range(size):
+        if n % 5 == 4:
+            food = "dragonfruit"  # nothing in the pantry
+        else:
+            food = rng.choice(FOODS)
+        lines.append(f"{n + 1}. {rng.randint(1, 300)} {rng.choice(UNITS)} {food}")
+    return lines
+
+
+def _scan(generated, inventory):
+    lowered = [name.lower() for name in inventory]
+    matched = []
+    for line in generated:
+        text = clean_ingredient(line).lower()
+        for index, name in enumerate(lowered):
+            if name in text or text in name:
+                matched.append(inventory[index])
+                break
+        else:
+            matched.append(clean_ingredient(line))
+    return list(dict.fromkeys(matched))
+
+
+def _time(label, fn, iterations):
+    start = time.perf_counter()
+    for _ in range(iterations):
+        fn()
+    elapsed = time.perf_counter() - start
+    print(f"{label:<8} {elapsed / iterations * 1e6:10.1f} us/recipe")
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--items", type=int, default=500)
+    parser.add_argument("--generated", type=int, default=30)
+    parser.add_argument("--iterations", type=int, default=200)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    rng = random.Random(args.seed)
+    inventory = _inventory(rng, args.items)
+    generated = _generated(rng, args.generated)
+    matcher = IngredientMatcher(inventory)
+
+    _time("scan", lambda: _scan(generated, inventory), args.iterations)
+    _time(
+        "build",
+        lambda: IngredientMatcher(inventory).match_all(generated),
+        args.iterations,
+    )
+    _time("matcher", lambda: matcher.match_all(generated), args.iterations)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -104,3 +104,25 @@ def test_create_token_with_negative_expiry():
 
     with pytest.raises(ExpiredSignatureError, match="Signature has expired."):
         jwt.decode(token, settings.JWT_SECRET_KEY, algorithms=[settings.JWT_ALGORITHM])
+
+
+def test_verify_access_token_cached_skips_decode(monkeypatch):
+    """
+    A cached token is returned without decoding it again.
+    """
+    token = JWTService.create_access_token({"sub": "cached@example.com"})
+    first = JWTService.verify_access_token_cached(token)
+    assert first.sub == "cached@example.com"
+
+    def _fail(token):
+        raise AssertionError("token decoded twice")
+
+    monkeypatch.setattr(JWTService, "verify_access_token", staticmethod(_fail))
+    assert JWTService.verify_access_token_cached(token) is first
+
+
+def test_verify_access_token_cached_rejects_invalid():
+    """
+    Invalid tokens are not cached and still fail.
+    """
+    assert JWTService.verify_access_token_cached("not-a-token") is None
@@ -1,5 +1,7 @@
 import sys
+import asyncio
 import os
+import uuid
 
 # Add the project root to the sys.path
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
@@ -14,8 +16,18 @@ if os.environ.get("DATABASE_URL_TEST"):
 
 import pytest
 from app.db import engine, SessionLocal, Base
+from app.db.async_session import create_async_db_engine
+from app.auth import auth_service
 from app.auth.auth_service import JWTService
+from app.api import deps
+from app.main import app
+from app.models import Inventory, User
+from app.middleware import rate_limit
+from app.services import user_service
+from app.services.recipe_cache import recipe_cache
 import sqlalchemy
+from sqlalchemy.ext.asyncio import async_sessionmaker
+from sqlalchemy.pool import NullPool
 
 
 @pytest.fixture(scope="function")
@@ -32,15 +44,72 @@ def create_all_tables():
     Base.metadata.create_all(bind=engine)
 
 
+@pytest.fixture(scope="session", autouse=True)
+def async_db_override():
+    # TestClient runs every request on a fresh event loop, so asyncpg
+    # connections cannot be pooled across requests.
+    factory = async_sessionmaker(
+        bind=create_async_db_engine(poolclass=NullPool),
+        autoflush=False,
+        expire_on_commit=False,
+    )
+
+    async def _get_async_db():
+        async with factory() as session:
+            yield session
+
+    app.dependency_overrides[deps.get_async_db] = _get_async_db
+    yield
+    app.dependency_overrides.pop(deps.get_async_db, None)
+
+
+@pytest.fixture
+def pantry_items():
+    """
+    Inventory of pantry_user, as Inventory keyword arguments. Override it in
+    a module, or parametrize it, for another pantry.
+    """
+    return [
+        {"name": "Chicken Breast", "quantity": 2},
+        {"name": "Rice", "quantity": 1},
+    ]
+
+
+@pytest.fixture
+def pantry_user(db, pantry_items):
+    user = User(id=uuid.uuid4(), email="chef@example.com", hashed_password="x")
+    db.add(user)
+    db.commit()
+    db.add_all(Inventory(user_id=user.id, **item) for item in pantry_items)
+    db.commit()
+    return user
+
+
 @pytest.fixture
 def auth_header_for_user():
     def _make(user):
-        token = JWTService.create_access_token({"sub": str(user.email)})
+        token = JWTService.create_access_token({"sub": str(user.id)})
         return {"Authorization": f"Bearer {token}"}
 
     return _make
 
 
+@pytest.fixture(autouse=True)
+def clear_auth_caches():
+    # Rows are wiped between tests, so cached users would point at stale ids.
+    yield
+    auth_service._token_cache.clear()
+    auth_service._denylist.clear()
+    user_service._user_cache.clear()
+
+
+@pytest.fixture(autouse=True)
+def reset_rate_limits():
+    # Every TestClient request comes from the same "testclient" address.
+    yield
+    asyncio.run(rate_limit.get_backend().reset())
+
+
 @pytest.fixture(autouse=True)
 def clean_tables(db):
     meta = sqlalchemy.MetaData()
@@ -48,3 +117,10 @@ def clean_tables(db):
     for table in reversed(meta.sorted_tables):
         db.execute(table.delete())
     db.commit()
+
+
+@pytest.fixture(autouse=True)
+def clear_recipe_cache():
+    # Tests reuse the same pantries with different fake generators.
+    yield
+    recipe_cache.clear()
@@ -0,0 +1,118 @@
+import uuid
+from datetime import datetime, timedelta, timezone
+from zoneinfo import ZoneInfo
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.enums import ActivityLevelEnum, AlertTypeEnum, FitnessGoalEnum, SexEnum
+from app.main import app
+from app.models import Alert, ConsumptionLog, Inventory, User
+from app.services import alert_service
+
+client = TestClient(app)
+
+NOW = datetime(2025, 8, 16, 6, 0, tzinfo=timezone.utc)
+
+
+def _inventory(user, name, expiry_date, quantity=1.0):
+    return Inventory(
+        id=uuid.uuid4(),
+        user_id=user.id,
+        name=name,
+        quantity=quantity,
+        calories_per_serving=100,
+        protein_g_per_serving=5,
+        carbs_g_per_serving=10,
+        fats_g_per_serving=2,
+        serving_size_unit="g",
+        expiry_date=expiry_date,
+        source="manual",
+    )
+
+
+@pytest.fixture
+def seed_user(db):
+    user = User(
+        id=uuid.uuid4(),
+        email="alerts@example.com",
+        hashed_password="fakehash",
+        height=180,
+        weight=80,
+        age=30,
+        sex=SexEnum.male,
+        activity_level=ActivityLevelEnum.moderate,
+        fitness_goal=FitnessGoalEnum.maintain,
+        timezone="Asia/Kolkata",
+    )
+    db.add(user)
+    db.commit()
+    today = NOW.astimezone(ZoneInfo("Asia/Kolkata")).date()
+    db.add_all(
+        [
+            _inventory(user, "Milk", today + timedelta(days=1)),
+            _inventory(user, "Rice", today + timedelta(days=30)),
+            _inventory(user, "Empty Yogurt", today, quantity=0),
+        ]
+    )
+    # Yesterday (local) the user ate far below their ~2800 kcal target.
+    db.add(
+        ConsumptionLog(
+            user_id=user.id,
+            item_name="Milk",
+            quantity_consumed=1,
+            calories_consumed=900,
+            protein_consumed_g=30,
+            carbs_consumed_g=50,
+            fats_consumed_g=20,
+            consumed_at=(NOW - timedelta(days=1)).replace(tzinfo=None),
+        )
+    )
+    db.commit()
+    return user
+
+
+def test_evaluate_alerts_writes_expiry_and_calorie_alerts(db, seed_user):
+    written = alert_service.evaluate_alerts(now=NOW, max_workers=1)
+    assert written == 2
+
+    alerts = db.query(Alert).filter(Alert.user_id == seed_user.id).all()
+    by_type = {alert.alert_type: alert for alert in alerts}
+    assert by_type[AlertTypeEnum.expiry].message == "Milk expires tomorrow"
+    assert "below" in by_type[AlertTypeEnum.calorie_intake].message
+
+    db.refresh(seed_user)
+    assert seed_user.alerts_evaluated_on == by_type[AlertTypeEnum.expiry].alert_date
+
+
+def test_evaluate_alerts_runs_once_per_local_day(db, seed_user):
+    alert_service.evaluate_alerts(now=NOW, max_workers=1)
+    assert alert_service.evaluate_alerts(now=NOW, max_workers=1) == 0
+    assert db.query(Alert).count() == 2
+
+    # The next local day re-evaluates and replaces nothing from the previous
+    # day: only "Milk expires today" is new (no intake was logged yesterday).
+    alert_service.evaluate_alerts(now=NOW + timedelta(days=1), max_workers=1)
+    assert db.query(Alert).filter(Alert.user_id == seed_user.id).count() == 3
+    active = alert_service.get_active_alerts(db, seed_user.id)
+    assert [alert.message for alert in active] == ["Milk expires today"]
+
+
+def test_active_alerts_cleared_by_empty_evaluation(db, seed_user):
+    alert_service.evaluate_alerts(now=NOW, max_workers=1)
+    assert len(alert_service.get_active_alerts(db, seed_user.id)) == 2
+
+    db.query(Inventory).filter(Inventory.name == "Milk").update({"quantity": 0})
+    db.commit()
+    for days in (1, 5):
+        alert_service.evaluate_alerts(now=NOW + timedelta(days=days), max_workers=1)
+        db.expire_all()
+        assert alert_service.get_active_alerts(db, seed_user.id) == []
+
+
+def test_get_alerts_endpoint(seed_user, auth_header_for_user):
+    alert_service.evaluate_alerts(now=NOW, max_workers=1)
+    resp = client.get("/api/v1/alerts/", headers=auth_header_for_user(seed_user))
+    assert resp.status_code == 200
+    data = resp.json()
+    assert {item["alert_type"] for item in data} == {"expiry", "calorie_intake"}
@@ -0,0 +1,111 @@
+import asyncio
+import threading
+import uuid
+
+from sqlalchemy.ext.asyncio import async_sessionmaker
+from sqlalchemy.pool import NullPool
+
+from app.core import security
+from app.db.async_session import create_async_db_engine, to_async_url
+from app.models import User
+from app.schemas.inventory import InventoryCreate
+from app.schemas.user import UserCreate
+from app.services import inventory_service, user_service
+
+
+def test_to_async_url_swaps_driver():
+    url = "postgresql+psycopg2://u:p@db:5432/fiteats?host=/tmp/pg"
+    assert to_async_url(url).startswith("postgresql+asyncpg://u:p@db:5432/fiteats?")
+    assert to_async_url("postgresql://u@db/x").startswith("postgresql+asyncpg://")
+
+
+def _run(coro_fn):
+    async def _main():
+        engine = create_async_db_engine(poolclass=NullPool)
+        try:
+            factory = async_sessionmaker(bind=engine, expire_on_commit=False)
+            async with factory() as session:
+                return await coro_fn(session)
+        finally:
+            await engine.dispose()
+
+    return asyncio.run(_main())
+
+
+def test_async_inventory_and_user_services(db):
+    user = User(id=uuid.uuid4(), email="async@example.com", hashed_password="x")
+    db.add(user)
+    db.commit()
+
+    async def scenario(session):
+        created = await inventory_service.async_create_inventory_item(
+            session,
+            user,
+            InventoryCreate(
+                name="Eggs",
+                quantity=6,
+                calories_per_serving=70,
+                protein_g_per_serving=6,
+                carbs_g_per_serving=0.5,
+                fats_g_per_serving=5,
+                serving_size_unit="egg",
+                expiry_date=None,
+                source="manual",
+            ),
+        )
+        total, items = await inventory_service.async_list_inventory(session, 1, 10)
+        detail = await inventory_service.async_get_inventory_detail(
+            session, created.id, "consumption_logs"
+        )
+        fetched = await user_service.async_get_user_by_email(
+            session, "async@example.com"
+        )
+        updated = await user_service.async_update_user(session, fetched, {"weight": 70})
+        deleted = await inventory_service.async_delete_inventory_item(
+            session, user, created.id
+        )
+        return total, items, detail, updated, deleted
+
+    total, items, detail, updated, deleted = _run(scenario)
+    assert total == 1 and items[0].name == "Eggs"
+    assert detail.consumption_logs == []
+    assert updated.weight == 70
+    assert deleted is not None
+
+    db.expire_all()
+    assert db.get(User, user.id).weight == 70
+
+
+def test_async_password_work_runs_off_the_event_loop(db, monkeypatch):
+    threads = []
+    real_hash, real_verify = security.get_password_hash, security.verify_and_update
+
+    def _hash(password):
+        threads.append(threading.get_ident())
+        return real_hash(password)
+
+    def _verify(password, hashed):
+        threads.append(threading.get_ident())
+        return real_verify(password, hashed)
+
+    monkeypatch.setattr(security, "get_password_hash", _hash)
+    monkeypatch.setattr(security, "verify_and_update", _verify)
+
+    async def scenario(session):
+        loop_thread = threading.get_ident()
+        await user_service.async_create_user(
+            session, UserCreate(email="offloop@example.com", password="secret123")
+        )
+        user = await user_service.async_authenticate_user(
+            session, "offloop@example.com", "secret123"
+        )
+        await user_service.async_update_user(session, user, {"password": "other456"})
+        wrong = await user_service.async_authenticate_user(
+            session, "offloop@example.com", "secret123"
+        )
+        return loop_thread, user, wrong
+
+    loop_thread, user, wrong = _run(scenario)
+    assert user is not None and wrong is None
+    assert len(threads) == 4
+    assert loop_thread not in threads
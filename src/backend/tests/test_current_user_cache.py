@@ -0,0 +1,72 @@
+import uuid
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.api import deps
+from app.main import app
+from app.models.user import User
+from app.services import user_service
+from app.utils.cache import LRUCache
+
+client = TestClient(app)
+
+
+@pytest.fixture(autouse=True)
+def real_auth(monkeypatch):
+    monkeypatch.delitem(app.dependency_overrides, deps.get_current_user, raising=False)
+
+
+def _make_user(db, email="cached@example.com"):
+    user = User(id=uuid.uuid4(), email=email, hashed_password="x", weight=80)
+    db.add(user)
+    db.commit()
+    return user
+
+
+def test_lru_cache_ttl_expiry(monkeypatch):
+    now = [100.0]
+    monkeypatch.setattr("app.utils.cache.time.monotonic", lambda: now[0])
+    cache = LRUCache(maxsize=2, ttl=10)
+    cache.set("a", 1)
+    cache.set("b", 2, ttl=30)
+    now[0] += 15
+    assert cache.get("a") is None
+    assert "a" not in cache
+    assert cache.get("b") == 2
+    cache.set("c", 3)
+    cache.set("d", 4)  # evicts "b", the least recently used
+    assert "b" not in cache and len(cache) == 2
+
+
+def test_get_current_user_served_from_cache(db, auth_header_for_user, monkeypatch):
+    user = _make_user(db)
+    headers = auth_header_for_user(user)
+    assert client.get("/api/v1/users/me", headers=headers).status_code == 200
+
+    def _no_db(*args, **kwargs):
+        raise AssertionError("database queried on a warm request")
+
+    monkeypatch.setattr(user_service, "get_user", _no_db)
+    resp = client.get("/api/v1/users/me", headers=headers)
+    assert resp.status_code == 200
+    assert resp.json()["id"] == str(user.id)
+
+
+def test_update_user_invalidates_cached_snapshot(db, auth_header_for_user):
+    user = _make_user(db)
+    headers = auth_header_for_user(user)
+    assert client.get("/api/v1/users/me", headers=headers).json()["weight"] == 80
+
+    user_service.update_user(db, user, {"weight": 75})
+    assert client.get("/api/v1/users/me", headers=headers).json()["weight"] == 75
+
+
+def test_email_change_drops_old_cache_entry(db):
+    user = _make_user(db)
+    assert user_service.get_user_snapshot_by_email(db, user.email) is not None
+
+    user_service.update_user(db, user, {"email": "renamed@example.com"})
+    assert user_service.get_user_snapshot_by_email(db, "cached@example.com") is None
+    snapshot = user_service.get_user_snapshot_by_email(db, "renamed@example.com")
+    assert snapshot.id == user.id
@@ -0,0 +1,162 @@
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, text
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.pool import NullPool
+
+from app.db import DATABASE_URL
+from app.db import pool as db_pool
+from app.db.settings import DatabaseSettings
+from app.core.config import settings
+from app.main import app
+from app.utils.metrics import MetricsRegistry
+
+client = TestClient(app)
+
+BACKEND_DIR = Path(__file__).resolve().parents[1]
+
+
+def _settings(**overrides):
+    return DatabaseSettings(**overrides)
+
+
+def test_engine_kwargs_from_settings():
+    kwargs = db_pool.engine_kwargs(
+        "sync",
+        settings=_settings(
+            DB_POOL_SIZE=7, DB_MAX_OVERFLOW=3, DB_STATEMENT_TIMEOUT_MS=2500
+        ),
+    )
+    assert kwargs["poolclass"] is db_pool.InstrumentedQueuePool
+    assert kwargs["pool_size"] == 7
+    assert kwargs["max_overflow"] == 3
+    assert kwargs["connect_args"] == {
+        "options": "-c timezone=utc -c statement_timeout=2500"
+    }
+
+
+def test_engine_kwargs_pgbouncer_mode():
+    kwargs = db_pool.engine_kwargs(
+        "async", is_async=True, settings=_settings(DB_PGBOUNCER_MODE=True)
+    )
+    assert kwargs["poolclass"] is NullPool
+    assert "pool_size" not in kwargs
+    assert kwargs["connect_args"] == {
+        "server_settings": {"timezone": "utc"},
+        "statement_cache_size": 0,
+        "prepared_statement_cache_size": 0,
+    }
+
+
+def test_pgbouncer_mode_sends_no_startup_options():
+    settings = _settings(DB_PGBOUNCER_MODE=True, DB_STATEMENT_TIMEOUT_MS=2500)
+    assert db_pool.engine_kwargs("sync", settings=settings)["connect_args"] == {}
+    connect_args = db_pool.engine_kwargs("async", is_async=True, settings=settings)[
+        "connect_args"
+    ]
+    assert connect_args["server_settings"] == {"timezone": "utc"}
+
+
+def test_pgbouncer_mode_sets_statement_timeout_per_transaction():
+    settings = _settings(DB_PGBOUNCER_MODE=True, DB_STATEMENT_TIMEOUT_MS=1234)
+    engine = create_engine(
+        DATABASE_URL, **db_pool.engine_kwargs("bouncer-test", settings=settings)
+    )
+    db_pool.apply_session_settings(engine, settings=settings)
+    try:
+        with engine.connect() as conn:
+            assert conn.execute(text("SHOW statement_timeout")).scalar() == "1234ms"
+            assert conn.execute(text("SHOW timezone")).scalar() == "UTC"
+            conn.commit()
+            # SET LOCAL ends with the transaction; the next one sets it again.
+            assert conn.execute(text("SHOW statement_timeout")).scalar() == "1234ms"
+    finally:
+        engine.dispose()
+
+
+def test_statement_timeout_applies_to_connections():
+    engine = create_engine(
+        DATABASE_URL,
+        **db_pool.engine_kwargs(
+            "timeout-test", settings=_settings(DB_STATEMENT_TIMEOUT_MS=1234)
+        ),
+    )
+    try:
+        with engine.connect() as conn:
+            assert conn.execute(text("SHOW statement_timeout")).scalar() == "1234ms"
+    finally:
+        engine.dispose()
+
+
+def test_pool_metrics_record_checkout_and_timeouts(monkeypatch):
+    registry = MetricsRegistry()
+    for attr, factory, name in [
+        ("checkout_wait_seconds", registry.histogram, "wait"),
+        ("checked_out_connections", registry.gauge, "checked_out"),
+        ("overflow_connections", registry.gauge, "overflow"),
+        ("checkout_timeouts", registry.counter, "timeouts"),
+    ]:
+        monkeypatch.setattr(db_pool, attr, factory(name, name))
+
+    engine = create_engine(
+        DATABASE_URL,
+        **db_pool.engine_kwargs("tiny", pool_size=1, max_overflow=0, pool_timeout=0.05),
+    )
+    db_pool.instrument_engine(engine, "tiny")
+    try:
+        conn = engine.connect()
+        assert registry.get("checked_out").value(pool="tiny") == 1
+        assert registry.get("overflow").value(pool="tiny") == 0
+        with pytest.raises(PoolTimeoutError):
+            engine.connect()
+        assert registry.get("timeouts").value(pool="tiny") == 1
+        assert registry.get("wait").count(pool="tiny") == 2
+        assert registry.get("wait").sum(pool="tiny") >= 0.05
+        conn.close()
+        assert registry.get("checked_out").value(pool="tiny") == 0
+    finally:
+        engine.dispose()
+
+
+def test_metrics_endpoint_requires_token(db, monkeypatch):
+    db.execute(text("SELECT 1"))
+    assert client.get("/api/v1/metrics/").status_code == 404
+    monkeypatch.setattr(settings, "METRICS_TOKEN", None)
+    assert client.get("/metrics").status_code == 404
+
+    monkeypatch.setattr(settings, "METRICS_TOKEN", "scrape-me")
+    assert client.get("/metrics").status_code == 401
+    resp = client.get("/metrics", headers={"Authorization": "Bearer wrong"})
+    assert resp.status_code == 401
+
+    resp = client.get("/metrics", headers={"Authorization": "Bearer scrape-me"})
+    assert resp.status_code == 200
+    assert resp.headers["content-type"].startswith("text/plain")
+    assert 'db_pool_checkout_wait_seconds_count{pool="sync"}' in resp.text
+
+
+def test_db_package_imports_without_api_settings():
+    # Jobs only need DATABASE_URL; app.db must not pull in app.core.config.
+    env = {
+        key: value
+        for key, value in os.environ.items()
+        if key not in ("JWT_SECRET_KEY", "GEMINI_API_KEY", "DATABASE_URL_TEST")
+    }
+    env["DATABASE_URL"] = DATABASE_URL
+    code = (
+        "import sys, app.db, app.db.async_session; "
+        "assert 'app.core.config' not in sys.modules"
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", code],
+        cwd=BACKEND_DIR,
+        env=env,
+        capture_output=True,
+        text=True,
+    )
+    assert result.returncode == 0, result.stderr
@@ -0,0 +1,95 @@
+import io
+import uuid
+from datetime import datetime, timedelta
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.enums import ExportDatasetEnum, ExportFormatEnum
+from app.main import app
+from app.models import ConsumptionLog, Inventory, User
+from app.services import export_service
+
+pa = pytest.importorskip("pyarrow")
+pq = pytest.importorskip("pyarrow.parquet")
+
+client = TestClient(app)
+
+
+@pytest.fixture
+def seed_history(db):
+    users = [
+        User(id=uuid.uuid4(), email=f"export{i}@example.com", hashed_password="x")
+        for i in range(2)
+    ]
+    db.add_all(users)
+    db.commit()
+    for user in users:
+        db.add_all(
+            ConsumptionLog(
+                user_id=user.id,
+                item_name=f"Item {i}",
+                quantity_consumed=1,
+                calories_consumed=100 + i,
+                protein_consumed_g=5,
+                carbs_consumed_g=10,
+                fats_consumed_g=2,
+                consumed_at=datetime.utcnow() - timedelta(hours=i),
+            )
+            for i in range(25)
+        )
+        db.add(
+            Inventory(
+                user_id=user.id,
+                name="Oats",
+                quantity=2,
+                expiry_date=datetime.utcnow().date() + timedelta(days=5),
+            )
+        )
+    db.commit()
+    return users
+
+
+def test_iter_record_batches_is_chunked(db, seed_history):
+    batches = list(
+        export_service.iter_record_batches(
+            db, ExportDatasetEnum.consumption_log, chunk_size=10
+        )
+    )
+    assert [batch.num_rows for batch in batches] == [10, 10, 10, 10, 10]
+    assert batches[0].schema.field("calories_consumed").type == pa.float64()
+    assert batches[0].schema.field("user_id").type == pa.string()
+
+
+def test_stream_export_parquet_roundtrip(db, seed_history):
+    user = seed_history[0]
+    data = b"".join(
+        export_service.stream_export(
+            db,
+            ExportDatasetEnum.consumption_log,
+            ExportFormatEnum.parquet,
+            user_id=user.id,
+            chunk_size=10,
+        )
+    )
+    table = pq.read_table(io.BytesIO(data))
+    assert table.num_rows == 25
+    assert set(table.column("user_id").to_pylist()) == {str(user.id)}
+    assert pq.ParquetFile(io.BytesIO(data)).num_row_groups == 3
+
+
+def test_export_endpoint_streams_only_current_user(seed_history, auth_header_for_user):
+    user = seed_history[1]
+    resp = client.get(
+        "/api/v1/export/inventory?format=arrow", headers=auth_header_for_user(user)
+    )
+    assert resp.status_code == 200
+    assert resp.headers["content-type"] == "application/vnd.apache.arrow.stream"
+    table = pa.ipc.open_stream(resp.content).read_all()
+    assert table.column("name").to_pylist() == ["Oats"]
+    assert table.column("user_id").to_pylist() == [str(user.id)]
+
+
+def test_export_endpoint_requires_auth():
+    resp = client.get("/api/v1/export/consumption_log")
+    assert resp.status_code == 401
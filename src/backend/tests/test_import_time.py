@@ -0,0 +1,56 @@
+import os
+import subprocess
+import sys
+
+from app.core.config import settings
+from app.db import DATABASE_URL
+from benchmarks.bench_import_time import BACKEND_DIR, measure_import
+
+# Modules that must only load when detection or recipe generation runs.
+HEAVY_MODULES = (
+    "cv2",
+    "numpy",
+    "ultralytics",
+    "torch",
+    "langchain",
+    "langchain_core",
+    "langchain_google_genai",
+)
+
+# Cold `import app.main` took ~1.4 s here after lazy loading (~2.5 s before);
+# the budget leaves headroom for slower CI machines.
+IMPORT_TIME_BUDGET_SECONDS = float(os.getenv("IMPORT_TIME_BUDGET_SECONDS", "3.0"))
+
+
+def _env():
+    # test_core_config pops some of these from os.environ.
+    return {
+        **os.environ,
+        "DATABASE_URL": DATABASE_URL,
+        "JWT_SECRET_KEY": settings.JWT_SECRET_KEY,
+        "GEMINI_API_KEY": settings.GEMINI_API_KEY,
+    }
+
+
+def test_app_import_skips_heavy_ml_modules():
+    code = (
+        "import sys, app.main; "
+        f"print(','.join(m for m in {HEAVY_MODULES!r} if m in sys.modules))"
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", code],
+        cwd=BACKEND_DIR,
+        env=_env(),
+        capture_output=True,
+        text=True,
+    )
+    assert result.returncode == 0, result.stderr
+    assert result.stdout.strip() == ""
+
+
+def test_app_cold_import_within_budget():
+    best = min(measure_import("app.main", env=_env())[0] for _ in range(3))
+    assert best <= IMPORT_TIME_BUDGET_SECONDS, (
+        f"import app.main took {best:.2f}s (budget {IMPORT_TIME_BUDGET_SECONDS}s); "
+        "run python -m benchmarks.bench_import_time to see which packages grew"
+    )
@@ -0,0 +1,80 @@
+import random
+
+from app.services import ingredient_matcher
+from app.services.ingredient_matcher import (
+    IngredientMatcher,
+    clean_ingredient,
+    matcher_for,
+)
+from app.services.recipe_service import RecipeService
+
+FOODS = ["chicken", "rice", "egg", "milk", "tomato", "onion", "oat", "bean"]
+ADJECTIVES = ["brown", "red", "green", "whole", "smoked", "fresh", ""]
+
+
+def _scan(generated, inventory):
+    """Reference: the linear substring scan the matcher replaces."""
+    lowered = [name.lower() for name in inventory]
+    result = []
+    for line in generated:
+        text = clean_ingredient(line).lower()
+        for index, name in enumerate(lowered):
+            if name in text or text in name:
+                result.append(inventory[index])
+                break
+        else:
+            result.append(clean_ingredient(line))
+    return list(dict.fromkeys(result))
+
+
+def _name(rng):
+    return " ".join(filter(None, [rng.choice(ADJECTIVES), rng.choice(FOODS)]))
+
+
+def test_cleans_list_markers_measurements_and_notes():
+    assert clean_ingredient("2. 200 grams Chicken Breast (diced)") == "Chicken Breast"
+    assert clean_ingredient("- 1 cup rice") == "rice"
+
+
+def test_first_inventory_item_wins_in_both_directions():
+    matcher = IngredientMatcher(["Brown Rice", "Rice", "Chicken Breast"])
+    # "rice" occurs in "Brown Rice" and "Rice" in "rice": the first wins.
+    assert matcher.match("rice") == "Brown Rice"
+    assert matcher.match("1 cup rice") == "Rice"
+    assert matcher.match("chicken") == "Chicken Breast"
+    assert matcher.match("grilled chicken breast fillet") == "Chicken Breast"
+
+
+def test_matches_the_linear_scan(monkeypatch):
+    # The scan had no fuzzy fallback.
+    monkeypatch.setattr(ingredient_matcher, "FUZZY_CUTOFF", 1.01)
+    rng = random.Random(7)
+    for _ in range(200):
+        inventory = list(dict.fromkeys(_name(rng) for _ in range(rng.randint(1, 12))))
+        generated = [
+            f"{rng.randint(1, 3)} cups {_name(rng)} ({rng.choice(FOODS)})"
+            for _ in range(rng.randint(1, 6))
+        ]
+        assert IngredientMatcher(inventory).match_all(generated) == _scan(
+            generated, inventory
+        )
+
+
+def test_fuzzy_fallback_for_misspellings():
+    matcher = IngredientMatcher(["Broccoli", "Greek Yogurt", "Salmon"])
+    assert matcher.match("1 cup brocolli") == "Broccoli"
+    assert matcher.match("greek yoghurt") == "Greek Yogurt"
+    assert matcher.match("olive oil (to drizzle)") == "olive oil"
+
+
+def test_service_dedups_and_drops_empty_lines():
+    service = RecipeService(recipe_generator=object())
+    assert service._match_ingredients(
+        ["200 grams chicken", "1 cup rice", "(to taste)", "chicken thigh"],
+        ["Chicken", "Rice"],
+    ) == ["Chicken", "Rice"]
+
+
+def test_matchers_are_reused_per_inventory():
+    assert matcher_for(["Oats", "Milk"]) is matcher_for(("Oats", "Milk"))
+    assert matcher_for(["Oats", "Milk"]) is not matcher_for(["Milk", "Oats"])
@@ -0,0 +1,299 @@
+import asyncio
+import time
+import uuid
+
+import pytest
+from fastapi.testclient import TestClient
+from langchain_core.runnables import RunnableLambda
+
+from app.core.config import settings
+from app.main import app
+from app.models import Inventory, User
+from app.services.locator import locator
+from app.services.ml_services.recipe_generation.gemini_recipe_generator import (
+    GeminiRecipeGenerator,
+    RecipeSchema,
+)
+from app.services.recipe_service import RecipeService
+from app.utils import resilience
+from app.utils.resilience import (
+    CircuitBreaker,
+    CircuitOpenError,
+    LatencyWindow,
+    ResilientCaller,
+)
+
+client = TestClient(app)
+
+RECIPE = RecipeSchema(
+    title="Chicken Rice Bowl",
+    calories=550,
+    protein=40.0,
+    carbs=60.0,
+    fats=12.0,
+    ingredients=["200 grams chicken breast", "1 cup rice"],
+    directions="Cook the rice. Grill the chicken.",
+)
+
+
+class FaultyLLM:
+    """
+    Stands in for Gemini, following a script with one entry per call: an
+    exception is raised, a number is a latency in seconds before answering.
+    Calls past the end of the script answer at once.
+    """
+
+    def __init__(self, *script):
+        self.script = list(script)
+        self.calls = 0
+        self.cancelled = 0
+
+    def _next(self):
+        self.calls += 1
+        return self.script.pop(0) if self.script else 0
+
+    def invoke(self, prompt):
+        step = self._next()
+        if isinstance(step, Exception):
+            raise step
+        time.sleep(step)
+        return RECIPE
+
+    async def ainvoke(self, prompt):
+        step = self._next()
+        if isinstance(step, Exception):
+            raise step
+        try:
+            await asyncio.sleep(step)
+        except asyncio.CancelledError:
+            self.cancelled += 1
+            raise
+        return RECIPE
+
+    def runnable(self):
+        return RunnableLambda(self.invoke, afunc=self.ainvoke)
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def _caller(name, **kwargs):
+    breaker_kwargs = {
+        key: kwargs.pop(key)
+        for key in ("failure_threshold", "reset_timeout", "clock")
+        if key in kwargs
+    }
+    kwargs.setdefault("base_delay", 0)
+    return ResilientCaller(CircuitBreaker(name, **breaker_kwargs), **kwargs)
+
+
+def _generator(fake, caller):
+    return GeminiRecipeGenerator(model=fake.runnable(), resilience=caller)
+
+
+def test_transient_failures_are_retried():
+    fake = FaultyLLM(RuntimeError("503 overloaded"), RuntimeError("503 overloaded"))
+    generator = _generator(fake, _caller("retry-async", attempts=3))
+    before = resilience.call_retries.value(name="retry-async")
+
+    recipe = asyncio.run(generator.agenerate_recipe(["chicken", "rice"]))
+    assert recipe["title"] == "Chicken Rice Bowl"
+    assert fake.calls == 3
+    assert resilience.call_retries.value(name="retry-async") == before + 2
+
+
+def test_blocking_calls_are_retried_too():
+    fake = FaultyLLM(RuntimeError("503 overloaded"))
+    generator = _generator(fake, _caller("retry-sync", attempts=2))
+    assert generator.generate_recipe(["chicken"])["title"] == "Chicken Rice Bowl"
+    assert fake.calls == 2
+
+
+def test_retries_give_up_with_the_last_error():
+    fake = FaultyLLM(*[RuntimeError("quota exceeded")] * 3)
+    generator = _generator(fake, _caller("give-up", attempts=3))
+    with pytest.raises(RuntimeError, match="quota exceeded"):
+        asyncio.run(generator.agenerate_recipe(["chicken"]))
+    assert fake.calls == 3
+
+
+def test_each_attempt_has_its_own_timeout():
+    fake = FaultyLLM(5.0)
+    generator = _generator(fake, _caller("attempt-timeout", call_timeout=0.05))
+
+    started = time.perf_counter()
+    recipe = asyncio.run(generator.agenerate_recipe(["chicken"]))
+    assert time.perf_counter() - started < 1.0
+    assert recipe["title"] == "Chicken Rice Bowl"
+    assert fake.calls == 2
+    assert fake.cancelled == 1
+
+
+def test_last_attempt_timeout_is_reported():
+    fake = FaultyLLM(5.0, 5.0)
+    generator = _generator(
+        fake, _caller("timeout-report", attempts=2, call_timeout=0.05)
+    )
+    with pytest.raises(TimeoutError, match="timeout-report call timed out"):
+        asyncio.run(generator.agenerate_recipe(["chicken"]))
+
+
+def test_breaker_opens_fails_fast_and_recovers():
+    clock = FakeClock()
+    fake = FaultyLLM(RuntimeError("down"), RuntimeError("down"))
+    caller = _caller(
+        "breaker", attempts=1, failure_threshold=2, reset_timeout=30, clock=clock
+    )
+    generator = _generator(fake, caller)
+    rejected = resilience.breaker_rejections.value(name="breaker")
+
+    for _ in range(2):
+        with pytest.raises(RuntimeError, match="down"):
+            asyncio.run(generator.agenerate_recipe(["chicken"]))
+    assert caller.breaker.state == "open"
+    assert resilience.breaker_state.value(name="breaker") == 2
+
+    clock.now = 10
+    with pytest.raises(CircuitOpenError) as excinfo:
+        asyncio.run(generator.agenerate_recipe(["chicken"]))
+    assert excinfo.value.retry_after == pytest.approx(20)
+    assert fake.calls == 2
+    assert resilience.breaker_rejections.value(name="breaker") == rejected + 1
+
+    clock.now = 31
+    assert caller.breaker.state == "half_open"
+    assert asyncio.run(generator.agenerate_recipe(["chicken"]))["title"]
+    assert caller.breaker.state == "closed"
+    assert resilience.breaker_state.value(name="breaker") == 0
+
+
+def test_half_open_allows_one_trial_and_reopens_on_failure():
+    clock = FakeClock()
+    breaker = CircuitBreaker("trial", failure_threshold=1, reset_timeout=5, clock=clock)
+    breaker.record_failure()
+    clock.now = 5
+
+    breaker.before_call()
+    with pytest.raises(CircuitOpenError):
+        breaker.before_call()
+    breaker.record_failure()
+    assert breaker.state == "open"
+
+    clock.now = 10
+    breaker.before_call()
+    breaker.abandon()
+    breaker.before_call()
+
+
+def test_blocking_retries_stop_at_the_deadline():
+    fake = FaultyLLM(*[RuntimeError("503 overloaded")] * 5)
+    caller = _caller("deadline-sync", attempts=5, call_timeout=1.0)
+    with pytest.raises(RuntimeError, match="503"):
+        caller.call(lambda: fake.invoke("p"), deadline=time.monotonic() + 0.5)
+    # A retry would need its full call_timeout, which does not fit.
+    assert fake.calls == 1
+
+    fake = FaultyLLM(RuntimeError("503 overloaded"))
+    caller = _caller("deadline-sync", attempts=5, call_timeout=1.0)
+    assert (
+        caller.call(lambda: fake.invoke("p"), deadline=time.monotonic() + 5) == RECIPE
+    )
+    assert fake.calls == 2
+
+
+def test_async_retries_stop_at_the_deadline():
+    fake = FaultyLLM(*[RuntimeError("503 overloaded")] * 5)
+    caller = _caller("deadline-async", attempts=5, call_timeout=1.0)
+    with pytest.raises(RuntimeError, match="503"):
+        asyncio.run(
+            caller.acall(lambda: fake.ainvoke("p"), deadline=time.monotonic() + 0.5)
+        )
+    assert fake.calls == 1
+
+
+def test_breaker_counts_calls_not_attempts():
+    fake = FaultyLLM(*[RuntimeError("down")] * 6)
+    caller = _caller("per-call", attempts=3, failure_threshold=2)
+    with pytest.raises(RuntimeError):
+        caller.call(lambda: fake.invoke("p"))
+    assert fake.calls == 3
+    assert caller.breaker.state == "closed"
+    with pytest.raises(RuntimeError):
+        caller.call(lambda: fake.invoke("p"))
+    assert caller.breaker.state == "open"
+
+
+def test_half_open_trial_may_retry():
+    clock = FakeClock()
+    caller = _caller(
+        "trial-retry", attempts=2, failure_threshold=1, reset_timeout=5, clock=clock
+    )
+    caller.breaker.record_failure()
+    clock.now = 5
+    fake = FaultyLLM(RuntimeError("blip"))
+    assert asyncio.run(caller.acall(lambda: fake.ainvoke("p"))) == RECIPE
+    assert fake.calls == 2
+    assert caller.breaker.state == "closed"
+
+
+def test_slow_call_is_hedged():
+    latencies = LatencyWindow(min_samples=5)
+    for _ in range(5):
+        latencies.observe(0.01)
+    fake = FaultyLLM(5.0, 0.0)
+    generator = _generator(
+        fake, _caller("hedged", hedge_quantile=0.9, latencies=latencies)
+    )
+    before = resilience.hedged_calls.value(name="hedged", winner="hedge")
+
+    started = time.perf_counter()
+    recipe = asyncio.run(generator.agenerate_recipe(["chicken"]))
+    assert time.perf_counter() - started < 1.0
+    assert recipe["title"] == "Chicken Rice Bowl"
+    assert fake.calls == 2
+    assert fake.cancelled == 1
+    assert resilience.hedged_calls.value(name="hedged", winner="hedge") == before + 1
+
+
+def test_no_hedge_without_a_free_slot(monkeypatch):
+    monkeypatch.setattr(settings, "RECIPE_LLM_MAX_CONCURRENCY", 1)
+    latencies = LatencyWindow(min_samples=5)
+    for _ in range(5):
+        latencies.observe(0.001)
+    fake = FaultyLLM(0.1)
+    generator = _generator(
+        fake, _caller("unhedged", hedge_quantile=0.9, latencies=latencies)
+    )
+
+    asyncio.run(generator.agenerate_recipe(["chicken"]))
+    assert fake.calls == 1
+
+
+def test_open_circuit_is_a_503(db, auth_header_for_user, monkeypatch):
+    monkeypatch.setattr(settings, "RECIPE_LOCAL_FALLBACK_ENABLED", False)
+    user = User(id=uuid.uuid4(), email="breaker@example.com", hashed_password="x")
+    db.add(user)
+    db.add(Inventory(user_id=user.id, name="Chicken Breast", quantity=1))
+    db.commit()
+    caller = _caller("endpoint", attempts=1, failure_threshold=1)
+    caller.breaker.record_failure()
+    locator.override("recipe_generator", _generator(FaultyLLM(), caller))
+    try:
+        resp = client.post(
+            "/api/v1/recipe/generate-from-inventory",
+            headers=auth_header_for_user(user),
+        )
+    finally:
+        locator.reset("recipe_generator")
+    assert resp.status_code == 503
+    assert int(resp.headers["Retry-After"]) >= 1
+
+
+def test_stream_error_for_open_circuit():
+    error = RecipeService._stream_error(CircuitOpenError("gemini", 3.2))
+    assert error["status_code"] == 503
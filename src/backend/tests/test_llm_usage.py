@@ -0,0 +1,255 @@
+import asyncio
+import uuid
+from datetime import datetime, timedelta
+
+import pytest
+from fastapi import HTTPException
+from fastapi.testclient import TestClient
+from langchain_core.messages import AIMessage
+from langchain_core.runnables import RunnableLambda
+from sqlalchemy.ext.asyncio import async_sessionmaker
+from sqlalchemy.pool import NullPool
+
+from app.core.config import settings
+from app.db.async_session import create_async_db_engine
+from app.main import app
+from app.models import Inventory, LLMUsage, User
+from app.services import llm_usage, recipe_service
+from app.services.llm_usage import (
+    QuotaExceededError,
+    UsageTracker,
+    llm_usage_scope,
+    usage_tracker,
+)
+from app.services.locator import locator
+from app.services.ml_services.recipe_generation.gemini_recipe_generator import (
+    GeminiRecipeGenerator,
+    RecipeSchema,
+)
+from app.services.recipe_service import RecipeService
+from app.utils.resilience import CircuitBreaker, ResilientCaller
+
+client = TestClient(app)
+
+RECIPE = RecipeSchema(
+    title="Chicken Rice Bowl",
+    calories=550,
+    protein=40.0,
+    carbs=60.0,
+    fats=12.0,
+    ingredients=["200 grams chicken breast", "1 cup rice"],
+    directions="Cook the rice. Grill the chicken.",
+)
+
+
+def _answer(prompt_tokens=120, completion_tokens=80, error=None):
+    """A Gemini structured answer with include_raw: message, parsed, error."""
+    raw = AIMessage(
+        content="",
+        usage_metadata={
+            "input_tokens": prompt_tokens,
+            "output_tokens": completion_tokens,
+            "total_tokens": prompt_tokens + completion_tokens,
+        },
+    )
+    return {
+        "raw": raw,
+        "parsed": None if error else RECIPE,
+        "parsing_error": error,
+    }
+
+
+def _generator(*answers, attempts=1):
+    script = list(answers)
+
+    async def respond(prompt):
+        return script.pop(0) if script else _answer()
+
+    caller = ResilientCaller(
+        CircuitBreaker(f"usage-{uuid.uuid4()}"), attempts=attempts, base_delay=0
+    )
+    return GeminiRecipeGenerator(
+        model=RunnableLambda(lambda prompt: None, afunc=respond), resilience=caller
+    )
+
+
+def test_tokens_come_from_usage_metadata():
+    user_id = uuid.uuid4()
+    before = llm_usage.llm_tokens.value(endpoint="usage-test", kind="prompt")
+
+    async def scenario():
+        with llm_usage_scope(user_id, "usage-test"):
+            return await _generator(_answer(120, 80)).agenerate_recipe(["chicken"])
+
+    assert asyncio.run(scenario())["title"] == "Chicken Rice Bowl"
+    assert llm_usage.llm_tokens.value(endpoint="usage-test", kind="prompt") == (
+        before + 120
+    )
+    assert usage_tracker.tokens_today(user_id) == 200
+
+
+def test_tokens_are_estimated_without_metadata():
+    user_id = uuid.uuid4()
+    generator = GeminiRecipeGenerator(model=RunnableLambda(lambda prompt: RECIPE))
+    with llm_usage_scope(user_id, "usage-estimate"):
+        generator.generate_recipe(["chicken", "rice"])
+    completion = llm_usage.llm_tokens.value(
+        endpoint="usage-estimate", kind="completion"
+    )
+    assert completion > 0
+    assert usage_tracker.tokens_today(user_id) > completion
+
+
+def test_retried_attempts_and_their_tokens_add_up():
+    user_id = uuid.uuid4()
+    attempts = llm_usage.llm_attempts.value(endpoint="usage-retry")
+    generator = _generator(
+        _answer(100, 30, error=ValueError("not JSON")), _answer(100, 50), attempts=2
+    )
+
+    async def scenario():
+        with llm_usage_scope(user_id, "usage-retry"):
+            return await generator.agenerate_recipe(["chicken"])
+
+    assert asyncio.run(scenario())["title"] == "Chicken Rice Bowl"
+    assert llm_usage.llm_attempts.value(endpoint="usage-retry") == attempts + 2
+    assert usage_tracker.tokens_today(user_id) == 280
+
+
+def test_cache_hits_are_recorded():
+    generator = GeminiRecipeGenerator(model=RunnableLambda(lambda prompt: RECIPE))
+    service = RecipeService(recipe_generator=generator)
+    labels = {"endpoint": "usage-cache", "outcome": "cache_hit"}
+    before = llm_usage.llm_requests.value(**labels)
+
+    with llm_usage_scope(None, "usage-cache"):
+        service.get_recipes_by_ingredients(["Cache Chicken"])
+        service.get_recipes_by_ingredients(["Cache Chicken"])
+    assert llm_usage.llm_requests.value(**labels) == before + 1
+
+
+def test_quota_refuses_calls_until_the_next_day(monkeypatch):
+    now = [datetime(2025, 9, 8, 22, 0)]
+    tracker = UsageTracker(1, 10, 100, clock=lambda: now[0])
+    user_id = uuid.uuid4()
+
+    with llm_usage_scope(user_id, "usage-quota"):
+        call = tracker.start_call("fake")
+        call.add_tokens(60, 50)
+        tracker.finish_call(call, "ok")
+
+        monkeypatch.setattr(settings, "LLM_USER_DAILY_TOKEN_QUOTA", 100)
+        with pytest.raises(QuotaExceededError) as excinfo:
+            tracker.start_call("fake")
+        assert excinfo.value.retry_after == pytest.approx(2 * 3600)
+
+        now[0] += timedelta(hours=3)
+        tracker.start_call("fake")
+
+
+def test_quota_exhausted_is_a_429(db, auth_header_for_user, monkeypatch):
+    # The local fallback stays on (the default): it must not hide the quota.
+    fallbacks = recipe_service.local_fallbacks.value(reason="error")
+    monkeypatch.setattr(settings, "LLM_USER_DAILY_TOKEN_QUOTA", 150)
+    user = User(id=uuid.uuid4(), email="quota@example.com", hashed_password="x")
+    db.add(user)
+    db.add(Inventory(user_id=user.id, name="Chicken Breast", quantity=1))
+    db.commit()
+    locator.override("recipe_generator", _generator(_answer(120, 80)))
+    try:
+        first = client.post(
+            "/api/v1/recipe/generate-from-inventory",
+            headers=auth_header_for_user(user),
+        )
+        # A different pantry, so the recipe cache cannot answer.
+        db.add(Inventory(user_id=user.id, name="Brown Rice", quantity=1))
+        db.commit()
+        second = client.post(
+            "/api/v1/recipe/generate-from-inventory",
+            headers=auth_header_for_user(user),
+        )
+    finally:
+        locator.reset("recipe_generator")
+    assert first.status_code == 200
+    assert usage_tracker.tokens_today(user.id) == 200
+    assert second.status_code == 429
+    assert int(second.headers["Retry-After"]) >= 1
+    assert recipe_service.local_fallbacks.value(reason="error") == fallbacks
+
+
+def test_quota_is_not_answered_locally(monkeypatch):
+    monkeypatch.setattr(settings, "LLM_USER_DAILY_TOKEN_QUOTA", 1)
+    user_id = uuid.uuid4()
+    generator = GeminiRecipeGenerator(model=RunnableLambda(lambda prompt: RECIPE))
+    service = RecipeService(recipe_generator=generator)
+    with llm_usage_scope(user_id, "usage-local"):
+        service.get_recipes_by_ingredients(["Quota Chicken"])
+        for attempt in (
+            lambda: service.get_recipes_by_ingredients(["Quota Rice"]),
+            lambda: asyncio.run(
+                service.async_get_recipes_by_ingredients(["Quota Oats"])
+            ),
+        ):
+            with pytest.raises(HTTPException) as excinfo:
+                attempt()
+            assert excinfo.value.status_code == 429
+
+
+def test_rows_are_written_in_batches(db):
+    user = User(id=uuid.uuid4(), email="usage-rows@example.com", hashed_password="x")
+    db.add(user)
+    db.commit()
+    factory = async_sessionmaker(
+        bind=create_async_db_engine(poolclass=NullPool), expire_on_commit=False
+    )
+    tracker = UsageTracker(
+        flush_interval=60, batch_size=2, max_buffered=100, session_factory=factory
+    )
+    written = llm_usage.usage_rows_written.value()
+
+    async def scenario():
+        await tracker.start()
+        with llm_usage_scope(user.id, "usage-rows"):
+            for _ in range(2):
+                call = tracker.start_call("fake")
+                call.attempts = 1
+                call.add_tokens(10, 5)
+                tracker.finish_call(call, "ok")
+            # A full batch is written without waiting for the interval.
+            await asyncio.sleep(0.5)
+            assert llm_usage.usage_rows_written.value() == written + 2
+            tracker.record_cache_hit("recipe_cache")
+        await tracker.stop()
+
+    asyncio.run(scenario())
+    rows = db.query(LLMUsage).filter_by(user_id=user.id).all()
+    assert len(rows) == 3
+    assert sorted(row.prompt_tokens for row in rows) == [0, 10, 10]
+    assert [row.outcome for row in rows if row.cache_hit] == ["cache_hit"]
+    assert {row.endpoint for row in rows} == {"usage-rows"}
+
+
+def test_buffer_drops_the_oldest_rows_when_full():
+    tracker = UsageTracker(flush_interval=60, batch_size=100, max_buffered=2)
+    dropped = llm_usage.usage_rows_dropped.value(reason="overflow")
+
+    async def scenario():
+        await tracker.start()
+        for endpoint in ("a", "b", "c"):
+            with llm_usage_scope(None, endpoint):
+                tracker.record_cache_hit()
+        buffered = [row["endpoint"] for row in tracker._buffer]
+        tracker._task.cancel()
+        return buffered
+
+    assert asyncio.run(scenario()) == ["b", "c"]
+    assert llm_usage.usage_rows_dropped.value(reason="overflow") == dropped + 1
+
+
+def test_metrics_endpoint_exports_usage(monkeypatch):
+    monkeypatch.setattr(settings, "METRICS_TOKEN", "scrape")
+    with llm_usage_scope(None, "usage-export"):
+        usage_tracker.record_cache_hit()
+    text = client.get("/metrics", headers={"Authorization": "Bearer scrape"}).text
+    assert 'llm_requests_total{endpoint="usage-export",outcome="cache_hit"}' in text
+    assert "# TYPE llm_tokens_total counter" in text
@@ -0,0 +1,202 @@
+import asyncio
+import json
+import time
+import uuid
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.core.config import settings
+from app.main import app
+from app.models import Inventory, User
+from app.models.generated_recipe import GeneratedRecipe
+from app.services import recipe_service
+from app.services.locator import locator
+from app.services.ml_services.recipe_generation.local_recipe_engine import (
+    LocalRecipeEngine,
+)
+from app.services.recipe_cache import RecipeCacheKey, recipe_cache
+
+client = TestClient(app)
+
+LLM_RECIPE = {
+    "title": "Gemini Chicken Bowl",
+    "calories": 520,
+    "protein": 40.0,
+    "carbs": 50.0,
+    "fats": 12.0,
+    "ingredients": ["200 grams chicken breast", "1 cup rice"],
+    "directions": "Cook.",
+}
+
+
+class FakeGenerator:
+    """Answers after ``latency`` seconds, or raises ``error``."""
+
+    def __init__(self, latency=0.0, error=None):
+        self.latency = latency
+        self.error = error
+        self.cancelled = 0
+
+    async def agenerate_recipe(
+        self, ingredients, fitness_goal="maintain", inventory_items=None
+    ):
+        try:
+            await asyncio.sleep(self.latency)
+        except asyncio.CancelledError:
+            self.cancelled += 1
+            raise
+        if self.error:
+            raise self.error
+        return dict(LLM_RECIPE)
+
+    async def agenerate_recipes(
+        self, ingredients, fitness_goal="maintain", inventory_items=None, count=3
+    ):
+        return [await self.agenerate_recipe(ingredients) for _ in range(count)]
+
+
+@pytest.fixture(scope="module")
+def engine():
+    return LocalRecipeEngine()
+
+
+@pytest.fixture
+def use_generator():
+    def _use(generator):
+        locator.override("recipe_generator", generator)
+        return generator
+
+    yield _use
+    locator.reset("recipe_generator")
+
+
+@pytest.fixture
+def pantry_items():
+    return [
+        {"name": "Chicken Breast", "quantity": 2},
+        {"name": "Brown Rice", "quantity": 1},
+        {"name": "Broccoli", "quantity": 1},
+    ]
+
+
+def _generate(user, auth_header_for_user, query=""):
+    return client.post(
+        f"/api/v1/recipe/generate-from-inventory{query}",
+        headers=auth_header_for_user(user),
+    )
+
+
+def test_ranks_recipes_by_pantry_coverage(engine):
+    recipes = engine.recommend(["Chicken Breast", "Brown Rice", "Broccoli"], count=3)
+    assert recipes[0]["title"] == "Grilled Chicken and Rice Bowl"
+    assert recipes[0]["ingredients"] == [
+        "chicken breast",
+        "rice",
+        "broccoli",
+        "olive oil",
+    ]
+    assert recipes[0]["directions"].startswith("You will need 200 g chicken breast")
+    assert len(recipes) == 3
+    # Deterministic.
+    assert engine.recommend(["Broccoli", "Chicken Breast", "Brown Rice"], count=3) == (
+        recipes
+    )
+
+
+def test_goal_breaks_ties_by_macro_fit(engine):
+    lose = engine.scores(["Eggs"], "lose")
+    gain = engine.scores(["Eggs"], "gain")
+    assert (lose != gain).any()
+    titles = [recipe["title"] for recipe in engine.recommend(["Eggs"], "lose", 10)]
+    assert set(titles) >= {"Spinach and Feta Omelette", "Egg Fried Rice"}
+
+
+def test_staples_alone_match_nothing(engine):
+    assert engine.recommend(["Garlic", "Olive Oil", "Salt"]) == []
+    assert engine.recommend(["Dragonfruit"]) == []
+
+
+def test_custom_corpus(tmp_path):
+    corpus = tmp_path / "recipes.json"
+    corpus.write_text(
+        json.dumps(
+            {
+                "recipes": [
+                    {
+                        "title": "Plain Toast",
+                        "calories": 150,
+                        "protein": 5.0,
+                        "carbs": 28.0,
+                        "fats": 2.0,
+                        "ingredients": [{"item": "bread", "amount": "2 slices"}],
+                        "directions": "Toast it.",
+                    }
+                ]
+            }
+        )
+    )
+    engine = LocalRecipeEngine(corpus)
+    assert engine.recommend(["Sourdough Bread"])[0]["title"] == "Plain Toast"
+
+
+def test_llm_error_answers_from_corpus(
+    db, pantry_user, auth_header_for_user, use_generator
+):
+    use_generator(FakeGenerator(error=RuntimeError("Gemini is down")))
+    before = recipe_service.local_fallbacks.value(reason="error")
+
+    resp = _generate(pantry_user, auth_header_for_user)
+    assert resp.status_code == 200
+    assert resp.json()["title"] == "Grilled Chicken and Rice Bowl"
+    assert resp.json()["ingredients"][:3] == [
+        "Chicken Breast",
+        "Brown Rice",
+        "Broccoli",
+    ]
+    assert recipe_service.local_fallbacks.value(reason="error") == before + 1
+    assert db.query(GeneratedRecipe).filter_by(user_id=pantry_user.id).count() == 1
+    # Local answers are not cached, so the LLM is asked again next time.
+    key = RecipeCacheKey.build(["Chicken Breast", "Brown Rice", "Broccoli"], "maintain")
+    assert recipe_cache.get(key) is None
+
+
+def test_slow_llm_loses_the_race(
+    db, pantry_user, auth_header_for_user, use_generator, monkeypatch
+):
+    monkeypatch.setattr(settings, "RECIPE_LOCAL_FALLBACK_DEADLINE_SECONDS", 0.05)
+    generator = use_generator(FakeGenerator(latency=5.0))
+
+    started = time.perf_counter()
+    resp = _generate(pantry_user, auth_header_for_user)
+    assert time.perf_counter() - started < 2.0
+    assert resp.json()["title"] == "Grilled Chicken and Rice Bowl"
+    assert generator.cancelled == 1
+
+
+def test_fast_llm_wins_the_race(
+    db, pantry_user, auth_header_for_user, use_generator, monkeypatch
+):
+    monkeypatch.setattr(settings, "RECIPE_LOCAL_FALLBACK_DEADLINE_SECONDS", 1.0)
+    use_generator(FakeGenerator(latency=0.01))
+    assert _generate(pantry_user, auth_header_for_user).json()["title"] == (
+        "Gemini Chicken Bowl"
+    )
+
+
+def test_batch_falls_back_to_several_local_recipes(
+    db, pantry_user, auth_header_for_user, use_generator
+):
+    use_generator(FakeGenerator(error=TimeoutError("too slow")))
+    resp = _generate(pantry_user, auth_header_for_user, "?count=2")
+    assert resp.status_code == 200
+    assert len(resp.json()) == 2
+
+
+def test_no_local_match_keeps_the_llm_error(db, auth_header_for_user, use_generator):
+    user = User(id=uuid.uuid4(), email="exotic@example.com", hashed_password="x")
+    db.add(user)
+    db.add(Inventory(user_id=user.id, name="Dragonfruit", quantity=1))
+    db.commit()
+    use_generator(FakeGenerator(error=TimeoutError("too slow")))
+    assert _generate(user, auth_header_for_user).status_code == 504
@@ -0,0 +1,42 @@
+import pytest
+
+from app.utils.metrics import MetricsRegistry
+
+
+def test_counter_and_gauge_render():
+    registry = MetricsRegistry()
+    requests = registry.counter("requests_total", "Requests served")
+    requests.inc(route="/a")
+    requests.inc(2, route="/a")
+    in_flight = registry.gauge("in_flight", "In-flight requests")
+    in_flight.inc()
+    in_flight.dec()
+    in_flight.set(3)
+
+    text = registry.render()
+    assert "# TYPE requests_total counter" in text
+    assert 'requests_total{route="/a"} 3.0' in text
+    assert "in_flight 3.0" in text
+    with pytest.raises(ValueError):
+        requests.inc(-1)
+
+
+def test_histogram_buckets_are_cumulative():
+    registry = MetricsRegistry()
+    latency = registry.histogram("latency_seconds", "Latency", buckets=(0.1, 1.0))
+    for value in (0.05, 0.5, 0.5, 3.0):
+        latency.observe(value)
+
+    lines = registry.render().splitlines()
+    assert 'latency_seconds_bucket{le="0.1"} 1' in lines
+    assert 'latency_seconds_bucket{le="1.0"} 3' in lines
+    assert 'latency_seconds_bucket{le="+Inf"} 4' in lines
+    assert "latency_seconds_count 4" in lines
+    assert latency.sum() == pytest.approx(4.05)
+
+
+def test_registry_returns_existing_metric_and_rejects_kind_clash():
+    registry = MetricsRegistry()
+    assert registry.counter("hits", "Hits") is registry.counter("hits", "Hits")
+    with pytest.raises(ValueError):
+        registry.gauge("hits", "Hits")
@@ -0,0 +1,160 @@
+import uuid
+from datetime import datetime, timezone
+
+import numpy as np
+import pytest
+from fastapi.testclient import TestClient
+
+from app.api import deps
+from app.enums import ActivityLevelEnum, FitnessGoalEnum, SexEnum
+from app.main import app
+from app.models.consumption_log import ConsumptionLog
+from app.models.user import User
+from app.services import nutrition_service, user_service
+
+
+def _user(**overrides):
+    fields = dict(
+        id=uuid.uuid4(),
+        email=f"{uuid.uuid4()}@example.com",
+        hashed_password="fakehash",
+        height=180.0,
+        weight=80.0,
+        age=30,
+        sex=SexEnum.male,
+        activity_level=ActivityLevelEnum.moderate,
+        fitness_goal=FitnessGoalEnum.maintain,
+    )
+    fields.update(overrides)
+    return User(**fields)
+
+
+def test_calculate_bmr_mifflin_st_jeor():
+    assert nutrition_service.calculate_bmr(80, 180, 30, SexEnum.male) == 1780
+    assert nutrition_service.calculate_bmr(60, 165, 25, SexEnum.female) == 1345.25
+
+
+def test_calculate_targets_applies_activity_and_goal():
+    targets = nutrition_service.calculate_targets(
+        _user(fitness_goal=FitnessGoalEnum.lose)
+    )
+    assert targets.bmr == 1780
+    assert targets.tdee == pytest.approx(1780 * 1.55)
+    assert targets.calories == pytest.approx(1780 * 1.55 - 500)
+    assert targets.protein_g == pytest.approx(160)
+    macro_calories = targets.protein_g * 4 + targets.carbs_g * 4 + targets.fats_g * 9
+    assert macro_calories == pytest.approx(targets.calories)
+
+
+def test_calculate_targets_incomplete_profile():
+    assert nutrition_service.calculate_targets(_user(height=None)) is None
+
+
+def test_bulk_matches_scalar():
+    users = [
+        _user(),
+        _user(sex=SexEnum.female, weight=55, activity_level=None),
+        _user(sex=SexEnum.other, fitness_goal=FitnessGoalEnum.gain),
+        _user(age=None),
+    ]
+    bulk = nutrition_service.calculate_targets_bulk(
+        [u.height for u in users],
+        [u.weight for u in users],
+        [u.age for u in users],
+        [u.sex for u in users],
+        [u.activity_level for u in users],
+        [u.fitness_goal for u in users],
+    )
+    for i, user in enumerate(users[:3]):
+        expected = nutrition_service.calculate_targets(user)
+        for field in ("bmr", "tdee", "calories", "protein_g", "carbs_g", "fats_g"):
+            assert bulk[field][i] == pytest.approx(getattr(expected, field))
+    assert np.isnan(bulk["calories"][3])
+
+
+def test_targets_cached_until_relevant_field_changes(db):
+    user = _user()
+    db.add(user)
+    db.commit()
+
+    first = nutrition_service.get_targets(user)
+    assert nutrition_service.get_targets(user) is first
+
+    user_service.update_user(db, user, {"email": "renamed@example.com"})
+    assert nutrition_service.get_targets(user) is first
+
+    user_service.update_user(db, user, {"weight": 90.0})
+    updated = nutrition_service.get_targets(user)
+    assert updated is not first
+    assert updated.bmr == 1880
+
+
+def test_targets_cache_entries_expire(monkeypatch):
+    monkeypatch.setattr(
+        nutrition_service,
+        "_targets_cache",
+        nutrition_service.LRUCache(maxsize=10, ttl=0),
+    )
+    user = _user()
+    first = nutrition_service.get_targets(user)
+    assert nutrition_service.get_targets(user) is not first
+    assert nutrition_service.get_targets(user) == first
+
+
+def _log(user, calories, consumed_at):
+    return ConsumptionLog(
+        user_id=user.id,
+        item_name="Oats",
+        quantity_consumed=1,
+        calories_consumed=calories,
+        protein_consumed_g=10,
+        carbs_consumed_g=20,
+        fats_consumed_g=5,
+        consumed_at=consumed_at,
+    )
+
+
+def test_daily_summary_uses_user_local_day(db):
+    # 23:30 UTC on the 1st is already the 2nd in Tokyo (UTC+9).
+    user = _user(timezone="Asia/Tokyo")
+    db.add(user)
+    db.commit()
+    db.add_all(
+        [
+            _log(user, 300, datetime(2024, 6, 1, 14, 0)),  # 23:00 on the 1st local
+            _log(user, 400, datetime(2024, 6, 1, 15, 30)),  # 00:30 on the 2nd local
+            _log(user, 500, datetime(2024, 6, 1, 23, 0)),  # 08:00 on the 2nd local
+        ]
+    )
+    db.commit()
+
+    summary = nutrition_service.get_daily_summary(
+        db, user, now=datetime(2024, 6, 1, 23, 30, tzinfo=timezone.utc)
+    )
+    assert summary.day.isoformat() == "2024-06-02"
+    assert summary.calories == 900
+    assert summary.protein_g == 20
+    assert summary.targets == nutrition_service.get_targets(user)
+
+
+def test_daily_summary_endpoint(db, auth_header_for_user, monkeypatch):
+    monkeypatch.delitem(app.dependency_overrides, deps.get_current_user, raising=False)
+    user = _user()
+    db.add(user)
+    db.commit()
+    db.add(_log(user, 250, datetime.utcnow()))
+    db.commit()
+
+    response = TestClient(app).get(
+        "/api/v1/users/me/daily-summary", headers=auth_header_for_user(user)
+    )
+    assert response.status_code == 200
+    body = response.json()
+    assert body["calories"] == 250
+    assert body["targets"]["bmr"] == 1780
+
+    user_service.update_user(db, user, {"height": None})
+    response = TestClient(app).get(
+        "/api/v1/users/me/daily-summary", headers=auth_header_for_user(user)
+    )
+    assert response.json()["targets"] is None
@@ -0,0 +1,134 @@
+import asyncio
+import threading
+import uuid
+
+import pytest
+from fastapi.testclient import TestClient
+from passlib.context import CryptContext
+
+from app.core import security
+from app.main import app
+from app.models.user import User
+from app.utils import executor as executor_module
+from app.utils.executor import BoundedExecutor, ExecutorBusyError
+from app.utils.metrics import MetricsRegistry
+
+client = TestClient(app)
+
+
+def _user(db, password="secret123", rounds=4):
+    user = User(
+        id=uuid.uuid4(),
+        email=f"{uuid.uuid4()}@example.com",
+        hashed_password=CryptContext(schemes=["bcrypt"], bcrypt__rounds=rounds).hash(
+            password
+        ),
+    )
+    db.add(user)
+    db.commit()
+    return user
+
+
+def test_bounded_executor_rejects_when_saturated(monkeypatch):
+    registry = MetricsRegistry()
+    monkeypatch.setattr(
+        executor_module, "queue_wait_seconds", registry.histogram("wait", "wait")
+    )
+    monkeypatch.setattr(
+        executor_module, "rejected_tasks", registry.counter("rejected", "rejected")
+    )
+    pool = BoundedExecutor("test", max_workers=1, max_queue=1)
+    release = threading.Event()
+
+    async def scenario():
+        running = asyncio.ensure_future(pool.run(release.wait))
+        queued = asyncio.ensure_future(pool.run(lambda: "queued"))
+        await asyncio.sleep(0.05)
+        with pytest.raises(ExecutorBusyError):
+            await pool.run(lambda: "rejected")
+        release.set()
+        return await running, await queued, await pool.run(lambda: "after")
+
+    try:
+        assert asyncio.run(scenario()) == (True, "queued", "after")
+    finally:
+        pool.shutdown()
+    assert registry.get("rejected").value(executor="test") == 1
+    assert registry.get("wait").count(executor="test") == 3
+    assert registry.get("wait").sum(executor="test") >= 0.05
+
+
+def test_login_rehashes_password_with_current_rounds(db, monkeypatch):
+    monkeypatch.setattr(
+        security, "pwd_context", CryptContext(schemes=["bcrypt"], bcrypt__rounds=5)
+    )
+    user = _user(db, rounds=4)
+
+    resp = client.post(
+        "/api/v1/auth/login", data={"username": user.email, "password": "secret123"}
+    )
+    assert resp.status_code == 200
+    db.refresh(user)
+    assert user.hashed_password.startswith("$2b$05$")
+
+    resp = client.post(
+        "/api/v1/auth/login", data={"username": user.email, "password": "secret123"}
+    )
+    assert resp.status_code == 200
+
+
+def test_wrong_password_does_not_rehash(db, monkeypatch):
+    monkeypatch.setattr(
+        security, "pwd_context", CryptContext(schemes=["bcrypt"], bcrypt__rounds=5)
+    )
+    user = _user(db, rounds=4)
+    old_hash = user.hashed_password
+
+    resp = client.post(
+        "/api/v1/auth/login", data={"username": user.email, "password": "wrong"}
+    )
+    assert resp.status_code == 401
+    db.refresh(user)
+    assert user.hashed_password == old_hash
+
+
+def test_login_returns_503_when_hashing_is_saturated(db, monkeypatch):
+    user = _user(db)
+    pool = BoundedExecutor("bcrypt-test", max_workers=1, max_queue=0)
+    monkeypatch.setattr(security, "_hash_executor", pool)
+    release = threading.Event()
+    blocker = pool._executor.submit(release.wait)
+    # Occupy the only slot the way a concurrent login would.
+    assert pool._slots.acquire(blocking=False)
+    try:
+        resp = client.post(
+            "/api/v1/auth/login",
+            data={"username": user.email, "password": "secret123"},
+        )
+        assert resp.status_code == 503
+        assert resp.headers["retry-after"] == "1"
+    finally:
+        release.set()
+        blocker.result()
+        pool._slots.release()
+
+    resp = client.post(
+        "/api/v1/auth/login", data={"username": user.email, "password": "secret123"}
+    )
+    assert resp.status_code == 200
+    pool.shutdown()
+
+
+def test_register_hashes_off_the_event_loop(db):
+    email = f"{uuid.uuid4()}@example.com"
+    resp = client.post("/api/v1/users/", json={"email": email, "password": "secret123"})
+    assert resp.status_code == 200
+    assert resp.json()["email"] == email
+
+    resp = client.post("/api/v1/users/", json={"email": email, "password": "secret123"})
+    assert resp.status_code == 400
+
+    resp = client.post(
+        "/api/v1/auth/login", data={"username": email, "password": "secret123"}
+    )
+    assert resp.status_code == 200
@@ -0,0 +1,116 @@
+from datetime import date, timedelta
+
+from langchain_core.runnables import RunnableLambda
+
+from app.core.config import settings
+from app.models import Inventory
+from app.services.ml_services.recipe_generation import gemini_recipe_generator
+from app.services.ml_services.recipe_generation.gemini_recipe_generator import (
+    GeminiRecipeGenerator,
+)
+from app.services.ml_services.recipe_generation.prompt_builder import (
+    build_pantry,
+    estimate_tokens,
+    rank_items,
+)
+
+TODAY = date(2026, 3, 1)
+
+
+def _item(name, quantity=1.0, expires_in=None, **macros):
+    return Inventory(
+        name=name,
+        quantity=quantity,
+        expiry_date=(
+            TODAY + timedelta(days=expires_in) if expires_in is not None else None
+        ),
+        **macros,
+    )
+
+
+def test_items_about_to_expire_rank_first():
+    ranked = rank_items(
+        [_item("Rice"), _item("Spinach", expires_in=1), _item("Yogurt", expires_in=5)],
+        "maintain",
+        TODAY,
+    )
+    assert [item.name for item in ranked] == ["Spinach", "Yogurt", "Rice"]
+
+
+def test_macro_fit_follows_the_goal():
+    chicken = _item(
+        "Chicken",
+        calories_per_serving=165,
+        protein_g_per_serving=31,
+        carbs_g_per_serving=0,
+        fats_g_per_serving=3.6,
+    )
+    peanut_butter = _item(
+        "Peanut Butter",
+        calories_per_serving=590,
+        protein_g_per_serving=25,
+        carbs_g_per_serving=20,
+        fats_g_per_serving=50,
+    )
+    lose = rank_items([peanut_butter, chicken], "lose", TODAY)
+    assert [item.name for item in lose] == ["Chicken", "Peanut Butter"]
+    # Out of stock items are never listed.
+    assert rank_items([_item("Milk", quantity=0)], "gain", TODAY) == []
+
+
+def test_pantry_lists_each_ingredient_once():
+    pantry = build_pantry(
+        [],
+        "maintain",
+        [
+            _item("Tomatoes", quantity=3, serving_size_unit="pieces"),
+            _item("tomato", quantity=1),
+            _item("Rice", quantity=0.5),
+        ],
+        token_budget=400,
+        today=TODAY,
+    )
+    assert pantry.text.count("omato") == 1
+    assert pantry.listed == 2
+    assert pantry.dropped == 0
+
+
+def test_budget_drops_lowest_ranked_items():
+    items = [_item(f"Item {n}", quantity=1) for n in range(50)]
+    items.append(_item("Fresh Basil", expires_in=0))
+    pantry = build_pantry([], "maintain", items, token_budget=60, today=TODAY)
+
+    assert estimate_tokens(pantry.text) <= 60
+    assert pantry.text.startswith("- Fresh Basil")
+    assert pantry.listed + pantry.dropped == 51
+    assert pantry.dropped > 40
+
+
+def test_plain_names_without_inventory_details():
+    pantry = build_pantry(["chicken", "rice", "Chicken"], "gain", None, 400)
+    assert pantry.text == "chicken, rice"
+
+
+def test_prompt_names_ingredients_once_and_records_tokens(monkeypatch):
+    prompts = []
+
+    def answer(prompt):
+        prompts.append(prompt.to_string())
+        raise RuntimeError("stop")
+
+    monkeypatch.setattr(settings, "RECIPE_PROMPT_TOKEN_BUDGET", 50)
+    histogram = gemini_recipe_generator.prompt_tokens
+    dropped = gemini_recipe_generator.prompt_items_dropped
+    observed, dropped_before = histogram.count(), dropped.value()
+
+    generator = GeminiRecipeGenerator(model=RunnableLambda(answer))
+    items = [_item(f"Pantry Item {n}", quantity=2) for n in range(20)]
+    try:
+        generator.generate_recipe([item.name for item in items], "lose", items)
+    except RuntimeError:
+        pass
+
+    assert prompts[0].count("Pantry Item 0") == 1
+    assert "Pantry Item 19" not in prompts[0]
+    assert histogram.count() == observed + 1
+    assert dropped.value() > dropped_before
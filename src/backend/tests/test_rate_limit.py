@@ -0,0 +1,188 @@
+import asyncio
+import fnmatch
+import uuid
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.core import security
+from app.core.config import settings
+from app.main import app
+from app.middleware import rate_limit
+from app.middleware.rate_limit import (
+    MemoryRateLimitBackend,
+    RateLimitMiddleware,
+    RateLimitRule,
+    RedisRateLimitBackend,
+)
+from app.models.user import User
+
+client = TestClient(app)
+
+
+class FakeRedis:
+    """
+    Runs RedisRateLimitBackend's sliding-window script in Python, one call at
+    a time as Redis would, plus the commands reset() uses.
+    """
+
+    def __init__(self):
+        self.zsets = {}
+        self.scripts = []
+
+    def register_script(self, script):
+        self.scripts.append(script)
+
+        async def run(keys, args):
+            now, window, limit = float(args[0]), float(args[1]), int(args[2])
+            zset = self.zsets.setdefault(keys[0], {})
+            for member in [m for m, score in zset.items() if score <= now - window]:
+                del zset[member]
+            if len(zset) < limit:
+                zset[args[3]] = now
+                return [1]
+            return [0, str(min(zset.values()))]
+
+        return run
+
+    async def scan_iter(self, match):
+        for key in list(self.zsets):
+            if fnmatch.fnmatch(key, match):
+                yield key
+
+    async def delete(self, key):
+        self.zsets.pop(key, None)
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(rate_limit.time, "monotonic", lambda: now[0])
+    monkeypatch.setattr(rate_limit.time, "time", lambda: now[0])
+    return now
+
+
+def test_memory_token_bucket_bursts_then_refills(clock):
+    backend = MemoryRateLimitBackend()
+
+    def hit(key="k"):
+        return asyncio.run(backend.hit(key, 3, 60))
+
+    assert [hit()[0] for _ in range(3)] == [True] * 3
+    allowed, retry_after = hit()
+    assert not allowed and retry_after == pytest.approx(20)
+
+    clock[0] += 20
+    assert hit()[0]
+    assert not hit()[0]
+    assert hit("other")[0]
+
+
+def test_redis_sliding_window(clock):
+    backend = RedisRateLimitBackend(FakeRedis())
+
+    def hit():
+        return asyncio.run(backend.hit("k", 2, 60))
+
+    assert [hit()[0] for _ in range(2)] == [True, True]
+    clock[0] += 30
+    allowed, retry_after = hit()
+    assert not allowed and retry_after == pytest.approx(30)
+    # Rejected attempts are never written to the window.
+    assert len(backend.client.zsets["ratelimit:k"]) == 2
+
+    clock[0] += 30
+    assert hit()[0]
+    asyncio.run(backend.reset())
+    assert backend.client.zsets == {}
+
+
+def _user(db):
+    user = User(
+        id=uuid.uuid4(),
+        email="limited@example.com",
+        hashed_password=security.get_password_hash("secret123"),
+    )
+    db.add(user)
+    db.commit()
+    return user
+
+
+def _login(username, password="wrong", ip=None):
+    headers = {"X-Forwarded-For": ip} if ip else {}
+    return client.post(
+        "/api/v1/auth/login",
+        data={"username": username, "password": password},
+        headers=headers,
+    )
+
+
+def test_login_limited_per_ip_before_password_check(db, monkeypatch):
+    user = _user(db)
+    calls = []
+    real_verify = security.verify_and_update
+    monkeypatch.setattr(
+        security,
+        "verify_and_update",
+        lambda *args: calls.append(args) or real_verify(*args),
+    )
+
+    limit = settings.RATE_LIMIT_PER_MINUTE
+    statuses = [_login(f"user{i}@example.com").status_code for i in range(limit)]
+    assert statuses == [401] * limit
+    resp = _login(user.email, password="secret123")
+    assert resp.status_code == 429
+    assert int(resp.headers["retry-after"]) >= 1
+    # Unknown accounts skip bcrypt; the throttled login never reached it.
+    assert calls == []
+
+
+def test_login_limited_per_account_across_ips(db, monkeypatch):
+    monkeypatch.setattr(settings, "RATE_LIMIT_TRUST_FORWARDED", True)
+    user = _user(db)
+    limit = settings.RATE_LIMIT_PER_MINUTE
+    for i in range(limit):
+        assert _login(user.email.upper(), ip=f"10.0.0.{i}").status_code == 401
+    assert _login(user.email, password="secret123", ip="10.0.1.1").status_code == 429
+    assert _login("someone@example.com", ip="10.0.1.1").status_code == 401
+
+
+def test_rate_limit_can_be_disabled(db, monkeypatch):
+    monkeypatch.setattr(settings, "RATE_LIMIT_ENABLED", False)
+    for _ in range(settings.RATE_LIMIT_PER_MINUTE + 1):
+        assert _login("nobody@example.com").status_code == 401
+
+
+def test_configurable_rules_for_other_endpoints(clock):
+    mini = FastAPI()
+
+    @mini.get("/api/v1/recipe/ping")
+    def ping():
+        return {"ok": True}
+
+    @mini.get("/api/v1/other")
+    def other():
+        return {"ok": True}
+
+    mini.add_middleware(
+        RateLimitMiddleware,
+        rules=[RateLimitRule(path="/api/v1/recipe", limit=2)],
+        backend=MemoryRateLimitBackend(),
+    )
+    mini_client = TestClient(mini)
+    statuses = [mini_client.get("/api/v1/recipe/ping").status_code for _ in range(3)]
+    assert statuses == [200, 200, 429]
+    assert all(mini_client.get("/api/v1/other").status_code == 200 for _ in range(3))
+
+
+def test_default_rules_include_configured_prefixes(monkeypatch):
+    monkeypatch.setattr(
+        settings, "RATE_LIMIT_RULES", {"/api/v1": 100, "/api/v1/recipe": 10}
+    )
+    rules = rate_limit.default_rules()
+    assert rules[0].per_account and rules[0].path.endswith("/auth/login")
+    assert [(r.path, r.limit) for r in rules[1:]] == [
+        ("/api/v1/recipe", 10),
+        ("/api/v1", 100),
+    ]
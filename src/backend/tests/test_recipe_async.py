@@ -0,0 +1,209 @@
+import asyncio
+import time
+import uuid
+
+import pytest
+from fastapi import HTTPException
+from fastapi.testclient import TestClient
+from langchain_core.runnables import RunnableLambda
+
+from app.core.config import settings
+from app.main import app
+from app.models import User
+from app.models.generated_recipe import GeneratedRecipe
+from app.services.locator import locator
+from app.services.ml_services.recipe_generation.gemini_recipe_generator import (
+    GeminiRecipeGenerator,
+    RecipeSchema,
+)
+from app.utils.disconnect import cancel_on_disconnect
+
+client = TestClient(app)
+
+
+class FakeLLM:
+    """Stands in for Gemini: answers after ``latency`` seconds."""
+
+    def __init__(self, latency=0.05):
+        self.latency = latency
+        self.active = 0
+        self.max_active = 0
+        self.prompts = []
+        self.cancelled = 0
+
+    def _recipe(self):
+        return RecipeSchema(
+            title="Chicken Rice Bowl",
+            calories=550,
+            protein=40.0,
+            carbs=60.0,
+            fats=12.0,
+            ingredients=["200 grams chicken breast", "1 cup rice"],
+            directions="Cook the rice. Grill the chicken.",
+        )
+
+    def invoke(self, prompt):
+        self.prompts.append(prompt.to_string())
+        time.sleep(self.latency)
+        return self._recipe()
+
+    async def ainvoke(self, prompt):
+        self.prompts.append(prompt.to_string())
+        self.active += 1
+        self.max_active = max(self.max_active, self.active)
+        try:
+            await asyncio.sleep(self.latency)
+        except asyncio.CancelledError:
+            self.cancelled += 1
+            raise
+        finally:
+            self.active -= 1
+        return self._recipe()
+
+    def runnable(self):
+        return RunnableLambda(self.invoke, afunc=self.ainvoke)
+
+
+def _generator(fake):
+    return GeminiRecipeGenerator(model=fake.runnable())
+
+
+def test_async_calls_are_capped_by_the_semaphore(monkeypatch):
+    monkeypatch.setattr(settings, "RECIPE_LLM_MAX_CONCURRENCY", 2)
+    fake = FakeLLM(latency=0.05)
+    generator = _generator(fake)
+
+    async def scenario():
+        return await asyncio.gather(
+            *(generator.agenerate_recipe(["chicken", "rice"]) for _ in range(6))
+        )
+
+    started = time.perf_counter()
+    results = asyncio.run(scenario())
+    assert time.perf_counter() - started >= 0.15
+    assert fake.max_active == 2
+    assert [r["title"] for r in results] == ["Chicken Rice Bowl"] * 6
+    assert "chicken, rice" in fake.prompts[0]
+
+
+def test_sync_and_async_paths_agree():
+    fake = FakeLLM(latency=0)
+    generator = _generator(fake)
+    assert generator.generate_recipe(["rice"]) == asyncio.run(
+        generator.agenerate_recipe(["rice"])
+    )
+    assert fake.prompts[0] == fake.prompts[1]
+
+
+def test_timeout_releases_the_slot(monkeypatch):
+    monkeypatch.setattr(settings, "RECIPE_LLM_MAX_CONCURRENCY", 1)
+    fake = FakeLLM(latency=1.0)
+    generator = _generator(fake)
+
+    async def scenario():
+        with pytest.raises(TimeoutError):
+            await generator.agenerate_recipe(["rice"], timeout=0.05)
+        fake.latency = 0
+        return await generator.agenerate_recipe(["rice"], timeout=0.5)
+
+    assert asyncio.run(scenario())["title"] == "Chicken Rice Bowl"
+    assert fake.cancelled == 1
+
+
+class DisconnectingRequest:
+    """Request that reports a disconnect from the ``after``-th check on."""
+
+    def __init__(self, after):
+        self.after = after
+        self.checks = 0
+        self.url = type("URL", (), {"path": "/api/v1/recipe/generate-from-inventory"})
+
+    async def is_disconnected(self):
+        self.checks += 1
+        return self.checks >= self.after
+
+
+def test_disconnect_cancels_the_llm_call(monkeypatch):
+    monkeypatch.setattr(settings, "RECIPE_LLM_MAX_CONCURRENCY", 1)
+    fake = FakeLLM(latency=5.0)
+    generator = _generator(fake)
+
+    async def scenario():
+        with pytest.raises(HTTPException) as exc:
+            await cancel_on_disconnect(
+                DisconnectingRequest(after=2),
+                generator.agenerate_recipe(["rice"]),
+                poll_interval=0.01,
+            )
+        assert exc.value.status_code == 499
+        await asyncio.sleep(0)
+        # The slot is free again for the next request.
+        fake.latency = 0
+        return await generator.agenerate_recipe(["rice"], timeout=0.5)
+
+    started = time.perf_counter()
+    assert asyncio.run(scenario())["title"] == "Chicken Rice Bowl"
+    assert time.perf_counter() - started < 1.0
+    assert fake.cancelled == 1
+
+
+@pytest.fixture
+def fake_llm():
+    fake = FakeLLM(latency=0.01)
+    locator.override("recipe_generator", _generator(fake))
+    yield fake
+    locator.reset("recipe_generator")
+
+
+@pytest.fixture
+def pantry_items():
+    return [
+        {
+            "name": "Chicken Breast",
+            "quantity": 2,
+            "calories_per_serving": 165,
+            "serving_size_unit": "g",
+        },
+        {"name": "Rice", "quantity": 1},
+        {"name": "Butter", "quantity": 0},
+    ]
+
+
+def test_generate_endpoint_uses_async_path(
+    db, pantry_user, auth_header_for_user, fake_llm
+):
+    resp = client.post(
+        "/api/v1/recipe/generate-from-inventory",
+        headers=auth_header_for_user(pantry_user),
+    )
+    assert resp.status_code == 200
+    assert resp.json()["ingredients"] == ["Chicken Breast", "Rice"]
+    assert "Chicken Breast: 2.0 g, 165.0 calories per serving" in fake_llm.prompts[0]
+    assert "Butter" not in fake_llm.prompts[0]
+    saved = db.query(GeneratedRecipe).filter_by(user_id=pantry_user.id).one()
+    assert saved.title == "Chicken Rice Bowl"
+
+
+def test_generate_endpoint_times_out_with_504(
+    db, pantry_user, auth_header_for_user, fake_llm, monkeypatch
+):
+    monkeypatch.setattr(settings, "RECIPE_LOCAL_FALLBACK_ENABLED", False)
+    monkeypatch.setattr(settings, "RECIPE_LLM_TIMEOUT_SECONDS", 0.01)
+    fake_llm.latency = 1.0
+    resp = client.post(
+        "/api/v1/recipe/generate-from-inventory",
+        headers=auth_header_for_user(pantry_user),
+    )
+    assert resp.status_code == 504
+    assert db.query(GeneratedRecipe).count() == 0
+
+
+def test_generate_endpoint_requires_inventory(db, auth_header_for_user, fake_llm):
+    user = User(id=uuid.uuid4(), email="empty@example.com", hashed_password="x")
+    db.add(user)
+    db.commit()
+    resp = client.post(
+        "/api/v1/recipe/generate-from-inventory", headers=auth_header_for_user(user)
+    )
+    assert resp.status_code == 400
+    assert fake_llm.prompts == []
@@ -0,0 +1,151 @@
+import asyncio
+
+import pytest
+from fastapi.testclient import TestClient
+from langchain_core.runnables import RunnableLambda
+
+from app.core.config import settings
+from app.main import app
+from app.models.generated_recipe import GeneratedRecipe
+from app.services.locator import locator
+from app.services.ml_services.recipe_generation.gemini_recipe_generator import (
+    GeminiRecipeGenerator,
+    RecipeBatchSchema,
+    RecipeSchema,
+)
+from app.services.recipe_service import RecipeService, inventory_fingerprint
+
+client = TestClient(app)
+
+
+def _recipe(n):
+    return RecipeSchema(
+        title=f"Bowl {n}",
+        calories=500 + n,
+        protein=35.0,
+        carbs=50.0,
+        fats=10.0,
+        ingredients=["200 grams chicken breast", "1 cup rice"],
+        directions="Cook the rice. Grill the chicken.",
+    )
+
+
+class FakeBatchLLM:
+    """Answers the batch prompt with ``size`` recipes (default: as asked)."""
+
+    def __init__(self, size=None):
+        self.size = size
+        self.prompts = []
+
+    def _answer(self, prompt):
+        text = prompt.to_string()
+        self.prompts.append(text)
+        size = self.size
+        if size is None:
+            size = int(text.split("Generate ", 1)[1].split(" ", 1)[0])
+        return RecipeBatchSchema(recipes=[_recipe(n) for n in range(1, size + 1)])
+
+    async def _aanswer(self, prompt):
+        return self._answer(prompt)
+
+    def runnable(self):
+        return RunnableLambda(self._answer, afunc=self._aanswer)
+
+
+def _generator(fake):
+    unused = RunnableLambda(lambda prompt: pytest.fail("single-recipe call"))
+    return GeminiRecipeGenerator(model=unused, batch_model=fake.runnable())
+
+
+@pytest.fixture
+def fake_batch():
+    fake = FakeBatchLLM()
+    locator.override("recipe_generator", _generator(fake))
+    yield fake
+    locator.reset("recipe_generator")
+
+
+def test_batch_is_one_call_with_count_in_prompt():
+    fake = FakeBatchLLM()
+    generator = _generator(fake)
+
+    recipes = generator.generate_recipes(["chicken", "rice"], "gain", count=3)
+    assert [r["title"] for r in recipes] == ["Bowl 1", "Bowl 2", "Bowl 3"]
+    assert len(fake.prompts) == 1
+    assert "Generate 3 different healthy recipes" in fake.prompts[0]
+    assert "chicken, rice" in fake.prompts[0]
+
+    recipes = asyncio.run(generator.agenerate_recipes(["chicken"], count=2))
+    assert [r["title"] for r in recipes] == ["Bowl 1", "Bowl 2"]
+    assert len(fake.prompts) == 2
+
+
+def test_batch_trims_extra_and_rejects_empty_answers():
+    fake = FakeBatchLLM(size=4)
+    generator = _generator(fake)
+    assert len(generator.generate_recipes(["rice"], count=2)) == 2
+
+    fake.size = 1
+    assert len(asyncio.run(generator.agenerate_recipes(["rice"], count=3))) == 1
+
+    fake.size = 0
+    with pytest.raises(RuntimeError, match="no recipes"):
+        generator.generate_recipes(["rice"], count=2)
+
+
+def test_batch_count_is_bounded(monkeypatch):
+    monkeypatch.setattr(settings, "RECIPE_BATCH_MAX_COUNT", 3)
+    generator = _generator(FakeBatchLLM())
+    with pytest.raises(ValueError):
+        generator.generate_recipes(["rice"], count=4)
+    with pytest.raises(ValueError):
+        generator.generate_recipes(["rice"], count=0)
+
+
+def test_endpoint_count_returns_list_from_one_call(
+    db, pantry_user, auth_header_for_user, fake_batch
+):
+    resp = client.post(
+        "/api/v1/recipe/generate-from-inventory?count=3",
+        headers=auth_header_for_user(pantry_user),
+    )
+    assert resp.status_code == 200
+    recipes = resp.json()
+    assert [r["title"] for r in recipes] == ["Bowl 1", "Bowl 2", "Bowl 3"]
+    assert recipes[0]["ingredients"] == ["Chicken Breast", "Rice"]
+    assert len(fake_batch.prompts) == 1
+    assert db.query(GeneratedRecipe).filter_by(user_id=pantry_user.id).count() == 3
+
+
+def test_endpoint_serves_suggestions_before_generating(
+    db, pantry_user, auth_header_for_user, fake_batch
+):
+    ingredients = ["Chicken Breast", "Rice"]
+    db.add(
+        RecipeService._recipe_row(
+            pantry_user.id,
+            {"title": "Ready Bowl", "ingredients": ingredients, "directions": "Serve."},
+            inventory_fingerprint(ingredients, "maintain"),
+            suggested=True,
+        )
+    )
+    db.commit()
+
+    resp = client.post(
+        "/api/v1/recipe/generate-from-inventory?count=2",
+        headers=auth_header_for_user(pantry_user),
+    )
+    assert [r["title"] for r in resp.json()] == ["Ready Bowl", "Bowl 1"]
+    assert "Generate 1 different" in fake_batch.prompts[0]
+
+
+def test_endpoint_rejects_count_over_limit(
+    pantry_user, auth_header_for_user, fake_batch, monkeypatch
+):
+    monkeypatch.setattr(settings, "RECIPE_BATCH_MAX_COUNT", 2)
+    resp = client.post(
+        "/api/v1/recipe/generate-from-inventory?count=3",
+        headers=auth_header_for_user(pantry_user),
+    )
+    assert resp.status_code == 422
+    assert fake_batch.prompts == []
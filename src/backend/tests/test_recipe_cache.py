@@ -0,0 +1,159 @@
+import pytest
+
+from app.core.config import settings
+from app.models import Inventory
+from app.services import recipe_cache as recipe_cache_module
+from app.services.recipe_cache import (
+    RecipeCache,
+    RecipeCacheKey,
+    canonical_ingredient,
+    macro_profile,
+)
+from app.services.recipe_service import RecipeService
+from app.utils import cache as cache_module
+from app.utils.metrics import MetricsRegistry
+
+RECIPE = {
+    "title": "Egg Scramble",
+    "calories": 300,
+    "protein": 20.0,
+    "carbs": 5.0,
+    "fats": 18.0,
+    "ingredients": ["3 eggs", "1 cup spinach"],
+    "directions": "Scramble.",
+}
+
+
+@pytest.fixture
+def registry(monkeypatch):
+    registry = MetricsRegistry()
+    monkeypatch.setattr(
+        recipe_cache_module,
+        "cache_lookups",
+        registry.counter("lookups", "lookups"),
+    )
+    monkeypatch.setattr(
+        recipe_cache_module,
+        "llm_calls_avoided",
+        registry.counter("avoided", "avoided"),
+    )
+    return registry
+
+
+def _key(*ingredients, goal="maintain", macros=None):
+    return RecipeCacheKey(frozenset(ingredients), goal, macros)
+
+
+@pytest.mark.parametrize(
+    "name, expected",
+    [
+        ("Cherry Tomatoes", "cherry tomato"),
+        ("  EGGS ", "egg"),
+        ("blueberries", "blueberry"),
+        ("Greek-style  yogurt", "greek style yogurt"),
+        ("hummus", "hummus"),
+        ("Swiss", "swiss"),
+        ("rice", "rice"),
+    ],
+)
+def test_canonical_ingredient(name, expected):
+    assert canonical_ingredient(name) == expected
+
+
+def test_macro_profile_rounds_calorie_shares():
+    items = [
+        Inventory(
+            name="Chicken",
+            quantity=2,
+            protein_g_per_serving=30,
+            carbs_g_per_serving=0,
+            fats_g_per_serving=3,
+        ),
+        Inventory(name="Rice", quantity=1, carbs_g_per_serving=45),
+        Inventory(name="Butter", quantity=0, fats_g_per_serving=80),
+    ]
+    # 240 kcal protein, 180 carbs, 54 fats.
+    assert macro_profile(items) == (0.5, 0.4, 0.1)
+    assert macro_profile([Inventory(name="Salt", quantity=1)]) is None
+    assert macro_profile(None) is None
+
+
+def test_exact_hit_ignores_spelling_and_order(registry):
+    cache = RecipeCache(maxsize=10, ttl=None)
+    cache.set(RecipeCacheKey.build(["Eggs", "Spinach"], "lose"), RECIPE)
+
+    assert cache.get(RecipeCacheKey.build(["spinach ", "egg"], "lose")) is RECIPE
+    assert cache.get(RecipeCacheKey.build(["spinach", "egg"], "gain")) is None
+    assert registry.get("lookups").value(result="exact") == 1
+    assert registry.get("lookups").value(result="miss") == 1
+    assert registry.get("avoided").value() == 1
+
+
+def test_similar_pantry_reuses_nearest_recipe(registry, monkeypatch):
+    monkeypatch.setattr(settings, "RECIPE_CACHE_SIMILARITY_THRESHOLD", 0.8)
+    cache = RecipeCache(maxsize=10, ttl=None)
+    cache.set(_key("egg", "spinach", "onion", "cheese"), RECIPE)
+    other = dict(RECIPE, title="Other")
+    cache.set(_key("egg", "spinach", "tofu", "rice", "bean"), other)
+
+    # 4/5 overlap with the first entry.
+    assert cache.get(_key("egg", "spinach", "onion", "cheese", "ham")) is RECIPE
+    # 3/5 is below the threshold.
+    assert cache.get(_key("egg", "spinach", "onion", "ham", "leek")) is None
+    # Same ingredients, different macro profile.
+    assert (
+        cache.get(_key("egg", "spinach", "onion", "cheese", macros=(0.3, 0.3, 0.4)))
+        is None
+    )
+    assert registry.get("lookups").value(result="similar") == 1
+    assert registry.get("lookups").value(result="miss") == 2
+
+    monkeypatch.setattr(settings, "RECIPE_CACHE_SIMILARITY_THRESHOLD", 1.0)
+    assert cache.get(_key("egg", "spinach", "onion", "cheese", "ham")) is None
+
+
+def test_entries_expire_and_are_evicted_lru(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(cache_module.time, "monotonic", lambda: now[0])
+    cache = RecipeCache(maxsize=2, ttl=60)
+    cache.set(_key("a"), RECIPE)
+    cache.set(_key("b"), RECIPE)
+    cache.get(_key("a"))
+    cache.set(_key("c"), RECIPE)
+    assert cache.get(_key("b")) is None
+    assert cache.get(_key("a")) is RECIPE
+
+    now[0] += 61
+    assert cache.get(_key("a")) is None
+    assert cache.get(_key("a", "c")) is None
+
+
+def test_disabled_cache_stores_nothing(monkeypatch):
+    monkeypatch.setattr(settings, "RECIPE_CACHE_ENABLED", False)
+    cache = RecipeCache(maxsize=2, ttl=None)
+    cache.set(_key("a"), RECIPE)
+    monkeypatch.setattr(settings, "RECIPE_CACHE_ENABLED", True)
+    assert cache.get(_key("a")) is None
+
+
+class CountingGenerator:
+    def __init__(self):
+        self.calls = 0
+
+    def generate_recipe(
+        self, ingredients, fitness_goal="maintain", inventory_items=None
+    ):
+        self.calls += 1
+        return RECIPE
+
+
+def test_service_skips_llm_for_cached_pantry():
+    generator = CountingGenerator()
+    service = RecipeService(recipe_generator=generator)
+
+    first = service.get_recipes_by_ingredients(["Eggs", "Spinach"], "lose")
+    second = service.get_recipes_by_ingredients(["egg", "SPINACH"], "lose")
+    assert generator.calls == 1
+    # Matched against each caller's own pantry names.
+    assert first["ingredients"] == ["Eggs", "Spinach"]
+    assert second["ingredients"] == ["egg", "SPINACH"]
@@ -0,0 +1,109 @@
+import pytest
+from fastapi.testclient import TestClient
+
+from app.core.config import settings
+from app.main import app
+from app.models.generated_recipe import GeneratedRecipe
+from app.services.locator import locator
+
+client = TestClient(app)
+
+GEMINI_FACTORY = (
+    "app.services.ml_services.recipe_generation.gemini_recipe_generator:"
+    "GeminiRecipeGenerator"
+)
+
+
+class FakeGenerator:
+    def __init__(self):
+        self.calls = []
+
+    async def agenerate_recipe(
+        self, ingredients, fitness_goal="maintain", inventory_items=None
+    ):
+        self.calls.append((list(ingredients), fitness_goal))
+        return {
+            "title": "Chicken Rice Bowl",
+            "calories": 550,
+            "protein": 40.0,
+            "carbs": 60.0,
+            "fats": 12.0,
+            "ingredients": ["200 grams chicken breast", "1 cup rice"],
+            "directions": "Cook the rice. Grill the chicken.",
+        }
+
+
+@pytest.fixture
+def built_generators():
+    """Register a counting factory for the generator for one test."""
+    built = []
+
+    def _factory():
+        built.append(FakeGenerator())
+        return built[-1]
+
+    locator.register("recipe_generator", _factory)
+    yield built
+    locator.register("recipe_generator", GEMINI_FACTORY)
+
+
+def test_generator_is_built_once_and_shared(
+    db, pantry_user, auth_header_for_user, built_generators, monkeypatch
+):
+    monkeypatch.setattr(settings, "RECIPE_CACHE_ENABLED", False)
+    headers = auth_header_for_user(pantry_user)
+    for _ in range(3):
+        resp = client.post("/api/v1/recipe/generate-from-inventory", headers=headers)
+        assert resp.status_code == 200
+        assert resp.json()["ingredients"] == ["Chicken Breast", "Rice"]
+
+    assert len(built_generators) == 1
+    assert len(built_generators[0].calls) == 3
+    assert db.query(GeneratedRecipe).filter_by(user_id=pantry_user.id).count() == 3
+
+
+def test_listing_recipes_does_not_build_generator(
+    db, pantry_user, auth_header_for_user, built_generators
+):
+    db.add(
+        GeneratedRecipe(
+            user_id=pantry_user.id,
+            title="Leftovers",
+            ingredients=["Rice"],
+            directions="Reheat.",
+        )
+    )
+    db.commit()
+
+    resp = client.get(
+        "/api/v1/recipe/user-recipes", headers=auth_header_for_user(pantry_user)
+    )
+    assert resp.status_code == 200
+    assert [r["title"] for r in resp.json()["items"]] == ["Leftovers"]
+    assert built_generators == []
+    assert not locator.is_loaded("recipe_generator")
+
+
+def test_generator_failure_is_retried_on_next_request(
+    db, pantry_user, auth_header_for_user, monkeypatch
+):
+    monkeypatch.setattr(settings, "RECIPE_LOCAL_FALLBACK_ENABLED", False)
+    attempts = []
+
+    def _flaky():
+        attempts.append(1)
+        if len(attempts) == 1:
+            raise RuntimeError("Failed to initialize GEMINI recipe generator: boom")
+        return FakeGenerator()
+
+    locator.register("recipe_generator", _flaky)
+    try:
+        headers = auth_header_for_user(pantry_user)
+        resp = client.post("/api/v1/recipe/generate-from-inventory", headers=headers)
+        assert resp.status_code == 500
+        assert "boom" in resp.json()["detail"]
+
+        resp = client.post("/api/v1/recipe/generate-from-inventory", headers=headers)
+        assert resp.status_code == 200
+    finally:
+        locator.register("recipe_generator", GEMINI_FACTORY)
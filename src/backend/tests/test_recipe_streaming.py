@@ -0,0 +1,171 @@
+import asyncio
+import json
+import uuid
+
+import pytest
+from fastapi.testclient import TestClient
+from langchain_core.output_parsers import JsonOutputParser
+from langchain_core.runnables import RunnableGenerator, RunnableLambda
+
+from app.api.v1.endpoints import recipe as recipe_endpoints
+from app.core.config import settings
+from app.main import app
+from app.models import User
+from app.models.generated_recipe import GeneratedRecipe
+from app.services.locator import locator
+from app.services.ml_services.recipe_generation.gemini_recipe_generator import (
+    GeminiRecipeGenerator,
+)
+
+client = TestClient(app)
+
+RECIPE_JSON = json.dumps(
+    {
+        "title": "Chicken Rice Bowl",
+        "calories": 550,
+        "protein": 40.0,
+        "carbs": 60.0,
+        "fats": 12.0,
+        "ingredients": ["200 grams chicken breast", "1 cup rice"],
+        "directions": "Cook the rice. Grill the chicken.",
+    }
+)
+
+
+class FakeStreamingLLM:
+    """Streams ``text`` in ``chunk_size`` pieces, ``latency`` seconds apart."""
+
+    def __init__(self, text=RECIPE_JSON, chunk_size=24, latency=0.0):
+        self.text = text
+        self.chunk_size = chunk_size
+        self.latency = latency
+        self.calls = 0
+
+    async def _stream(self, prompts):
+        async for _ in prompts:
+            pass
+        self.calls += 1
+        for start in range(0, len(self.text), self.chunk_size):
+            await asyncio.sleep(self.latency)
+            yield self.text[start : start + self.chunk_size]
+
+    def runnable(self):
+        return RunnableGenerator(self._stream) | JsonOutputParser()
+
+
+def _generator(fake):
+    unused = RunnableLambda(lambda prompt: pytest.fail("non-streaming call"))
+    return GeminiRecipeGenerator(model=unused, stream_model=fake.runnable())
+
+
+def _events(resp):
+    events = []
+    for block in resp.text.strip().split("\n\n"):
+        lines = dict(line.split(": ", 1) for line in block.splitlines())
+        events.append((lines["event"], json.loads(lines["data"])))
+    return events
+
+
+@pytest.fixture
+def fake_stream():
+    fake = FakeStreamingLLM()
+    locator.override("recipe_generator", _generator(fake))
+    yield fake
+    locator.reset("recipe_generator")
+
+
+def _stream(user, auth_header_for_user):
+    return client.post(
+        "/api/v1/recipe/generate-from-inventory/stream",
+        headers=auth_header_for_user(user),
+    )
+
+
+def test_generator_streams_growing_partials():
+    generator = _generator(FakeStreamingLLM(chunk_size=10))
+
+    async def collect():
+        return [item async for item in generator.astream_recipe(["rice"])]
+
+    events = asyncio.run(collect())
+    partials = [data for event, data in events if event == "partial"]
+    assert len(partials) > 3
+    assert partials[0] == {"title": "Chicken R"}
+    assert events[-1][0] == "recipe"
+    assert events[-1][1]["calories"] == 550
+    # The concurrency slot was handed back.
+    assert not generator._slots.locked()
+
+
+def test_stream_endpoint_sends_partials_then_recipe(
+    db, pantry_user, auth_header_for_user, fake_stream
+):
+    ttfb = recipe_endpoints.stream_ttfb_seconds
+    before = ttfb.count()
+    resp = _stream(pantry_user, auth_header_for_user)
+
+    assert resp.status_code == 200
+    assert resp.headers["content-type"].startswith("text/event-stream")
+    events = _events(resp)
+    assert {event for event, _ in events[:-1]} == {"partial"}
+    assert events[-1] == (
+        "recipe",
+        {
+            "title": "Chicken Rice Bowl",
+            "calories": 550,
+            "protein": 40.0,
+            "carbs": 60.0,
+            "fats": 12.0,
+            "ingredients": ["Chicken Breast", "Rice"],
+            "directions": "Cook the rice. Grill the chicken.",
+        },
+    )
+    assert ttfb.count() == before + 1
+    assert db.query(GeneratedRecipe).filter_by(user_id=pantry_user.id).count() == 1
+
+
+def test_cached_recipe_is_sent_as_single_event(
+    db, pantry_user, auth_header_for_user, fake_stream
+):
+    _stream(pantry_user, auth_header_for_user)
+    events = _events(_stream(pantry_user, auth_header_for_user))
+    assert [event for event, _ in events] == ["recipe"]
+    assert fake_stream.calls == 1
+    assert db.query(GeneratedRecipe).count() == 2
+
+
+def test_invalid_model_output_ends_with_error_event(
+    db, pantry_user, auth_header_for_user, fake_stream, monkeypatch
+):
+    monkeypatch.setattr(settings, "RECIPE_LOCAL_FALLBACK_ENABLED", False)
+    fake_stream.text = '{"title": "Half a recipe"}'
+    events = _events(_stream(pantry_user, auth_header_for_user))
+    assert events[0] == ("partial", {"title": "Half a recipe"})
+    assert events[-1][0] == "error"
+    assert events[-1][1]["status_code"] == 500
+    assert db.query(GeneratedRecipe).count() == 0
+
+
+def test_stream_timeout_ends_with_504_event(
+    db, pantry_user, auth_header_for_user, fake_stream, monkeypatch
+):
+    monkeypatch.setattr(settings, "RECIPE_LOCAL_FALLBACK_ENABLED", False)
+    monkeypatch.setattr(settings, "RECIPE_LLM_TIMEOUT_SECONDS", 0.05)
+    fake_stream.latency = 0.02
+    events = _events(_stream(pantry_user, auth_header_for_user))
+    assert events[-1] == (
+        "error",
+        {"detail": "Recipe generation timed out after 0.05s", "status_code": 504},
+    )
+    assert db.query(GeneratedRecipe).count() == 0
+
+
+def test_empty_inventory_is_rejected_before_streaming(
+    db, auth_header_for_user, fake_stream
+):
+    user = User(id=uuid.uuid4(), email="bare@example.com", hashed_password="x")
+    db.add(user)
+    db.commit()
+    resp = _stream(user, auth_header_for_user)
+    assert resp.status_code == 400
+    assert fake_stream.calls == 0
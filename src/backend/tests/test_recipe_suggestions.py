@@ -0,0 +1,250 @@
+import asyncio
+import uuid
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy.ext.asyncio import async_sessionmaker
+from sqlalchemy.pool import NullPool
+
+from app.api import deps
+from app.db.async_session import create_async_db_engine
+from app.main import app
+from app.models import Inventory
+from app.models.generated_recipe import GeneratedRecipe
+from app.services import recipe_suggestions
+from app.services.locator import locator
+from app.services.recipe_service import inventory_fingerprint
+from app.services.recipe_suggestions import RecipeSuggestionScheduler
+
+client = TestClient(app)
+
+
+class FakeGenerator:
+    def __init__(self):
+        self.calls = 0
+        self.batches = 0
+
+    async def agenerate_recipe(
+        self, ingredients, fitness_goal="maintain", inventory_items=None
+    ):
+        self.calls += 1
+        return {
+            "title": f"Recipe {self.calls}",
+            "calories": 400 + self.calls,
+            "protein": 30.0,
+            "carbs": 40.0,
+            "fats": 10.0,
+            "ingredients": [f"1 cup {name.lower()}" for name in ingredients],
+            "directions": "Cook.",
+        }
+
+    async def agenerate_recipes(
+        self, ingredients, fitness_goal="maintain", inventory_items=None, count=3
+    ):
+        self.batches += 1
+        return [
+            await self.agenerate_recipe(ingredients, fitness_goal, inventory_items)
+            for _ in range(count)
+        ]
+
+
+class FakeQuota:
+    """Refuses the first ``refusals`` hits, then allows everything."""
+
+    def __init__(self, refusals=0):
+        self.refusals = refusals
+        self.hits = []
+
+    async def hit(self, key, limit, window):
+        self.hits.append((key, limit, window))
+        if len(self.hits) <= self.refusals:
+            return False, 0.01
+        return True, 0.0
+
+
+@pytest.fixture
+def generator():
+    fake = FakeGenerator()
+    locator.override("recipe_generator", fake)
+    yield fake
+    locator.reset("recipe_generator")
+
+
+def _scheduler(**kwargs):
+    factory = async_sessionmaker(
+        bind=create_async_db_engine(poolclass=NullPool),
+        autoflush=False,
+        expire_on_commit=False,
+    )
+    options = dict(
+        debounce=0,
+        workers=1,
+        calls_per_minute=10,
+        count=2,
+        session_factory=factory,
+        quota=FakeQuota(),
+        tick=0.01,
+    )
+    options.update(kwargs)
+    return RecipeSuggestionScheduler(**options)
+
+
+@pytest.fixture
+def pantry_items():
+    return [{"name": "Oats", "quantity": 1}, {"name": "Bananas", "quantity": 3}]
+
+
+def _suggestions(db, user):
+    db.expire_all()
+    return (
+        db.query(GeneratedRecipe)
+        .filter_by(user_id=user.id, suggested=True)
+        .order_by(GeneratedRecipe.title)
+        .all()
+    )
+
+
+def test_fingerprint_ignores_order_case_and_plurals():
+    assert inventory_fingerprint(["Oats", "Bananas"], "lose") == inventory_fingerprint(
+        ["banana", "oats "], "lose"
+    )
+    assert inventory_fingerprint(["Oats"], "lose") != inventory_fingerprint(
+        ["Oats"], "gain"
+    )
+    assert inventory_fingerprint(["Oats"], "lose") != inventory_fingerprint(
+        ["Oats", "Milk"], "lose"
+    )
+
+
+def test_refresh_pregenerates_until_pantry_changes(db, pantry_user, generator):
+    scheduler = _scheduler()
+
+    assert asyncio.run(scheduler.refresh(pantry_user.id)) == 2
+    suggestions = _suggestions(db, pantry_user)
+    assert [s.title for s in suggestions] == ["Recipe 1", "Recipe 2"]
+    assert suggestions[0].ingredients == ["Oats", "Bananas"]
+    assert suggestions[0].inventory_fingerprint == inventory_fingerprint(
+        ["Oats", "Bananas"], "maintain"
+    )
+    # Both suggestions came from one batch call and one quota token.
+    assert generator.batches == 1
+    assert len(scheduler._quota.hits) == 1
+
+    # Same pantry: nothing to do.
+    assert asyncio.run(scheduler.refresh(pantry_user.id)) == 0
+    assert generator.calls == 2
+
+    # A new ingredient replaces the stale suggestions.
+    db.add(Inventory(user_id=pantry_user.id, name="Milk", quantity=1))
+    db.commit()
+    assert asyncio.run(scheduler.refresh(pantry_user.id)) == 2
+    assert [s.title for s in _suggestions(db, pantry_user)] == ["Recipe 3", "Recipe 4"]
+
+
+def test_empty_pantry_drops_suggestions(db, pantry_user, generator):
+    scheduler = _scheduler()
+    asyncio.run(scheduler.refresh(pantry_user.id))
+    db.query(Inventory).filter_by(user_id=pantry_user.id).update({"quantity": 0})
+    db.commit()
+
+    assert asyncio.run(scheduler.refresh(pantry_user.id)) == 0
+    assert _suggestions(db, pantry_user) == []
+
+
+def test_generate_serves_suggestion_without_llm(
+    db, pantry_user, generator, auth_header_for_user
+):
+    asyncio.run(_scheduler(count=1).refresh(pantry_user.id))
+    headers = auth_header_for_user(pantry_user)
+
+    history = client.get("/api/v1/recipe/user-recipes", headers=headers).json()
+    assert history["items"] == []
+    resp = client.post("/api/v1/recipe/generate-from-inventory", headers=headers)
+    assert resp.status_code == 200
+    assert resp.json() == {
+        "title": "Recipe 1",
+        "calories": 401,
+        "protein": 30.0,
+        "carbs": 40.0,
+        "fats": 10.0,
+        "ingredients": ["Oats", "Bananas"],
+        "directions": "Cook.",
+    }
+    assert generator.calls == 1
+    assert _suggestions(db, pantry_user) == []
+    history = client.get("/api/v1/recipe/user-recipes", headers=headers).json()
+    assert [r["title"] for r in history["items"]] == ["Recipe 1"]
+
+    # Suggestions used up: generated on demand again.
+    resp = client.post("/api/v1/recipe/generate-from-inventory", headers=headers)
+    assert resp.json()["title"] == "Recipe 2"
+    assert generator.calls == 2
+
+
+def test_quota_refusal_waits_for_a_token(db, pantry_user, generator):
+    scheduler = _scheduler(quota=FakeQuota(refusals=3), count=1)
+    assert asyncio.run(scheduler.refresh(pantry_user.id)) == 1
+    assert len(scheduler._quota.hits) == 4
+    assert scheduler._quota.hits[0] == (recipe_suggestions.QUOTA_KEY, 10, 60.0)
+
+
+def test_notifications_are_debounced(pantry_user):
+    scheduler = _scheduler(debounce=0.1)
+    refreshed = []
+
+    async def fake_refresh(user_id):
+        refreshed.append(user_id)
+
+    scheduler.refresh = fake_refresh
+    other = uuid.uuid4()
+
+    async def scenario():
+        scheduler.notify(pantry_user.id)
+        assert scheduler._pending == {}
+        await scheduler.start()
+        for _ in range(3):
+            scheduler.notify(pantry_user.id)
+            await asyncio.sleep(0.05)
+        scheduler.notify(other)
+        assert refreshed == []
+        await asyncio.sleep(0.3)
+        await scheduler.stop()
+
+    asyncio.run(scenario())
+    assert refreshed == [pantry_user.id, other]
+    assert not scheduler.running
+
+
+def test_inventory_changes_notify_scheduler(
+    db, pantry_user, auth_header_for_user, monkeypatch
+):
+    monkeypatch.delitem(app.dependency_overrides, deps.get_current_user, raising=False)
+    notified = []
+    monkeypatch.setattr(recipe_suggestions.scheduler, "notify", notified.append)
+
+    item = Inventory(
+        user_id=pantry_user.id,
+        name="Milk",
+        quantity=1,
+        calories_per_serving=60,
+        protein_g_per_serving=3,
+        carbs_g_per_serving=5,
+        fats_g_per_serving=3,
+        serving_size_unit="ml",
+    )
+    db.add(item)
+    db.commit()
+    resp = client.patch(
+        f"/api/v1/inventory/inventory/{item.id}",
+        json={"quantity": 0},
+        headers=auth_header_for_user(pantry_user),
+    )
+    assert resp.status_code == 200
+    assert notified == [pantry_user.id]
+
+
+def test_app_lifespan_runs_scheduler(monkeypatch):
+    monkeypatch.setattr(recipe_suggestions.scheduler, "tick", 0.01)
+    with TestClient(app):
+        assert recipe_suggestions.scheduler.running
+    assert not recipe_suggestions.scheduler.running
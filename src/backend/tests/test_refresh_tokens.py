@@ -0,0 +1,132 @@
+import time
+import uuid
+from datetime import datetime, timedelta
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.api import deps
+from app.auth.auth_service import JWTService, TokenDenylist
+from app.core import security
+from app.main import app
+from app.models.refresh_token import RefreshToken
+from app.models.user import User
+from app.services.refresh_token_service import hash_refresh_token
+
+client = TestClient(app)
+
+
+@pytest.fixture(autouse=True)
+def real_auth(monkeypatch):
+    # Other modules override get_current_user for the whole session.
+    monkeypatch.delitem(app.dependency_overrides, deps.get_current_user, raising=False)
+
+
+@pytest.fixture
+def user(db):
+    user = User(
+        id=uuid.uuid4(),
+        email="refresh@example.com",
+        hashed_password=security.get_password_hash("secret123"),
+    )
+    db.add(user)
+    db.commit()
+    return user
+
+
+def _login(user):
+    resp = client.post(
+        "/api/v1/auth/login", data={"username": user.email, "password": "secret123"}
+    )
+    assert resp.status_code == 200
+    return resp.json()
+
+
+def _refresh(token):
+    return client.post("/api/v1/auth/refresh", json={"refresh_token": token})
+
+
+def _me(access_token):
+    return client.get(
+        "/api/v1/users/me", headers={"Authorization": f"Bearer {access_token}"}
+    )
+
+
+def test_refresh_rotates_without_password_check(db, user, monkeypatch):
+    tokens = _login(user)
+    stored = db.query(RefreshToken).filter_by(user_id=user.id).one()
+    assert stored.token_hash == hash_refresh_token(tokens["refresh_token"])
+    assert tokens["refresh_token"] not in stored.token_hash
+
+    def _no_bcrypt(*args):
+        raise AssertionError("refresh must not verify the password")
+
+    monkeypatch.setattr(security, "verify_and_update", _no_bcrypt)
+    resp = _refresh(tokens["refresh_token"])
+    assert resp.status_code == 200
+    rotated = resp.json()
+    assert rotated["refresh_token"] != tokens["refresh_token"]
+    assert _me(rotated["access_token"]).json()["id"] == str(user.id)
+
+    db.expire_all()
+    rows = db.query(RefreshToken).filter_by(user_id=user.id).all()
+    assert len(rows) == 2
+    assert len({row.family_id for row in rows}) == 1
+    assert sum(row.revoked_at is None for row in rows) == 1
+
+
+def test_reusing_a_rotated_token_revokes_the_family(user):
+    first = _login(user)["refresh_token"]
+    second = _refresh(first).json()["refresh_token"]
+
+    assert _refresh(first).status_code == 401
+    # The legitimate successor is now revoked too.
+    assert _refresh(second).status_code == 401
+
+
+def test_refresh_rejects_unknown_and_expired_tokens(db, user):
+    assert _refresh("not-a-token").status_code == 401
+
+    token = _login(user)["refresh_token"]
+    db.query(RefreshToken).filter_by(user_id=user.id).update(
+        {"expires_at": datetime.utcnow() - timedelta(seconds=1)}
+    )
+    db.commit()
+    assert _refresh(token).status_code == 401
+
+
+def test_logout_revokes_access_and_refresh_tokens(user):
+    tokens = _login(user)
+    other_session = _login(user)
+    assert _me(tokens["access_token"]).status_code == 200
+
+    resp = client.post(
+        "/api/v1/auth/logout",
+        json={"refresh_token": tokens["refresh_token"]},
+        headers={"Authorization": f"Bearer {tokens['access_token']}"},
+    )
+    assert resp.status_code == 204
+    assert _me(tokens["access_token"]).status_code == 401
+    assert _refresh(tokens["refresh_token"]).status_code == 401
+    # Only the logged-out login is affected.
+    assert _me(other_session["access_token"]).status_code == 200
+    assert _refresh(other_session["refresh_token"]).status_code == 200
+
+
+def test_access_tokens_carry_distinct_ids():
+    first = JWTService.verify_access_token(JWTService.create_access_token({"sub": "a"}))
+    second = JWTService.verify_access_token(
+        JWTService.create_access_token({"sub": "a"})
+    )
+    assert first.jti and second.jti and first.jti != second.jti
+
+
+def test_denylist_forgets_expired_entries():
+    denylist = TokenDenylist()
+    live, stale = uuid.uuid4().hex, uuid.uuid4().hex
+    denylist.add(stale, int(time.time()) - 1)
+    denylist.add(live, int(time.time()) + 60)
+    assert live in denylist
+    assert stale not in denylist
+    assert "not-a-uuid" not in denylist and None not in denylist
+    assert len(denylist) == 1
@@ -0,0 +1,55 @@
+import pytest
+
+from app.services.locator import ServiceLocator, locator
+
+
+def test_services_are_built_once_on_first_use():
+    calls = []
+    services = ServiceLocator()
+    services.register("thing", lambda: calls.append(1) or object())
+
+    assert not services.is_loaded("thing")
+    first = services.get("thing")
+    assert services.get("thing") is first
+    assert calls == [1]
+
+    services.reset("thing")
+    assert services.get("thing") is not first
+
+
+def test_failed_factory_is_retried():
+    attempts = []
+
+    def flaky():
+        attempts.append(1)
+        if len(attempts) == 1:
+            raise RuntimeError("weights missing")
+        return "ready"
+
+    services = ServiceLocator()
+    services.register("flaky", flaky)
+    with pytest.raises(RuntimeError):
+        services.get("flaky")
+    assert services.get("flaky") == "ready"
+
+
+def test_import_path_factories_and_overrides():
+    services = ServiceLocator()
+    services.register("ordered", "collections:OrderedDict")
+    assert type(services.get("ordered")).__name__ == "OrderedDict"
+
+    services.override("ordered", "fake")
+    assert services.get("ordered") == "fake"
+    with pytest.raises(LookupError):
+        services.get("missing")
+
+
+def test_detection_service_uses_shared_detector():
+    detector = object()
+    locator.override("yolo_detector", detector)
+    try:
+        service = locator.get("detection_service")
+        assert service.detector is detector
+        assert locator.get("detection_service") is service
+    finally:
+        locator.reset()
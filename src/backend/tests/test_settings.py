@@ -0,0 +1,59 @@
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+from fastapi.testclient import TestClient
+
+from app.api import deps
+from app.auth import auth_service
+from app.core import security
+from app.core.config import get_settings, settings
+from app.db import DATABASE_URL
+from app.main import app
+
+BACKEND_DIR = Path(__file__).resolve().parents[1]
+
+
+def test_modules_share_the_cached_settings():
+    assert get_settings() is settings
+    assert deps.settings is settings
+    assert auth_service.settings is settings
+    assert security.settings is settings
+
+
+def test_app_import_parses_settings_once():
+    code = (
+        "import app.main, app.api.deps, app.auth.auth_service; "
+        "from app.core.config import get_settings; "
+        "print(get_settings.cache_info().misses)"
+    )
+    # test_core_config pops some of these from os.environ.
+    env = {
+        **os.environ,
+        "DATABASE_URL": DATABASE_URL,
+        "JWT_SECRET_KEY": settings.JWT_SECRET_KEY,
+        "GEMINI_API_KEY": settings.GEMINI_API_KEY,
+    }
+    result = subprocess.run(
+        [sys.executable, "-c", code],
+        cwd=BACKEND_DIR,
+        env=env,
+        capture_output=True,
+        text=True,
+    )
+    assert result.returncode == 0, result.stderr
+    assert result.stdout.strip() == "1"
+
+
+def test_settings_can_be_overridden_per_app():
+    overridden = settings.model_copy(update={"METRICS_TOKEN": "override"})
+    app.dependency_overrides[get_settings] = lambda: overridden
+    try:
+        resp = TestClient(app).get(
+            "/metrics", headers={"Authorization": "Bearer override"}
+        )
+    finally:
+        app.dependency_overrides.pop(get_settings)
+    assert resp.status_code == 200
+    assert settings.METRICS_TOKEN != "override"
@@ -0,0 +1,90 @@
+import uuid
+
+import pytest
+from fastapi import HTTPException
+from fastapi.testclient import TestClient
+
+from app.api import deps
+from app.auth.auth_service import JWTService
+from app.core.security import get_password_hash
+from app.main import app
+from app.models.user import User
+from app.services import user_service
+
+client = TestClient(app)
+
+
+@pytest.fixture(autouse=True)
+def real_auth(monkeypatch):
+    # Other modules override get_current_user for the whole session.
+    monkeypatch.delitem(app.dependency_overrides, deps.get_current_user, raising=False)
+
+
+@pytest.fixture
+def user(db):
+    user = User(
+        id=uuid.uuid4(),
+        email="subject@example.com",
+        hashed_password=get_password_hash("secret123"),
+    )
+    db.add(user)
+    db.commit()
+    return user
+
+
+def _bearer(subject):
+    return {
+        "Authorization": f"Bearer {JWTService.create_access_token({'sub': subject})}"
+    }
+
+
+def test_login_issues_user_id_subject(user):
+    resp = client.post(
+        "/api/v1/auth/login",
+        data={"username": user.email, "password": "secret123"},
+    )
+    assert resp.status_code == 200
+    payload = JWTService.verify_access_token(resp.json()["access_token"])
+    assert payload.sub == str(user.id)
+
+
+def test_legacy_email_subject_accepted_during_compat_window(user, monkeypatch):
+    monkeypatch.setattr(deps.settings, "AUTH_ACCEPT_EMAIL_SUBJECT", True)
+    resp = client.get("/api/v1/users/me", headers=_bearer(user.email))
+    assert resp.status_code == 200
+    assert resp.json()["id"] == str(user.id)
+
+
+def test_legacy_email_subject_rejected_after_compat_window(user, monkeypatch):
+    monkeypatch.setattr(deps.settings, "AUTH_ACCEPT_EMAIL_SUBJECT", False)
+    resp = client.get("/api/v1/users/me", headers=_bearer(user.email))
+    assert resp.status_code == 401
+
+
+def test_get_current_user_id_does_not_touch_the_database(user, monkeypatch):
+    def _no_db(*args, **kwargs):
+        raise AssertionError("user looked up for an id-only dependency")
+
+    monkeypatch.setattr(user_service, "get_user", _no_db)
+    monkeypatch.setattr(user_service, "get_user_by_email", _no_db)
+    token = JWTService.create_access_token({"sub": str(user.id)})
+    assert deps.get_current_user_id(db=None, token=token) == user.id
+
+    resp = client.get("/api/v1/alerts/", headers=_bearer(str(user.id)))
+    assert resp.status_code == 200
+
+
+def test_get_current_user_id_resolves_legacy_email_subject(db, user, monkeypatch):
+    monkeypatch.setattr(deps.settings, "AUTH_ACCEPT_EMAIL_SUBJECT", True)
+    token = JWTService.create_access_token({"sub": user.email})
+    assert deps.get_current_user_id(db=db, token=token) == user.id
+
+    token = JWTService.create_access_token({"sub": "missing@example.com"})
+    with pytest.raises(HTTPException) as exc:
+        deps.get_current_user_id(db=db, token=token)
+    assert exc.value.status_code == 404
+
+
+def test_unknown_user_id_subject_is_not_found(db):
+    resp = client.get("/api/v1/users/me", headers=_bearer(str(uuid.uuid4())))
+    assert resp.status_code == 404
@@ -0,0 +1,142 @@
+import uuid
+from datetime import datetime, timedelta
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.main import app
+from app.models import User
+from app.models.generated_recipe import GeneratedRecipe
+from app.utils.pagination import decode_cursor, encode_cursor
+
+client = TestClient(app)
+
+URL = "/api/v1/recipe/user-recipes"
+START = datetime(2025, 9, 1, 12, 0)
+
+
+def _user(db, email):
+    user = User(id=uuid.uuid4(), email=email, hashed_password="x")
+    db.add(user)
+    db.commit()
+    return user
+
+
+def _recipe(user, title, created_at, **fields):
+    return GeneratedRecipe(
+        user_id=user.id,
+        title=title,
+        ingredients=["Oats"],
+        directions="Cook.",
+        calories=400,
+        created_at=created_at,
+        **fields,
+    )
+
+
+@pytest.fixture
+def history_user(db):
+    user = _user(db, "history@example.com")
+    # Two recipes share a timestamp, as a batch may.
+    moments = [START, START + timedelta(minutes=1), START + timedelta(minutes=1)]
+    moments += [START + timedelta(minutes=n) for n in range(2, 5)]
+    db.add_all(_recipe(user, f"Recipe {n}", at) for n, at in enumerate(moments))
+    db.add(_recipe(user, "Unserved", START + timedelta(hours=1), suggested=True))
+    db.commit()
+    return user
+
+
+def _pages(headers, limit):
+    pages, cursor = [], None
+    while True:
+        params = {"limit": limit}
+        if cursor:
+            params["cursor"] = cursor
+        resp = client.get(URL, headers=headers, params=params)
+        assert resp.status_code == 200
+        pages.append(resp.json()["items"])
+        cursor = resp.json()["next_cursor"]
+        if cursor is None:
+            return pages
+
+
+def test_pages_cover_the_history_newest_first(history_user, auth_header_for_user):
+    headers = auth_header_for_user(history_user)
+    pages = _pages(headers, limit=4)
+    assert [len(page) for page in pages] == [4, 2]
+
+    items = [item for page in pages for item in page]
+    assert len({item["id"] for item in items}) == 6
+    assert items[0]["title"] == "Recipe 5"
+    assert items[-1]["title"] == "Recipe 0"
+    moments = [item["created_at"] for item in items]
+    assert moments == sorted(moments, reverse=True)
+    # An exact page leaves no empty page after it.
+    assert [len(page) for page in _pages(headers, limit=3)] == [3, 3]
+
+
+def test_summaries_leave_out_ingredients_and_directions(
+    history_user, auth_header_for_user
+):
+    resp = client.get(URL, headers=auth_header_for_user(history_user))
+    item = resp.json()["items"][0]
+    assert set(item) == {
+        "id",
+        "title",
+        "calories",
+        "protein",
+        "carbs",
+        "fats",
+        "created_at",
+    }
+
+
+def test_new_recipes_do_not_shift_later_pages(db, history_user, auth_header_for_user):
+    headers = auth_header_for_user(history_user)
+    everything = client.get(URL, headers=headers).json()["items"]
+    first = client.get(URL, headers=headers, params={"limit": 3}).json()
+    db.add(_recipe(history_user, "Newest", START + timedelta(days=1)))
+    db.commit()
+
+    second = client.get(
+        URL, headers=headers, params={"limit": 3, "cursor": first["next_cursor"]}
+    ).json()
+    assert second["items"] == everything[3:]
+
+
+def test_malformed_cursor_is_a_400(history_user, auth_header_for_user):
+    resp = client.get(
+        URL, headers=auth_header_for_user(history_user), params={"cursor": "nope"}
+    )
+    assert resp.status_code == 400
+
+
+def test_cursor_round_trip():
+    id = uuid.uuid4()
+    assert decode_cursor(encode_cursor(START, id)) == (START, id)
+    with pytest.raises(ValueError):
+        decode_cursor(encode_cursor(START, id)[:-3])
+
+
+def test_full_recipe_by_id(db, history_user, auth_header_for_user):
+    recipe = db.query(GeneratedRecipe).filter_by(title="Recipe 3").one()
+    resp = client.get(f"{URL}/{recipe.id}", headers=auth_header_for_user(history_user))
+    assert resp.status_code == 200
+    assert resp.json()["ingredients"] == ["Oats"]
+    assert resp.json()["directions"] == "Cook."
+    assert resp.json()["calories"] == 400
+
+
+def test_other_users_and_unserved_recipes_are_404(
+    db, history_user, auth_header_for_user
+):
+    stranger = _user(db, "stranger@example.com")
+    recipe = db.query(GeneratedRecipe).filter_by(title="Recipe 3").one()
+    unserved = db.query(GeneratedRecipe).filter_by(title="Unserved").one()
+
+    resp = client.get(f"{URL}/{recipe.id}", headers=auth_header_for_user(stranger))
+    assert resp.status_code == 404
+    resp = client.get(
+        f"{URL}/{unserved.id}", headers=auth_header_for_user(history_user)
+    )
+    assert resp.status_code == 404